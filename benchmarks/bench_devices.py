@@ -0,0 +1,99 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Pin read/write rates through the device classes, and the cost of device
+construction and of importing the library.
+"""
+
+import sys
+import subprocess
+from time import perf_counter
+
+from gpiozero import (
+    Device,
+    OutputDevice,
+    LED,
+    PWMLED,
+    DigitalInputDevice,
+    Button,
+)
+from gpiozero.pins.mock import MockPWMPin
+
+from common import measure_rate
+
+
+def bench_output_device_write(factory):
+    with OutputDevice(4) as device:
+        return {
+            'on_off_per_sec': measure_rate(
+                lambda: (device.on(), device.off())) * 2,
+            'value_per_sec': measure_rate(
+                lambda: setattr(device, 'value', 1)),
+        }
+
+
+def bench_led_write(factory):
+    with LED(4) as led:
+        return {
+            'on_off_per_sec': measure_rate(lambda: (led.on(), led.off())) * 2,
+            'toggle_per_sec': measure_rate(led.toggle),
+        }
+
+
+def bench_pwmled_write(factory):
+    factory.pin_class = MockPWMPin
+    values = [i / 100 for i in range(101)]
+    with PWMLED(4) as led:
+        def write():
+            for value in values:
+                led.value = value
+        return {
+            'value_per_sec': measure_rate(write) * len(values),
+        }
+
+
+def bench_input_read(factory):
+    with DigitalInputDevice(4) as device:
+        result = {
+            'digital_input_value_per_sec': measure_rate(
+                lambda: device.value),
+        }
+    with Button(4) as button:
+        result['button_is_pressed_per_sec'] = measure_rate(
+            lambda: button.is_pressed)
+    return result
+
+
+def bench_device_lifecycle(factory):
+    def led():
+        LED(4).close()
+    def button():
+        Button(4).close()
+    return {
+        'led_open_close_per_sec': measure_rate(led),
+        'button_open_close_per_sec': measure_rate(button),
+    }
+
+
+def bench_import_time(factory):
+    def run(code):
+        best = None
+        for i in range(5):
+            start = perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True)
+            elapsed = perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return best
+    baseline = run('pass')
+    return {
+        'import_gpiozero_ms': (run('import gpiozero') - baseline) * 1000,
+        'import_button_ms': (
+            run('from gpiozero import Button') - baseline) * 1000,
+        'import_all_ms': (run('from gpiozero import *') - baseline) * 1000,
+        'interpreter_start_ms': baseline * 1000,
+    }
@@ -0,0 +1,73 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Input event handling: edge-to-callback latency, rotary encoder step rate,
+and the sampling rate of the smoothed input devices.
+"""
+
+from time import perf_counter, sleep
+
+from gpiozero import Button, RotaryEncoder, SmoothedInputDevice
+from gpiozero.pins.mock import MockPin
+
+from common import measure_rate, summarize
+
+
+def bench_edge_latency(factory):
+    pin = factory.pin(4)
+    samples = []
+    start = None
+    def pressed():
+        samples.append(perf_counter() - start)
+    with Button(4) as button:
+        button.when_pressed = pressed
+        button.when_released = pressed
+        for i in range(10000):
+            start = perf_counter()
+            pin.drive_low()
+            start = perf_counter()
+            pin.drive_high()
+    return summarize(samples, 'latency')
+
+
+def bench_rotary_encoder(factory):
+    a_pin = factory.pin(20)
+    b_pin = factory.pin(21)
+    with RotaryEncoder(20, 21, max_steps=0) as encoder:
+        def step():
+            a_pin.drive_low()
+            b_pin.drive_low()
+            a_pin.drive_high()
+            b_pin.drive_high()
+        rate = measure_rate(step)
+        assert encoder.steps > 0
+    return {'steps_per_sec': rate}
+
+
+class CountingPin(MockPin):
+    def __init__(self, factory, number):
+        super().__init__(factory, number)
+        self.reads = 0
+
+    def _get_state(self):
+        self.reads += 1
+        return super()._get_state()
+
+
+def bench_smoothed_input(factory):
+    pin = factory.pin(4, pin_class=CountingPin)
+    # With no wait between samples, this measures the maximum rate the
+    # sampling thread manages
+    with SmoothedInputDevice(4, queue_len=5, sample_wait=0.0) as device:
+        device._queue.start()
+        sleep(0.1)
+        start_reads = pin.reads
+        start = perf_counter()
+        sleep(1)
+        reads = pin.reads - start_reads
+        elapsed = perf_counter() - start
+    return {'samples_per_sec': reads / elapsed}
@@ -0,0 +1,58 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Software SPI throughput, raw and through the MCP3008 ADC class.
+"""
+
+from gpiozero import MCP3008
+from gpiozero.pins.mock import MockSPIDevice
+
+from common import measure_rate
+
+
+class MockMCP3008(MockSPIDevice):
+    """
+    A minimal MCP3008 which returns the channel number as its reading.
+    """
+    def __init__(self, clock_pin, mosi_pin, miso_pin, select_pin):
+        super().__init__(clock_pin, mosi_pin, miso_pin, select_pin)
+        self.state = 'idle'
+
+    def on_start(self):
+        super().on_start()
+        self.state = 'idle'
+
+    def on_bit(self):
+        if self.state == 'idle':
+            if self.rx_buf[-1]:
+                self.state = 'mode'
+            self.rx_buf = []
+        elif self.state == 'mode':
+            self.state = 'channel'
+            self.rx_buf = []
+        elif self.state == 'channel':
+            if len(self.rx_buf) == 3:
+                self.tx_word(self.rx_word(), 12)
+                self.state = 'result'
+        elif self.state == 'result' and not self.tx_buf:
+            self.state = 'idle'
+            self.rx_buf = []
+
+
+def bench_software_spi(factory):
+    data = list(range(256))
+    with factory.spi(clock_pin=11, mosi_pin=10, miso_pin=9,
+                     select_pin=8) as spi:
+        rate = measure_rate(lambda: spi.transfer(data))
+    return {'bits_per_sec': rate * len(data) * 8}
+
+
+def bench_mcp3008(factory):
+    MockMCP3008(11, 10, 9, 8)
+    with MCP3008(channel=3) as adc:
+        assert adc.raw_value == 3
+        return {'samples_per_sec': measure_rate(lambda: adc.value)}
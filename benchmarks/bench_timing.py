@@ -0,0 +1,32 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Timing accuracy of the background blink and pulse threads.
+"""
+
+from gpiozero import LED, PWMLED
+from gpiozero.pins.mock import MockPWMPin
+
+from common import summarize, intervals
+
+
+def bench_blink_jitter(factory):
+    period = 0.005
+    with LED(4) as led:
+        led.blink(on_time=period, off_time=period, n=200, background=False)
+        errors = [abs(t - period) for t in intervals(led.pin.states)]
+    return summarize(errors, 'jitter')
+
+
+def bench_pulse_jitter(factory):
+    factory.pin_class = MockPWMPin
+    # PWMOutputDevice.pulse updates the value at 25 frames per second
+    fps = 25
+    with PWMLED(4) as led:
+        led.pulse(fade_in_time=0.5, fade_out_time=0.5, n=2, background=False)
+        errors = [abs(t - 1 / fps) for t in intervals(led.pin.states)]
+    return summarize(errors, 'jitter')
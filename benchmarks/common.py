@@ -0,0 +1,74 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Helpers shared by the benchmark modules. Each ``bench_*`` function in a
+``bench_*.py`` module is called with a fresh (real-time)
+:class:`~gpiozero.pins.mock.MockFactory` installed as the default pin factory,
+and returns a :class:`dict` mapping metric names to numbers. Metric names end
+with their unit (e.g. ``_per_sec``, ``_us``).
+"""
+
+from time import perf_counter
+from statistics import mean, median
+
+
+#: The default length of time (in seconds) each rate measurement runs for
+DURATION = 0.5
+
+
+def measure_rate(func, duration=None):
+    """
+    Calls *func* repeatedly for *duration* seconds (in batches, to keep the
+    overhead of checking the time down) and returns the number of calls per
+    second.
+    """
+    if duration is None:
+        duration = DURATION
+    calls = 0
+    batch = 1
+    start = perf_counter()
+    while True:
+        for i in range(batch):
+            func()
+        calls += batch
+        elapsed = perf_counter() - start
+        if elapsed >= duration:
+            return calls / elapsed
+        if batch < 1000:
+            batch *= 2
+
+
+def summarize(samples, prefix, scale=1e6, unit='us'):
+    """
+    Returns a :class:`dict` of the mean, median, 99th percentile, and maximum
+    of *samples* (in seconds), multiplied by *scale*, with keys starting with
+    *prefix* and ending with *unit*.
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return {
+        '{prefix}_mean_{unit}'.format(prefix=prefix, unit=unit):
+            mean(samples) * scale,
+        '{prefix}_median_{unit}'.format(prefix=prefix, unit=unit):
+            median(samples) * scale,
+        '{prefix}_p99_{unit}'.format(prefix=prefix, unit=unit):
+            p99 * scale,
+        '{prefix}_max_{unit}'.format(prefix=prefix, unit=unit):
+            samples[-1] * scale,
+    }
+
+
+def intervals(states):
+    """
+    Returns the time between successive changes in a mock pin's
+    :attr:`~gpiozero.pins.mock.MockPin.states` (the timestamps of which are
+    already relative to the prior state). The first change is excluded as
+    it is measured from the pin's construction.
+    """
+    return [state.timestamp for state in states][2:]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Runs the GPIO Zero benchmarks against the mock pin factory and outputs the
+results as JSON, for comparison between releases. For example:
+
+    $ python3 benchmarks/run.py -o results.json
+    $ python3 benchmarks/run.py -k spi -k led
+"""
+
+import os
+import sys
+import json
+import platform
+import argparse
+import importlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from gpiozero import Device
+from gpiozero.pins.mock import MockFactory
+
+import common
+
+
+def find_benchmarks(patterns=None):
+    """
+    Yields ``(name, function)`` for every ``bench_*`` function in every
+    ``bench_*.py`` module alongside this script, whose name contains any of
+    *patterns* (if specified).
+    """
+    for path in sorted(Path(__file__).parent.glob('bench_*.py')):
+        module = importlib.import_module(path.stem)
+        for attr, func in vars(module).items():
+            if attr.startswith('bench_') and callable(func):
+                name = '{module}.{func}'.format(
+                    module=path.stem[len('bench_'):], func=attr[len('bench_'):])
+                if not patterns or any(p in name for p in patterns):
+                    yield name, func
+
+
+def run_benchmark(func):
+    save_factory = Device.pin_factory
+    Device.pin_factory = factory = MockFactory()
+    try:
+        return func(factory)
+    finally:
+        factory.reset()
+        factory.close()
+        Device.pin_factory = save_factory
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '-k', dest='patterns', action='append', metavar='PATTERN',
+        help="Only run benchmarks with names containing PATTERN (may be "
+        "given multiple times)")
+    parser.add_argument(
+        '-o', '--output', metavar='FILE',
+        help="Write the JSON results to the specified file (default: stdout)")
+    parser.add_argument(
+        '-d', '--duration', type=float, default=common.DURATION,
+        help="The duration (in seconds) of each rate measurement (default: "
+        "%(default)s)")
+    config = parser.parse_args(args)
+    common.DURATION = config.duration
+
+    results = {}
+    for name, func in find_benchmarks(config.patterns):
+        print(name, file=sys.stderr)
+        try:
+            results[name] = result = run_benchmark(func)
+        except Exception as e:
+            results[name] = {'error': repr(e)}
+            print('    error: {e!r}'.format(e=e), file=sys.stderr)
+        else:
+            for metric, value in result.items():
+                print('    {metric:<32s} {value:14.2f}'.format(
+                    metric=metric, value=value), file=sys.stderr)
+    report = {
+        'gpiozero': _version(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'duration': config.duration,
+        'results': results,
+    }
+    if config.output is None:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    else:
+        with open(config.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+            output.write('\n')
+    return 1 if any('error' in r for r in results.values()) else 0
+
+
+def _version():
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution('gpiozero').version
+    except Exception:
+        return None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,17 +17,14 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 
+import sys
+from importlib import import_module
+
 from .pins import (
     Factory,
     Pin,
     SPI,
 )
-from .pins.data import (
-    PiBoardInfo,
-    HeaderInfo,
-    PinInfo,
-    pi_info,
-)
 # Yes, import * is naughty, but exc imports nothing else so there's no cross
 # contamination here ... and besides, have you *seen* the list lately?!
 from .exc import *
@@ -44,84 +41,144 @@ from .mixins import (
     event,
     HoldMixin,
 )
-from .input_devices import (
-    InputDevice,
-    DigitalInputDevice,
-    SmoothedInputDevice,
-    Button,
-    LineSensor,
-    MotionSensor,
-    LightSensor,
-    DistanceSensor,
-    RotaryEncoder,
-)
-from .spi_devices import (
-    SPIDevice,
-    AnalogInputDevice,
-    MCP3001,
-    MCP3002,
-    MCP3004,
-    MCP3008,
-    MCP3201,
-    MCP3202,
-    MCP3204,
-    MCP3208,
-    MCP3301,
-    MCP3302,
-    MCP3304,
-)
-from .output_devices import (
-    OutputDevice,
-    DigitalOutputDevice,
-    PWMOutputDevice,
-    PWMLED,
-    LED,
-    Buzzer,
-    Motor,
-    PhaseEnableMotor,
-    Servo,
-    AngularServo,
-    RGBLED,
-    TonalBuzzer,
-)
-from .boards import (
-    CompositeOutputDevice,
-    ButtonBoard,
-    LEDCollection,
-    LEDBoard,
-    LEDBarGraph,
-    LEDCharDisplay,
-    LEDMultiCharDisplay,
-    LEDCharFont,
-    LedBorg,
-    PiHutXmasTree,
-    PiLiter,
-    PiLiterBarGraph,
-    TrafficLights,
-    PiTraffic,
-    PiStop,
-    StatusZero,
-    StatusBoard,
-    SnowPi,
-    TrafficLightsBuzzer,
-    FishDish,
-    TrafficHat,
-    TrafficpHat,
-    Robot,
-    RyanteckRobot,
-    CamJamKitRobot,
-    PololuDRV8835Robot,
-    Energenie,
-    PumpkinPi,
-    JamHat,
-    Pibrella,
-)
-from .internal_devices import (
-    InternalDevice,
-    PolledInternalDevice,
-    PingServer,
-    CPUTemperature,
-    LoadAverage,
-    TimeOfDay,
-    DiskUsage,
-)
+
+# The remaining public names are imported on first access (via __getattr__
+# below) so that, for example, a script which only uses Button need not pay
+# for importing the board tables, the output and SPI devices, etc.
+_LAZY_EXPORTS = {
+    name: module
+    for module, names in (
+        ('.pins.data', (
+            'PiBoardInfo',
+            'HeaderInfo',
+            'PinInfo',
+            'pi_info',
+        )),
+        ('.input_devices', (
+            'InputDevice',
+            'DigitalInputDevice',
+            'SmoothedInputDevice',
+            'Button',
+            'LineSensor',
+            'MotionSensor',
+            'LightSensor',
+            'DistanceSensor',
+            'RotaryEncoder',
+        )),
+        ('.spi_devices', (
+            'SPIDevice',
+            'AnalogInputDevice',
+            'AnalogInputStream',
+            'MCP3001',
+            'MCP3002',
+            'MCP3004',
+            'MCP3008',
+            'MCP3201',
+            'MCP3202',
+            'MCP3204',
+            'MCP3208',
+            'MCP3301',
+            'MCP3302',
+            'MCP3304',
+        )),
+        ('.output_devices', (
+            'OutputDevice',
+            'DigitalOutputDevice',
+            'PWMOutputDevice',
+            'PWMLED',
+            'LED',
+            'Buzzer',
+            'Motor',
+            'PhaseEnableMotor',
+            'Servo',
+            'AngularServo',
+            'RGBLED',
+            'TonalBuzzer',
+        )),
+        ('.boards', (
+            'CompositeOutputDevice',
+            'ButtonBoard',
+            'LEDCollection',
+            'LEDBoard',
+            'LEDBarGraph',
+            'LEDCharDisplay',
+            'LEDMultiCharDisplay',
+            'LEDCharFont',
+            'LedBorg',
+            'PiHutXmasTree',
+            'PiLiter',
+            'PiLiterBarGraph',
+            'TrafficLights',
+            'PiTraffic',
+            'PiStop',
+            'StatusZero',
+            'StatusBoard',
+            'SnowPi',
+            'TrafficLightsBuzzer',
+            'FishDish',
+            'TrafficHat',
+            'TrafficpHat',
+            'Robot',
+            'RyanteckRobot',
+            'CamJamKitRobot',
+            'PololuDRV8835Robot',
+            'Energenie',
+            'PumpkinPi',
+            'JamHat',
+            'Pibrella',
+        )),
+        ('.internal_devices', (
+            'InternalDevice',
+            'PolledInternalDevice',
+            'PingServer',
+            'CPUTemperature',
+            'LoadAverage',
+            'TimeOfDay',
+            'DiskUsage',
+        )),
+    )
+    for name in names
+}
+
+# Submodules which importing the package used to import as a side effect, and
+# which are therefore likewise imported on first access
+_LAZY_MODULES = {
+    'input_devices',
+    'output_devices',
+    'spi_devices',
+    'boards',
+    'internal_devices',
+    'tones',
+    'fonts',
+}
+
+__all__ = [
+    name for name, value in globals().items()
+    if not name.startswith('_') and name not in {
+        'sys', 'import_module', 'pins', 'exc', 'devices', 'mixins', 'threads',
+        'compat'}
+] + list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        # Importing the submodule also binds it in our namespace
+        return import_module('.' + name, __name__)
+    try:
+        module = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError('module {mod!r} has no attribute {name!r}'.format(
+            mod=__name__, name=name)) from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS) | _LAZY_MODULES)
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module __getattr__ (PEP 562) is unsupported; import everything now
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
@@ -18,7 +18,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import warnings
-from time import sleep
 from itertools import repeat, cycle, chain, tee
 from threading import Lock
 from collections import OrderedDict, Counter, namedtuple
@@ -37,6 +36,7 @@ from .exc import (
 from .input_devices import Button
 from .output_devices import (
     OutputDevice,
+    DigitalOutputDevice,
     LED,
     PWMLED,
     RGBLED,
@@ -45,7 +45,7 @@ from .output_devices import (
     PhaseEnableMotor,
     TonalBuzzer,
     )
-from .threads import GPIOThread
+from .threads import GPIOThread, sleep
 from .devices import Device, CompositeDevice
 from .mixins import SharedMixin, SourceMixin, HoldMixin, event
 from .fonts import load_font_7seg, load_font_14seg
@@ -88,11 +88,50 @@ class CompositeOutputDevice(SourceMixin, CompositeDevice):
         their :attr:`value` attributes will be accessible as named elements of
         the composite device's tuple :attr:`value`.
     """
+    def __init__(self, *args, _order=None, pin_factory=None, **kwargs):
+        self._group = None
+        super().__init__(*args, _order=_order, pin_factory=pin_factory,
+                         **kwargs)
+
+    def _group_writer(self):
+        # Returns a callable which writes a sequence of values, one for each
+        # subordinate device, with a single group write (see
+        # Factory._group_writer). This is only possible when all subordinates
+        # are (open) digital output devices on pins that their factory can
+        # write as a group; None is returned otherwise
+        if any(device.closed for device in self):
+            return None
+        if self._group is None:
+            self._group = False
+            if self._all and all(
+                    isinstance(device, DigitalOutputDevice)
+                    for device in self):
+                pins = [device.pin for device in self]
+                factory = pins[0].factory
+                if all(pin.factory is factory for pin in pins):
+                    write = factory._group_writer(pins)
+                    if write is not None:
+                        to_state = [device._value_to_state for device in self]
+                        def group_write(values):
+                            if write([
+                                f(value) for f, value in zip(to_state, values)
+                            ]) is False:
+                                # The group has been dissolved; build a new
+                                # one on the next write
+                                self._group = None
+                        self._group = group_write
+        return self._group or None
 
     def on(self):
         """
         Turn all the output devices on.
         """
+        write = self._group_writer()
+        if write is not None:
+            for device in self:
+                device._stop_blink()
+            write([True] * len(self))
+            return
         for device in self:
             if isinstance(device, (OutputDevice, CompositeOutputDevice)):
                 device.on()
@@ -101,6 +140,12 @@ class CompositeOutputDevice(SourceMixin, CompositeDevice):
         """
         Turn all the output devices off.
         """
+        write = self._group_writer()
+        if write is not None:
+            for device in self:
+                device._stop_blink()
+            write([False] * len(self))
+            return
         for device in self:
             if isinstance(device, (OutputDevice, CompositeOutputDevice)):
                 device.off()
@@ -124,6 +169,14 @@ class CompositeOutputDevice(SourceMixin, CompositeDevice):
 
     @value.setter
     def value(self, value):
+        write = self._group_writer()
+        if write is not None:
+            value = tuple(value)
+            if len(value) == len(self):
+                for device in self:
+                    device._stop_blink()
+                write(value)
+                return
         for device, v in zip(self, value):
             if isinstance(device, (OutputDevice, CompositeOutputDevice)):
                 device.value = v
@@ -594,12 +647,16 @@ class LEDBoard(LEDCollection):
                 if led._controller not in (None, self):
                     led._controller._stop_blink(led)
                 led._controller = self
+        write = self._group_writer()
         for value, delay in sequence:
             with self._blink_lock:
                 if not self._blink_leds:
                     break
-                for led in self._blink_leds:
-                    led._write(value)
+                if write is not None and len(self._blink_leds) == len(self):
+                    write([value] * len(self))
+                else:
+                    for led in self._blink_leds:
+                        led._write(value)
             if self._blink_thread.stopping.wait(delay):
                 break
 
@@ -13,8 +13,11 @@ import os
 import atexit
 import weakref
 import warnings
-from collections import namedtuple, OrderedDict
+import traceback
+from collections import namedtuple, OrderedDict, deque
 from itertools import chain
+from threading import Thread
+from time import monotonic
 from types import FunctionType
 
 from .threads import _threads_shutdown
@@ -32,6 +35,7 @@ from .exc import (
     GPIODeviceClosed,
     NativePinFactoryFallback,
     PinFactoryFallback,
+    ShutdownTimeout,
 )
 
 from .compat import frozendict
@@ -46,6 +50,10 @@ native_fallback_message = (
 class GPIOMeta(type):
     # NOTE Yes, this is a metaclass. Don't be scared - it's a simple one.
 
+    # Maps each class to the frozenset of attribute names it permits on its
+    # instances after construction (see __call__ below)
+    _class_attrs = weakref.WeakKeyDictionary()
+
     def __new__(mcls, name, bases, cls_dict):
         # Construct the class as normal
         cls = super().__new__(mcls, name, bases, cls_dict)
@@ -88,12 +96,18 @@ class GPIOMeta(type):
                             old_close()
                         finally:
                             try:
-                                del cls._instances[key]
+                                instance = cls._instances[key]()
                             except KeyError:
                                 # If the _refs go negative (too many closes)
                                 # just ignore the resulting KeyError here -
                                 # it's already gone
                                 pass
+                            else:
+                                # Too many closes (e.g. a close followed by
+                                # __del__) may also find the key now belongs
+                                # to a newer instance; leave that alone
+                                if instance is None or instance is self:
+                                    del cls._instances[key]
 
                 self.close = close
                 cls._instances[key] = weakref.ref(self)
@@ -101,12 +115,19 @@ class GPIOMeta(type):
             # Construct the instance as normal
             self = super().__call__(*args, **kwargs)
         # At this point __new__ and __init__ have all been run. We now fix the
-        # set of attributes on the class by dir'ing the instance and creating a
-        # frozenset of the result called __attrs__ (which is queried by
-        # GPIOBase.__setattr__). An exception is made for SharedMixin devices
-        # which can be constructed multiple times, returning the same instance
+        # set of attributes on the instance by storing a frozenset of the
+        # class' attributes called __attrs__ (which is queried, along with the
+        # instance's __dict__, by GPIOBase.__setattr__). The frozenset is
+        # built by dir'ing the class the first time it is constructed and
+        # shared by all its instances thereafter. An exception is made for
+        # SharedMixin devices which can be constructed multiple times,
+        # returning the same instance
         if not issubclass(cls, SharedMixin) or self._refs == 1:
-            self.__attrs__ = frozenset(dir(self))
+            try:
+                attrs = GPIOMeta._class_attrs[cls]
+            except KeyError:
+                attrs = GPIOMeta._class_attrs[cls] = frozenset(dir(cls))
+            self.__attrs__ = attrs
         return self
 
 
@@ -117,11 +138,17 @@ class GPIOBase(metaclass=GPIOMeta):
         # conjunction with the meta-class above). Traditionally, this is
         # managed with __slots__; however, this doesn't work with Python's
         # multiple inheritance system which we need to use in order to avoid
-        # repeating the "source" and "values" property code in myriad places
-        if hasattr(self, '__attrs__') and name not in self.__attrs__:
-            raise AttributeError(
-                "'{self.__class__.__name__}' object has no attribute "
-                "'{name}'".format(self=self, name=name))
+        # repeating the "source" and "values" property code in myriad places.
+        # Names already present in the instance's __dict__ are always
+        # permitted, which keeps the common case (updating an existing
+        # attribute) down to a single dict lookup
+        d = self.__dict__
+        if name not in d:
+            attrs = d.get('__attrs__')
+            if attrs is not None and name not in attrs:
+                raise AttributeError(
+                    "'{self.__class__.__name__}' object has no attribute "
+                    "'{name}'".format(self=self, name=name))
         return super().__setattr__(name, value)
 
     def __del__(self):
@@ -602,25 +629,93 @@ class GPIODevice(Device):
                     self=self))
 
 
-def _devices_shutdown():
+def _shutdown_groups(reservations):
+    # Partition the reserving devices into groups such that no two groups
+    # share a pin. Devices within a group (for example, several SPI devices on
+    # a common bus) must be closed in turn, but separate groups can safely be
+    # closed concurrently
+    seen = set()
+    groups = []
+    for dev in reservations.reservers():
+        if id(dev) in seen:
+            continue
+        seen.add(id(dev))
+        group = []
+        stack = [dev]
+        while stack:
+            dev = stack.pop()
+            group.append(dev)
+            for pin in reservations.pins(dev):
+                for other in reservations.reservers(pin):
+                    if id(other) not in seen:
+                        seen.add(id(other))
+                        stack.append(other)
+        groups.append(group)
+    return groups
+
+
+def _devices_shutdown(timeout=10):
+    """
+    Closes all devices holding pin reservations, then closes the default pin
+    factory, waiting no longer than *timeout* seconds for the devices to
+    close. Returns a list of the devices which failed to close in that time.
+    """
+    stragglers = []
     if Device.pin_factory is not None:
         with Device.pin_factory._res_lock:
-            reserved_devices = {
-                dev
-                for ref_list in Device.pin_factory._reservations.values()
-                for ref in ref_list
-                for dev in (ref(),)
-                if dev is not None
-            }
-        for dev in reserved_devices:
-            dev.close()
-        Device.pin_factory.close()
-        Device.pin_factory = None
+            groups = _shutdown_groups(Device.pin_factory._reservations)
+        pending = deque(groups)
 
-
-def _shutdown():
-    _threads_shutdown()
-    _devices_shutdown()
+        def close_groups():
+            while True:
+                try:
+                    group = pending.popleft()
+                except IndexError:
+                    break
+                for dev in group:
+                    # A device which fails to close mustn't prevent the rest
+                    # of its group (and the other groups) from closing
+                    try:
+                        dev.close()
+                    except Exception:
+                        traceback.print_exc()
+
+        # Groups are closed by workers (even when there's just the one) so the
+        # deadline applies, but only concurrently if the factory permits it
+        deadline = monotonic() + timeout
+        workers = [
+            Thread(target=close_groups, daemon=True)
+            for i in range(min(
+                8 if Device.pin_factory._concurrent_close else 1,
+                len(groups)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(max(0, deadline - monotonic()))
+        stragglers = [
+            dev for group in groups for dev in group if not dev.closed]
+        if any(worker.is_alive() for worker in workers):
+            # Closing the factory beneath a device that's still closing could
+            # do more harm than leaving it open
+            warnings.warn(ShutdownTimeout(
+                'not closing {factory!r} as devices are still closing'.format(
+                    factory=Device.pin_factory)))
+        else:
+            Device.pin_factory.close()
+        Device.pin_factory = None
+    return stragglers
+
+
+def _shutdown(timeout=10):
+    deadline = monotonic() + timeout
+    stragglers = _threads_shutdown(timeout)
+    stragglers.extend(_devices_shutdown(max(0, deadline - monotonic())))
+    if stragglers:
+        warnings.warn(ShutdownTimeout(
+            'failed to stop within {timeout} seconds: {stragglers}'.format(
+                timeout=timeout,
+                stragglers=', '.join(repr(s) for s in stragglers))))
 
 
 atexit.register(_shutdown)
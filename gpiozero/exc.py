@@ -192,3 +192,6 @@ class CallbackSetToNone(GPIOZeroWarning):
 
 class AmbiguousTone(GPIOZeroWarning):
     "Warning raised when a Tone is constructed with an ambiguous number"
+
+class ShutdownTimeout(GPIOZeroWarning):
+    "Warning raised when threads or devices fail to stop within the shutdown timeout"
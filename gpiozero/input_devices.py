@@ -13,9 +13,9 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import sys
 import warnings
-from time import sleep
-from threading import Event, Lock
+from threading import Lock
 from itertools import tee
 from statistics import median, mean
 
@@ -23,10 +23,7 @@ from .exc import InputDeviceError, DeviceClosed, DistanceSensorNoEcho, \
     PinInvalidState, PWMSoftwareFallback
 from .devices import GPIODevice, CompositeDevice
 from .mixins import GPIOQueue, EventsMixin, HoldMixin, event
-try:
-    from .pins.pigpio import PiGPIOFactory
-except ImportError:
-    PiGPIOFactory = None
+from .threads import GPIOEvent, sleep
 
 
 class InputDevice(GPIODevice):
@@ -664,7 +661,7 @@ class LightSensor(SmoothedInputDevice):
         try:
             self._charge_time_limit = charge_time_limit
             self._charge_time = None
-            self._charged = Event()
+            self._charged = GPIOEvent()
             self.pin.edges = 'rising'
             self.pin.bounce = None
             self.pin.when_changed = self._cap_charged
@@ -829,7 +826,7 @@ class DistanceSensor(SmoothedInputDevice):
             self.threshold = threshold_distance / max_distance
             self.speed_of_sound = 343.26 # m/s
             self._trigger = GPIODevice(trigger, pin_factory=pin_factory)
-            self._echo = Event()
+            self._echo = GPIOEvent()
             self._echo_rise = None
             self._echo_fall = None
             self._trigger.pin.function = 'output'
@@ -842,7 +839,11 @@ class DistanceSensor(SmoothedInputDevice):
             self.close()
             raise
 
-        if PiGPIOFactory is None or not isinstance(self.pin_factory, PiGPIOFactory):
+        # If the pigpio factory is in use its module must already be loaded;
+        # don't import it (an expensive failure when pigpio isn't installed)
+        pigpio = sys.modules.get('gpiozero.pins.pigpio')
+        if pigpio is None or not isinstance(
+                self.pin_factory, pigpio.PiGPIOFactory):
             warnings.warn(PWMSoftwareFallback(
                 'For more accurate readings, use the pigpio pin factory.'
                 'See https://gpiozero.readthedocs.io/en/stable/api_input.html#distancesensor-hc-sr04 for more info'
@@ -1134,9 +1135,9 @@ class RotaryEncoder(EventsMixin, CompositeDevice):
         self._when_rotated = None
         self._when_rotated_cw = None
         self._when_rotated_ccw = None
-        self._rotate_event = Event()
-        self._rotate_cw_event = Event()
-        self._rotate_ccw_event = Event()
+        self._rotate_event = GPIOEvent()
+        self._rotate_cw_event = GPIOEvent()
+        self._rotate_ccw_event = GPIOEvent()
         super().__init__(
             a=InputDevice(a, pull_up=True, pin_factory=pin_factory),
             b=InputDevice(b, pull_up=True, pin_factory=pin_factory),
@@ -11,13 +11,21 @@
 
 import os
 import io
+import random
+import select
+import socket
+import struct
 import subprocess
+import traceback
+from math import ceil
+from time import monotonic
 from datetime import datetime, time
+from threading import Lock, current_thread
 import warnings
 
 from .devices import Device
 from .mixins import EventsMixin, event
-from .threads import GPIOThread
+from .threads import GPIOThread, GPIOEvent, _WakingEvent, _now
 from .exc import ThresholdOutOfRange, DeviceClosed
 
 
@@ -52,15 +60,179 @@ class InternalDevice(EventsMixin, Device):
                     self=self))
 
 
+class _SysFile:
+    """
+    Holds *filename* (typically a sysfs or procfs file) open, re-reading its
+    content from the start on each call to :meth:`read`. Each read costs a
+    single :func:`os.preadv` call into a buffer allocated once, rather than
+    the open, read, and close of opening the file afresh.
+    """
+    def __init__(self, filename, size=256):
+        self.filename = filename
+        self._size = size
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._fd = os.open(filename, os.O_RDONLY)
+
+    def close(self):
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+    if hasattr(os, 'preadv'):
+        def read(self):
+            # Returns a view of the buffer, valid only until the next read
+            return self._view[:os.preadv(self._fd, [self._buf], 0)]
+    else:  # pragma: no cover
+        # Python 3.6 and earlier lack preadv
+        def read(self):
+            return memoryview(os.pread(self._fd, self._size, 0))
+
+
+def _open_sys_files(filenames):
+    files = []
+    try:
+        for filename in filenames:
+            files.append(_SysFile(filename))
+    except:
+        for f in files:
+            f.close()
+        raise
+    return files
+
+
+class _InternalDevicePoller:
+    """
+    Polls all :class:`PolledInternalDevice` instances with active events from a
+    single background thread, each on its own
+    :attr:`~PolledInternalDevice.event_delay` schedule. The thread is started
+    when the first device is added, and stopped when the last is removed.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._polling = Lock()
+        self._devices = {}
+        self._wake = GPIOEvent()
+        self._thread = None
+
+    def __contains__(self, device):
+        return device in self._devices
+
+    def add(self, device):
+        with self._lock:
+            if device not in self._devices:
+                self._devices[device] = _now() + device.event_delay
+                # The thread may have been stopped without our involvement
+                # (e.g. by _threads_shutdown); start a fresh one if so
+                if self._thread is None or self._thread.stopping.is_set():
+                    self._thread = GPIOThread(self._poll)
+                    self._thread.stopping = _WakingEvent(self._wake)
+                    self._thread.start()
+                else:
+                    self._wake.set()
+
+    def reschedule(self, device):
+        with self._lock:
+            if device in self._devices:
+                self._devices[device] = _now() + device.event_delay
+                self._wake.set()
+
+    def remove(self, device):
+        with self._lock:
+            if self._devices.pop(device, None) is None:
+                return
+            thread = self._thread
+            last = not self._devices
+            if last:
+                self._thread = None
+        if thread is current_thread():
+            # An event handler removing a device (perhaps its own); the rest of
+            # this pass skips it, and if it was the last the thread terminates
+            # shortly anyway, so don't join it
+            if last:
+                thread.stopping.set()
+        else:
+            # Wait for any in-flight pass, which may be polling the device, so
+            # that nothing touches it (or fires its events) once we return
+            with self._polling:
+                pass
+            if last:
+                thread.stop()
+
+    def _poll(self):
+        stopping = current_thread().stopping
+        while not stopping.is_set():
+            self._wake.clear()
+            now = _now()
+            with self._polling:
+                self._poll_due(stopping, now)
+            with self._lock:
+                timeout = min(self._devices.values(), default=None)
+            if timeout is not None:
+                timeout = max(0, timeout - _now())
+            self._wake.wait(timeout)
+
+    def _poll_due(self, stopping, now):
+        # A single pass over the devices due at *now*; called with _polling
+        # held, so that remove() can wait for it to finish
+        with self._lock:
+            due = [
+                device for device, when in self._devices.items()
+                if when <= now
+            ]
+        # Give all due devices the chance to start any slow operations
+        # (e.g. a ping) before any are evaluated, so that these proceed
+        # concurrently
+        for device in due:
+            if device.closed:
+                continue
+            try:
+                device._begin_poll()
+            except Exception:
+                traceback.print_exc()
+        for device in due:
+            if stopping.is_set():
+                break
+            with self._lock:
+                # Skip any device removed (or closed) since the pass began,
+                # e.g. by another device's event handler
+                if device not in self._devices or device.closed:
+                    continue
+            try:
+                device._fire_events(
+                    device.pin_factory.ticks(), device.is_active)
+            except Exception:
+                # Treat a failing device as if its own thread had died,
+                # without affecting the polling of all the others
+                traceback.print_exc()
+                with self._lock:
+                    self._devices.pop(device, None)
+                continue
+            with self._lock:
+                try:
+                    when = self._devices[device] + device.event_delay
+                except KeyError:
+                    continue  # device was removed while being polled
+                self._devices[device] = max(when, now)
+
+
+_POLLER = _InternalDevicePoller()
+
+
 class PolledInternalDevice(InternalDevice):
     """
     Extends :class:`InternalDevice` to provide a background thread to poll
     internal devices that lack any other mechanism to inform the instance of
-    changes.
+    changes. A single background thread is shared by all such devices.
     """
+    # The number of seconds for which the result of a read (of a file, or
+    # similar) is re-used; this permits properties like value and is_active,
+    # evaluated together, to share one read
+    _read_ttl = 0.01
+
     def __init__(self, *, event_delay=1.0, pin_factory=None):
-        self._event_thread = None
         self._event_delay = event_delay
+        self._read_cache = None
         super().__init__(pin_factory=pin_factory)
 
     def close(self):
@@ -88,6 +260,7 @@ class PolledInternalDevice(InternalDevice):
     @event_delay.setter
     def event_delay(self, value):
         self._event_delay = float(value)
+        _POLLER.reschedule(self)
 
     def wait_for_active(self, timeout=None):
         self._start_stop_events(True)
@@ -105,17 +278,203 @@ class PolledInternalDevice(InternalDevice):
             self._start_stop_events(
                 self.when_activated or self.when_deactivated)
 
-    def _watch_value(self):
-        while not self._event_thread.stopping.wait(self._event_delay):
-            self._fire_events(self.pin_factory.ticks(), self.is_active)
+    def _read_cached(self, read):
+        # Calls read() and returns its result, unless it was last called less
+        # than _read_ttl seconds ago, in which case the prior result is
+        # returned instead
+        now = self.pin_factory.ticks()
+        cache = self._read_cache
+        if cache is not None:
+            then, result = cache
+            if self.pin_factory.ticks_diff(now, then) < self._read_ttl:
+                return result
+        result = read()
+        self._read_cache = (now, result)
+        return result
+
+    def _begin_poll(self):
+        # Called by the poller shortly before it evaluates is_active; the
+        # default does nothing
+        pass
 
     def _start_stop_events(self, enabled):
-        if self._event_thread and not enabled:
-            self._event_thread.stop()
-            self._event_thread = None
-        elif not self._event_thread and enabled:
-            self._event_thread = GPIOThread(self._watch_value)
-            self._event_thread.start()
+        if enabled:
+            _POLLER.add(self)
+        else:
+            _POLLER.remove(self)
+
+
+def _icmp_checksum(data):
+    # The internet checksum (RFC 1071) of data
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack('!{n}H'.format(n=len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+class _PingRequest:
+    __slots__ = ('seq', 'sent', 'rtt', 'done')
+
+    def __init__(self, seq):
+        self.seq = seq
+        self.sent = monotonic()
+        self.rtt = None
+        self.done = False
+
+
+class _PingSocket:
+    """
+    An ICMP echo socket for the address *family*, shared by all
+    :class:`PingServer` instances pinging addresses of that family. An
+    unprivileged datagram socket is preferred, falling back to a raw socket
+    (which requires privileges). If neither can be opened, :exc:`OSError` is
+    raised.
+
+    Requests are sent with :meth:`send` and their replies awaited with
+    :meth:`wait`. Whichever thread is waiting reads the socket and matches all
+    replies that arrive to their requests, so several requests may be
+    outstanding at once.
+    """
+    def __init__(self, family):
+        if family == socket.AF_INET:
+            proto, self._echo, self._reply = socket.IPPROTO_ICMP, 8, 0
+        else:
+            proto, self._echo, self._reply = socket.IPPROTO_ICMPV6, 128, 129
+        try:
+            self._sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+            self._raw = False
+        except OSError:
+            self._sock = socket.socket(family, socket.SOCK_RAW, proto)
+            self._raw = True
+        self._sock.setblocking(False)
+        self.family = family
+        # The identifier only matters to raw sockets; with datagram sockets
+        # the kernel substitutes its own, and filters replies by it. Raw IPv4
+        # sockets also see the IP header, and must calculate the checksum
+        self._ident = random.getrandbits(16)
+        self._strip_header = self._raw and family == socket.AF_INET
+        self._token = os.urandom(8)
+        self._seq = random.getrandbits(16)
+        self._lock = Lock()
+        self._recv_lock = Lock()
+        self._pending = {}
+
+    def close(self):
+        self._sock.close()
+
+    def send(self, address):
+        """
+        Sends an echo request to the socket *address*, returning a request to
+        pass to :meth:`wait`.
+        """
+        with self._lock:
+            self._seq = seq = (self._seq + 1) & 0xffff
+            request = _PingRequest(seq)
+            self._pending[seq] = request
+        packet = struct.pack(
+            '!BBHHH', self._echo, 0, 0, self._ident, seq) + self._token
+        if self._strip_header:
+            packet = (
+                packet[:2] + struct.pack('!H', _icmp_checksum(packet)) +
+                packet[4:])
+        try:
+            self._sock.sendto(packet, address)
+        except OSError:
+            with self._lock:
+                self._pending.pop(seq, None)
+            request.done = True
+        return request
+
+    def wait(self, request, timeout):
+        """
+        Waits until *timeout* seconds after *request* was sent for its reply.
+        Returns the round-trip time in seconds, or :data:`None` if no reply
+        was received.
+        """
+        deadline = request.sent + timeout
+        try:
+            while not request.done:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                if self._recv_lock.acquire(timeout=remaining):
+                    try:
+                        if not request.done:
+                            self._receive(remaining)
+                    finally:
+                        self._recv_lock.release()
+        finally:
+            with self._lock:
+                self._pending.pop(request.seq, None)
+        return request.rtt
+
+    def _receive(self, timeout):
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        while ready:
+            try:
+                data, address = self._sock.recvfrom(1024)
+            except OSError:
+                break
+            received = monotonic()
+            if self._strip_header:
+                data = data[(data[0] & 0x0f) * 4:]
+            header, token = data[:8], data[8:8 + len(self._token)]
+            if len(header) < 8 or token != self._token:
+                continue
+            kind, code, checksum, ident, seq = struct.unpack('!BBHHH', header)
+            if kind != self._reply or (self._raw and ident != self._ident):
+                continue
+            with self._lock:
+                request = self._pending.pop(seq, None)
+            if request is not None:
+                request.rtt = received - request.sent
+                request.done = True
+
+
+class _Pinger:
+    """
+    Owns the :class:`_PingSocket` instances shared by all :class:`PingServer`
+    instances. Sockets are opened on first use, and closed when the last
+    :class:`PingServer` is.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._users = 0
+        self._sockets = {}
+
+    def acquire(self):
+        with self._lock:
+            self._users += 1
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            if not self._users:
+                for sock in self._sockets.values():
+                    if sock is not None:
+                        sock.close()
+                self._sockets.clear()
+
+    def socket(self, family=socket.AF_INET):
+        """
+        Returns the :class:`_PingSocket` for *family*, or :data:`None` if no
+        ICMP socket can be opened for it.
+        """
+        with self._lock:
+            try:
+                return self._sockets[family]
+            except KeyError:
+                try:
+                    sock = _PingSocket(family)
+                except OSError:
+                    sock = None
+                self._sockets[family] = sock
+                return sock
+
+
+_PINGER = _Pinger()
 
 
 class PingServer(PolledInternalDevice):
@@ -136,6 +495,12 @@ class PingServer(PolledInternalDevice):
 
         pause()
 
+    Pings are sent in-process from an ICMP socket shared by all instances
+    (an unprivileged "ping" socket where the system permits, or a raw socket
+    when running with sufficient privileges). Hosts polled for events at the
+    same time are pinged concurrently. If no ICMP socket can be opened, the
+    system's :command:`ping` command is executed instead.
+
     :param str host:
         The hostname or IP address to attempt to ping.
 
@@ -143,16 +508,42 @@ class PingServer(PolledInternalDevice):
     :param event_delay:
         The number of seconds between pings (defaults to 10 seconds).
 
+    :type timeout: float
+    :param timeout:
+        The number of seconds to wait for a reply to each ping (defaults to 1
+        second).
+
     :type pin_factory: Factory or None
     :param pin_factory:
         See :doc:`api_pins` for more information (this is an advanced feature
         which most users can ignore).
     """
-    def __init__(self, host, *, event_delay=10.0, pin_factory=None):
+    # The number of seconds for which the address the host resolves to is
+    # re-used (it is also resolved again after any failed ping)
+    _resolve_ttl = 60.0
+
+    def __init__(self, host, *, event_delay=10.0, timeout=1.0,
+                 pin_factory=None):
         self._host = host
+        self._timeout = float(timeout)
+        self._address = None
+        self._pending = None
+        self._pinger = None
         super().__init__(event_delay=event_delay, pin_factory=pin_factory)
+        self._pinger = _PINGER
+        self._pinger.acquire()
         self._fire_events(self.pin_factory.ticks(), self.is_active)
 
+    def close(self):
+        super().close()
+        try:
+            pinger, self._pinger = self._pinger, None
+        except AttributeError:
+            pass  # pragma: no cover
+        else:
+            if pinger is not None:
+                pinger.release()
+
     def __repr__(self):
         try:
             self._check_open()
@@ -168,25 +559,89 @@ class PingServer(PolledInternalDevice):
         """
         return self._host
 
+    @property
+    def timeout(self):
+        """
+        The number of seconds to wait for a reply to each ping.
+        """
+        return self._timeout
+
     @property
     def value(self):
         """
         Returns :data:`1` if the host returned a single ping, and :data:`0`
         otherwise.
         """
-        # XXX This is doing a DNS lookup every time it's queried; should we
-        # call gethostbyname in the constructor and ping that instead (good
-        # for consistency, but what if the user *expects* the host to change
-        # address?)
+        return int(self._ping() is not None)
+
+    @property
+    def rtt(self):
+        """
+        Pings the host, returning the round-trip time in seconds, or
+        :data:`None` if the host did not reply. When the system's
+        :command:`ping` command is used, this is the time the command took to
+        execute, and thus a considerable over-estimate.
+        """
+        return self._ping()
+
+    def _begin_poll(self):
+        self._pending = (monotonic(), self._send())
+
+    def _ping(self):
+        self._check_open()
+        pending, self._pending = self._pending, None
+        # Ignore a ping sent for a poll that never evaluated it (its result
+        # would be stale)
+        if pending is None or monotonic() - pending[0] > self._timeout:
+            return self._send()()
+        else:
+            return pending[1]()
+
+    def _send(self):
+        # Starts a ping of the host, returning a function which waits for and
+        # returns its result. Falls back to running the ping command (when the
+        # function is called) if no ICMP socket can be opened for the family
+        # of the host's address
+        address = self._resolve()
+        if address is None:
+            return lambda: None
+        family, sockaddr = address
+        sock = self._pinger.socket(family)
+        if sock is None:
+            return self._ping_command
+        request = sock.send(sockaddr)
+
+        def wait():
+            rtt = sock.wait(request, self._timeout)
+            if rtt is None:
+                self._address = None
+            return rtt
+        return wait
+
+    def _resolve(self):
+        now = monotonic()
+        cached = self._address
+        if cached is None or now >= cached[0]:
+            try:
+                family, _, _, _, sockaddr = socket.getaddrinfo(
+                    self.host, None, 0, socket.SOCK_DGRAM)[0]
+            except OSError:
+                return None
+            cached = self._address = (now + self._resolve_ttl, family, sockaddr)
+        return cached[1:]
+
+    def _ping_command(self):
+        start = monotonic()
         with io.open(os.devnull, 'wb') as devnull:
             try:
                 subprocess.check_call(
-                    ['ping', '-c1', self.host],
+                    ['ping', '-c1', '-W', str(max(1, ceil(self._timeout))),
+                     self.host],
                     stdout=devnull, stderr=devnull)
             except subprocess.CalledProcessError:
-                return 0
+                return None
             else:
-                return 1
+                return monotonic() - start
 
     when_activated = event(
         """
@@ -238,11 +693,16 @@ class CPUTemperature(PolledInternalDevice):
 
         pause()
 
-    :param str sensor_file:
+    :type sensor_file: str or list
+    :param sensor_file:
         The file from which to read the temperature. This defaults to the
         sysfs file :file:`/sys/class/thermal/thermal_zone0/temp`. Whatever
         file is specified is expected to contain a single line containing the
-        temperature in milli-degrees celsius.
+        temperature in milli-degrees celsius. This may also be a list of such
+        files (e.g. one for each of several thermal zones), in which case
+        :attr:`temperature` is the highest temperature read from any of them,
+        and :attr:`temperatures` provides all of them. The files are held
+        open (and re-read) until the device is closed.
 
     :param float min_temp:
         The temperature at which :attr:`value` will read 0.0. This defaults to
@@ -268,7 +728,11 @@ class CPUTemperature(PolledInternalDevice):
     def __init__(self, sensor_file='/sys/class/thermal/thermal_zone0/temp', *,
             min_temp=0.0, max_temp=100.0, threshold=80.0, event_delay=5.0,
             pin_factory=None):
-        self.sensor_file = sensor_file
+        self._sensor_file = sensor_file
+        # Guards opening, replacing, and closing the held sensor files, so a
+        # close can't race a read from the poller
+        self._sensor_lock = Lock()
+        self._sensor_files = None
         super().__init__(event_delay=event_delay, pin_factory=pin_factory)
         try:
             if min_temp >= max_temp:
@@ -293,13 +757,68 @@ class CPUTemperature(PolledInternalDevice):
         except DeviceClosed:
             return super().__repr__()
 
+    def close(self):
+        super().close()
+        self._close_sensor_files()
+
+    def _close_sensor_files(self):
+        try:
+            lock = self._sensor_lock
+        except AttributeError:
+            pass  # pragma: no cover
+        else:
+            with lock:
+                files, self._sensor_files = self._sensor_files, None
+                for f in files or ():
+                    f.close()
+
+    @property
+    def sensor_file(self):
+        """
+        The file (or list of files) from which the temperature is read.
+        """
+        return self._sensor_file
+
+    @sensor_file.setter
+    def sensor_file(self, value):
+        self._close_sensor_files()
+        self._sensor_file = value
+        self._read_cache = None
+
     @property
     def temperature(self):
         """
-        Returns the current CPU temperature in degrees celsius.
+        Returns the current CPU temperature in degrees celsius. If several
+        sensor files were specified, this is the highest of the
+        :attr:`temperatures`.
         """
-        with io.open(self.sensor_file, 'r') as f:
-            return float(f.read().strip()) / 1000
+        return max(self.temperatures)
+
+    @property
+    def temperatures(self):
+        """
+        Returns a tuple of the current temperatures, in degrees celsius, read
+        from each of the sensor files.
+        """
+        return self._read_cached(self._read_temperatures)
+
+    def _read_temperatures(self):
+        with self._sensor_lock:
+            files = self._sensor_files
+            if files is None:
+                filenames = self._sensor_file
+                if isinstance(filenames, (str, bytes)):
+                    filenames = [filenames]
+                files = _open_sys_files(filenames)
+                if self.closed:
+                    # Don't hold files open on behalf of a closed device
+                    try:
+                        return tuple(float(f.read()) / 1000 for f in files)
+                    finally:
+                        for f in files:
+                            f.close()
+                self._sensor_files = files
+            return tuple(float(f.read()) / 1000 for f in files)
 
     @property
     def value(self):
@@ -404,7 +923,11 @@ class LoadAverage(PolledInternalDevice):
         if min_load_average >= max_load_average:
             raise ValueError(
                 'max_load_average must be greater than min_load_average')
-        self.load_average_file = load_average_file
+        self._load_average_file = load_average_file
+        # Guards opening, replacing, and closing the held file, so a close
+        # can't race a read from the poller
+        self._file_lock = Lock()
+        self._file = None
         self.min_load_average = min_load_average
         self.max_load_average = max_load_average
         if not min_load_average <= threshold <= max_load_average:
@@ -431,14 +954,56 @@ class LoadAverage(PolledInternalDevice):
         except DeviceClosed:
             return super().__repr__()
 
+    def close(self):
+        super().close()
+        self._close_file()
+
+    def _close_file(self):
+        try:
+            lock = self._file_lock
+        except AttributeError:
+            pass  # pragma: no cover
+        else:
+            with lock:
+                f, self._file = self._file, None
+                if f is not None:
+                    f.close()
+
+    @property
+    def load_average_file(self):
+        """
+        The file from which the load average is read.
+        """
+        return self._load_average_file
+
+    @load_average_file.setter
+    def load_average_file(self, value):
+        self._close_file()
+        self._load_average_file = value
+        self._read_cache = None
+
     @property
     def load_average(self):
         """
         Returns the current load average.
         """
-        with io.open(self.load_average_file, 'r') as f:
-            file_columns = f.read().strip().split()
-            return float(file_columns[self._load_average_file_column])
+        return self._read_cached(self._read_load_average)
+
+    def _read_load_average(self):
+        with self._file_lock:
+            f = self._file
+            if f is None:
+                f = _SysFile(self._load_average_file)
+                if self.closed:
+                    # Don't hold the file open on behalf of a closed device
+                    try:
+                        file_columns = f.read().tobytes().split()
+                    finally:
+                        f.close()
+                    return float(file_columns[self._load_average_file_column])
+                self._file = f
+            file_columns = f.read().tobytes().split()
+        return float(file_columns[self._load_average_file_column])
 
     @property
     def value(self):
@@ -707,6 +1272,9 @@ class DiskUsage(PolledInternalDevice):
         # space available to *non-root users*. Technically this means it can
         # exceed 100% (when FS is filled to the point that only root can write
         # to it), hence the clamp.
+        return self._read_cached(self._read_usage)
+
+    def _read_usage(self):
         vfs = os.statvfs(self.filesystem)
         used = vfs.f_blocks - vfs.f_bfree
         total = used + vfs.f_bavail
@@ -8,15 +8,13 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import inspect
 import weakref
 from functools import wraps, partial
-from threading import Event
 from collections import deque
 from statistics import median
 import warnings
 
-from .threads import GPIOThread
+from .threads import GPIOThread, GPIOEvent
 from .exc import (
     BadEventHandler,
     BadWaitTime,
@@ -168,6 +166,8 @@ class event:
         # has been used to produce it) we need to dig out the "real" function
         # that's been wrapped along with all the mandatory positional args
         # used in the wrapper so we can test the binding
+        # inspect is costly to import and only needed here, so defer it
+        import inspect
         args = ()
         wrapped_fn = fn
         while isinstance(wrapped_fn, partial):
@@ -240,8 +240,8 @@ class EventsMixin:
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._active_event = Event()
-        self._inactive_event = Event()
+        self._active_event = GPIOEvent()
+        self._inactive_event = GPIOEvent()
         self._last_active = None
         self._last_changed = self.pin_factory.ticks()
 
@@ -513,7 +513,7 @@ class HoldThread(GPIOThread):
     def __init__(self, parent):
         super().__init__(
             target=self.held, args=(weakref.proxy(parent),))
-        self.holding = Event()
+        self.holding = GPIOEvent()
         self.start()
 
     def held(self, parent):
@@ -557,7 +557,7 @@ class GPIOQueue(GPIOThread):
         self.queue = deque(maxlen=queue_len)
         self.partial = bool(partial)
         self.sample_wait = float(sample_wait)
-        self.full = Event()
+        self.full = GPIOEvent()
         self.parent = weakref.proxy(parent)
         self.average = average
         self.ignore = ignore
@@ -19,6 +19,7 @@ from itertools import repeat, cycle, chain
 from colorzero import Color
 from collections import OrderedDict
 from math import log2
+import sys
 import warnings
 
 from .exc import (
@@ -29,12 +30,8 @@ from .exc import (
 )
 from .devices import GPIODevice, Device, CompositeDevice
 from .mixins import SourceMixin
-from .threads import GPIOThread
+from .threads import GPIOThread, sleep
 from .tones import Tone
-try:
-    from .pins.pigpio import PiGPIOFactory
-except ImportError:
-    PiGPIOFactory = None
 
 
 class OutputDevice(SourceMixin, GPIODevice):
@@ -187,6 +184,7 @@ class DigitalOutputDevice(OutputDevice):
     def __init__(self, pin=None, *, active_high=True, initial_value=False,
                  pin_factory=None):
         self._blink_thread = None
+        self._blink_cancel = None
         self._controller = None
         super().__init__(pin, active_high=active_high,
                          initial_value=initial_value, pin_factory=pin_factory)
@@ -233,6 +231,15 @@ class DigitalOutputDevice(OutputDevice):
             *n* will result in this method never returning).
         """
         self._stop_blink()
+        # Where the pin can blink by itself (e.g. with lgpio's tx_pulse), let
+        # it, rather than tying up a thread. A finished blink leaves the pin
+        # low, so this is only possible when that means "off". Foreground
+        # blinks keep the thread, which (unlike a sleep) can't return before
+        # the blink is finished
+        if self.active_high and background:
+            self._blink_cancel = self.pin._blink(on_time, off_time, n)
+            if self._blink_cancel is not None:
+                return
         self._blink_thread = GPIOThread(
             self._blink_device, (on_time, off_time, n))
         self._blink_thread.start()
@@ -244,6 +251,9 @@ class DigitalOutputDevice(OutputDevice):
         if getattr(self, '_controller', None):
             self._controller._stop_blink(self)
         self._controller = None
+        if getattr(self, '_blink_cancel', None):
+            self._blink_cancel()
+        self._blink_cancel = None
         if getattr(self, '_blink_thread', None):
             self._blink_thread.stop()
         self._blink_thread = None
@@ -1505,7 +1515,11 @@ class Servo(SourceMixin, CompositeDevice):
             pin_factory=pin_factory
         )
 
-        if PiGPIOFactory is None or not isinstance(self.pin_factory, PiGPIOFactory):
+        # If the pigpio factory is in use its module must already be loaded;
+        # don't import it (an expensive failure when pigpio isn't installed)
+        pigpio = sys.modules.get('gpiozero.pins.pigpio')
+        if pigpio is None or not isinstance(
+                self.pin_factory, pigpio.PiGPIOFactory):
             warnings.warn(PWMSoftwareFallback(
                 'To reduce servo jitter, use the pigpio pin factory.'
                 'See https://gpiozero.readthedocs.io/en/stable/api_output.html#servo for more info'
@@ -9,9 +9,11 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+from functools import partial
+from importlib import import_module
 from weakref import ref
-from collections import defaultdict
-from threading import Lock
+from collections import deque
+from threading import Lock, RLock
 
 from ..devices import Device
 from ..exc import (
@@ -31,6 +33,147 @@ from ..exc import (
     )
 
 
+class _PinReservations:
+    """
+    A bidirectional index of pin reservations, mapping each pin to the devices
+    that have reserved it, and each device to the pins it has reserved. This
+    permits reservations to be checked, taken, and released in time
+    proportional to the number of pins involved, rather than the number of
+    pins reserved by all devices.
+
+    Devices are only weakly referenced, keyed by :func:`id`. When a device is
+    garbage collected, a callback on its reference queues its key for removal;
+    the queue is purged by the next operation on the index. The callback
+    itself never touches the index (it may fire in any thread, at any time,
+    including while the index is being manipulated). Callers are expected to
+    hold the owning factory's reservation lock.
+    """
+    def __init__(self):
+        # pin -> {key: ref(reserver)}
+        self._by_pin = {}
+        # key -> (ref(reserver), {pin, ...})
+        self._by_reserver = {}
+        self._collected = deque()
+
+    def __len__(self):
+        self._purge()
+        return len(self._by_pin)
+
+    def __iter__(self):
+        self._purge()
+        return iter(list(self._by_pin))
+
+    def __contains__(self, pin):
+        self._purge()
+        return pin in self._by_pin
+
+    def _purge(self):
+        while self._collected:
+            key = self._collected.popleft()
+            try:
+                reserver_ref, pins = self._by_reserver[key]
+            except KeyError:
+                continue
+            # The key may have been re-used by a new reserver since it was
+            # queued; only remove the entry if its referent is gone
+            if reserver_ref() is None:
+                self._remove(key, pins)
+
+    def _remove(self, key, pins):
+        del self._by_reserver[key]
+        for pin in pins:
+            refs = self._by_pin[pin]
+            del refs[key]
+            if not refs:
+                del self._by_pin[pin]
+
+    def reservers(self, pin=None):
+        """
+        Returns a list of the live devices reserving *pin*, or of all live
+        devices holding reservations if *pin* is :data:`None`.
+        """
+        self._purge()
+        if pin is None:
+            refs = (reserver_ref for reserver_ref, pins in self._by_reserver.values())
+        else:
+            refs = self._by_pin.get(pin, {}).values()
+        return [
+            reserver for reserver_ref in refs
+            for reserver in (reserver_ref(),)
+            if reserver is not None
+        ]
+
+    def pins(self, reserver):
+        """
+        Returns a :class:`frozenset` of the pins reserved by *reserver*.
+        """
+        self._purge()
+        try:
+            reserver_ref, pins = self._by_reserver[id(reserver)]
+        except KeyError:
+            return frozenset()
+        if reserver_ref() is not reserver:
+            return frozenset()
+        return frozenset(pins)
+
+    def add(self, reserver, pin):
+        """
+        Records a reservation of *pin* by *reserver*.
+        """
+        self._purge()
+        key = id(reserver)
+        entry = self._by_reserver.get(key)
+        if entry is not None and entry[0]() is not reserver:
+            # A stale entry for a collected reserver which happened to share
+            # this one's id, and hasn't been purged yet
+            self._remove(key, entry[1])
+            entry = None
+        if entry is None:
+            entry = self._by_reserver[key] = (
+                ref(reserver, partial(self._collect, key)), set())
+        reserver_ref, pins = entry
+        pins.add(pin)
+        self._by_pin.setdefault(pin, {})[key] = reserver_ref
+
+    def discard(self, reserver, *pins):
+        """
+        Removes the reservations of *reserver* against *pins*, or against all
+        the pins it has reserved if none are specified. Reservations that are
+        not held are silently ignored.
+        """
+        self._purge()
+        key = id(reserver)
+        try:
+            reserver_ref, reserved = self._by_reserver[key]
+        except KeyError:
+            return
+        if reserver_ref() is not reserver:
+            return
+        if pins:
+            released = reserved.intersection(pins)
+        else:
+            released = set(reserved)
+        reserved -= released
+        for pin in released:
+            refs = self._by_pin[pin]
+            del refs[key]
+            if not refs:
+                del self._by_pin[pin]
+        if not reserved:
+            del self._by_reserver[key]
+
+    def clear(self):
+        """
+        Removes all reservations.
+        """
+        self._by_pin.clear()
+        self._by_reserver.clear()
+        self._collected.clear()
+
+    def _collect(self, key, reserver_ref):
+        self._collected.append(key)
+
+
 class Factory:
     """
     Generates pins and SPI interfaces for devices. This is an abstract
@@ -48,10 +191,16 @@ class Factory:
     * :meth:`release_all`
     * :meth:`pin`
     * :meth:`spi`
+    * :meth:`_group_writer`
     * :meth:`_get_pi_info`
     """
+    # Set by descendents whose underlying library tolerates devices being
+    # closed from several threads at once; permits the shutdown handler to
+    # close independent devices concurrently
+    _concurrent_close = False
+
     def __init__(self):
-        self._reservations = defaultdict(list)
+        self._reservations = _PinReservations()
         self._res_lock = Lock()
 
     def reserve_pins(self, requester, *pins):
@@ -63,13 +212,12 @@ class Factory:
         """
         with self._res_lock:
             for pin in pins:
-                for reserver_ref in self._reservations[pin]:
-                    reserver = reserver_ref()
-                    if reserver is not None and requester._conflicts_with(reserver):
+                for reserver in self._reservations.reservers(pin):
+                    if requester._conflicts_with(reserver):
                         raise GPIOPinInUse(
                             'pin {pin} is already in use by {reserver!r}'.format(
                                 pin=pin, reserver=reserver))
-                self._reservations[pin].append(ref(requester))
+                self._reservations.add(requester, pin)
 
     def release_pins(self, reserver, *pins):
         """
@@ -79,25 +227,21 @@ class Factory:
         not currently held will be silently ignored (to permit clean-up after
         failed / partial construction).
         """
-        with self._res_lock:
-            for pin in pins:
-                self._reservations[pin] = [
-                    ref for ref in self._reservations[pin]
-                    if ref() not in (reserver, None) # may as well clean up dead refs
-                    ]
+        if pins:
+            with self._res_lock:
+                self._reservations.discard(reserver, *pins)
 
     def release_all(self, reserver):
         """
         Releases all pin reservations taken out by *reserver*. See
         :meth:`release_pins` for further information).
         """
-        # Yes, this would be more efficient if it simply regenerated the
-        # reservations list without any references to reserver instead of
-        # (in release_pins) looping over each pin individually. However, this
-        # then causes a subtle bug in LocalPiFactory which does something
-        # horribly naughty (with good reason) and makes its _reservations
-        # dictionary equivalent to a class-level one.
-        self.release_pins(reserver, *self._reservations)
+        # This goes straight to the reservation index rather than calling
+        # release_pins, as the index already knows which pins *reserver* holds
+        # (and sub-classes like PiFactory translate the pins passed to
+        # release_pins, which would be redundant here)
+        with self._res_lock:
+            self._reservations.discard(reserver)
 
     def close(self):
         """
@@ -133,6 +277,44 @@ class Factory:
         raise PinSPIUnsupported(  # pragma: no cover
             'SPI not supported by this pin factory')
 
+    def _group_writer(self, pins):
+        """
+        Returns a callable taking a sequence of states, one for each of the
+        specified *pins*, which drives all *pins* to those states at once; or
+        :data:`None` if the factory can't write *pins* as a group. The pins
+        must already be configured as outputs, and must not be used for PWM
+        while the group is written.
+
+        If the group can later be dissolved (e.g. because one of *pins* is
+        re-configured), the callable still writes the states (pin by pin) but
+        returns :data:`False` once it has been; callers should then request a
+        fresh writer.
+
+        By default, this is built from :meth:`Pin._bank_writers` (so every pin
+        must implement it), with one write to set and one to clear pins in
+        each bank.
+        """
+        banks = [pin._bank_writers() for pin in pins]
+        if not banks or None in banks:
+            return None
+        writers = {}
+        for bank, mask, set_bank, clear_bank in banks:
+            writers.setdefault(bank, (set_bank, clear_bank))
+        def write(states):
+            high = dict.fromkeys(writers, 0)
+            low = high.copy()
+            for (bank, mask, set_bank, clear_bank), state in zip(banks, states):
+                if state:
+                    high[bank] |= mask
+                else:
+                    low[bank] |= mask
+            for bank, (set_bank, clear_bank) in writers.items():
+                if high[bank]:
+                    set_bank(high[bank])
+                if low[bank]:
+                    clear_bank(low[bank])
+        return write
+
     def ticks(self):
         """
         Return the current ticks, according to the factory. The reference point
@@ -190,6 +372,10 @@ class Pin:
     * :meth:`output_with_state`
     * :meth:`input_with_pull`
     * :meth:`_set_state`
+    * :meth:`_state_writers`
+    * :meth:`_state_reader`
+    * :meth:`_bank_writers`
+    * :meth:`_blink`
     * :meth:`_get_frequency`
     * :meth:`_set_frequency`
     * :meth:`_get_pull`
@@ -245,6 +431,64 @@ class Pin:
         self.function = 'input'
         self.pull = pull
 
+    def _state_writers(self):
+        """
+        Returns a tuple of two callables, each taking no arguments, which drive
+        the pin low and high respectively. The pin must already be configured
+        as an output, and the callables are not required to check this (or
+        anything else) before writing.
+
+        This is used by time-critical code, such as software SPI, which
+        toggles pins far more often than ordinary devices. By default the
+        callables simply wrap :meth:`_set_state`, but descendents may override
+        this to bind directly to the underlying hardware.
+        """
+        return (
+            partial(self._set_state, False),
+            partial(self._set_state, True),
+        )
+
+    def _state_reader(self):
+        """
+        Returns a callable taking no arguments which returns a truthy value
+        when the pin is high, and a falsy value when it is low.
+
+        As with :meth:`_state_writers`, the default simply wraps
+        :meth:`_get_state` but descendents may override this to bind directly
+        to the underlying hardware.
+        """
+        return self._get_state
+
+    def _bank_writers(self):
+        """
+        Returns a tuple of (*bank*, *mask*, *set*, *clear*) permitting the pin
+        to be driven simultaneously with other pins in the same bank, or
+        :data:`None` (the default) if the pin doesn't support this.
+
+        *bank* is a hashable value identifying the group of pins that can be
+        written together, and *mask* is an integer with this pin's bit set.
+        *set* and *clear* are callables which take a mask of (one or more)
+        pins in *bank*, driving them all high or low respectively. As with
+        :meth:`_state_writers`, the pins must already be configured as outputs.
+
+        This is used by :class:`~gpiozero.pins.pwm.PWMSoftware` to apply
+        simultaneous edges with a single write.
+        """
+        return None
+
+    def _blink(self, on_time, off_time, n):
+        """
+        Starts the pin blinking without further involvement from Python:
+        driven high for *on_time* seconds then low for *off_time* seconds,
+        *n* times (or forever if *n* is :data:`None`), after which it is left
+        low. The pin must already be configured as an output.
+
+        Returns a callable, taking no arguments, which stops the blink early;
+        or :data:`None` (the default) if the pin can't blink by itself, in
+        which case the caller must drive the blink.
+        """
+        return None
+
     def _get_function(self):
         raise NotImplementedError
 
@@ -459,6 +703,8 @@ class SPI(Device):
 
     * :meth:`read`
     * :meth:`write`
+    * :meth:`transfer_into`
+    * :meth:`transfer_many`
     * :meth:`_set_clock_mode`
     * :meth:`_get_lsb_first`
     * :meth:`_set_lsb_first`
@@ -467,9 +713,18 @@ class SPI(Device):
     * :meth:`_get_bits_per_word`
     * :meth:`_set_bits_per_word`
 
+    Implementations which override :meth:`transfer` should hold the
+    interface's ``_lock`` while talking to the bus, so that the default
+    :meth:`transfer_many` excludes other users of the interface for the whole
+    of its batch.
+
     .. _Serial Peripheral Interface: https://en.wikipedia.org/wiki/Serial_Peripheral_Interface_Bus
     """
 
+    def __init__(self, **kwargs):
+        self._lock = RLock()
+        super().__init__(**kwargs)
+
     def read(self, n):
         """
         Read *n* words of data from the SPI interface, returning them as a
@@ -486,9 +741,10 @@ class SPI(Device):
         """
         Write *data* to the SPI interface. *data* must be a sequence of
         unsigned integer words each of which will fit within the configured
-        :attr:`bits_per_word` of the interface. The method returns the number
-        of words written to the interface (which may be less than or equal to
-        the length of *data*).
+        :attr:`bits_per_word` of the interface, or a :term:`bytes-like object`
+        if :attr:`bits_per_word` is 8 or less. The method returns the number of
+        words written to the interface (which may be less than or equal to the
+        length of *data*).
 
         This method is typically used with write-only devices that feature
         half-duplex communication. See :meth:`transfer` for full duplex
@@ -508,9 +764,51 @@ class SPI(Device):
         *data* written to the interface. Each word in the returned sequence
         will be an unsigned integer no larger than the configured
         :attr:`bits_per_word` of the interface.
+
+        If :attr:`bits_per_word` is 8 or less, *data* may also be a
+        :term:`bytes-like object` (e.g. :class:`bytes`, :class:`bytearray`, or
+        :class:`memoryview`) in which case the result will be a
+        :class:`bytearray`. Some implementations (e.g. pigpio and lgpio) pass
+        such data through without converting it to and from lists of integers;
+        others (e.g. spidev) still convert it internally.
         """
         raise NotImplementedError
 
+    def transfer_into(self, data, buffer):
+        """
+        Write *data* to the SPI interface, as in :meth:`transfer`, but store
+        the words read from the interface in *buffer*, which must be a
+        writable :term:`bytes-like object` (e.g. a :class:`bytearray` or
+        :class:`memoryview`) at least as long as *data*. This permits a buffer
+        to be re-used for many transfers; note that the result of
+        :meth:`transfer` is still constructed, then copied into *buffer*.
+        Returns the number of words read into *buffer*.
+
+        As with bytes-like *data* in :meth:`transfer`, this is only applicable
+        when :attr:`bits_per_word` is 8 or less.
+        """
+        result = self.transfer(data)
+        if not isinstance(result, (bytes, bytearray)):
+            result = bytes(result)
+        memoryview(buffer)[:len(result)] = result
+        return len(result)
+
+    def transfer_many(self, frames):
+        """
+        Perform a full duplex :meth:`transfer` for each sequence of words in
+        *frames*, de-selecting the device between each. Returns a list of the
+        sequences read from the interface during each transfer.
+
+        This is useful for devices (like ADCs) that expect the chip select
+        line to be toggled between each command. Implementations may override
+        this to perform all transfers within a single session on the bus, which
+        is usually substantially faster than calling :meth:`transfer`
+        repeatedly. In either case, other users of the interface cannot
+        interleave their transfers with those in *frames*.
+        """
+        with self._lock:
+            return [self.transfer(data) for data in frames]
+
     @property
     def clock_polarity(self):
         """
@@ -762,10 +1060,19 @@ class SPI(Device):
         doc="""\
         Controls the speed of the SPI interface in Hz (or baud).
 
-        Note that most software SPI implementations ignore this property, and
-        will raise :exc:`SPIFixedRate` if an attempt is made to set it, as they
-        have no rate control (they simply bit-bang as fast as possible because
-        typically this isn't very fast anyway, and introducing measures to
-        limit the rate would simply slow them down to the point of being
-        useless).
+        Implementations without rate control will raise :exc:`SPIFixedRate` if
+        an attempt is made to set it. The built-in software SPI implementation
+        bit-bangs as fast as possible by default, in which case this property
+        is 0. Setting it to a positive value caps the clock at (roughly) that
+        rate, which can be useful for slow peripherals, long cables, or level
+        shifters. Setting it back to 0 (or :data:`None`) removes the cap.
         """)
+
+
+def __getattr__(name):
+    # The board tables in .data are only imported when first needed, but
+    # remain reachable as an attribute of the package
+    if name == 'data':
+        return import_module('.data', __name__)
+    raise AttributeError('module {mod!r} has no attribute {name!r}'.format(
+        mod=__name__, name=name))
@@ -803,6 +803,66 @@ class HeaderInfo(namedtuple('HeaderInfo', (
         print('{0:{style} full}'.format(self, style=Style(color)))
 
 
+# Maps wiringPi pin numbers to (header, pin) tuples, where a header of None
+# indicates the main header (P1 or J8)
+WPI_PINS = {
+    0:  (None, 11),
+    1:  (None, 12),
+    2:  (None, 13),
+    3:  (None, 15),
+    4:  (None, 16),
+    5:  (None, 18),
+    6:  (None, 22),
+    7:  (None, 7),
+    8:  (None, 3),
+    9:  (None, 5),
+    10: (None, 24),
+    11: (None, 26),
+    12: (None, 19),
+    13: (None, 21),
+    14: (None, 23),
+    15: (None, 8),
+    16: (None, 10),
+    17: ('P5', 3),
+    18: ('P5', 4),
+    19: ('P5', 5),
+    20: ('P5', 6),
+    21: (None, 29),
+    22: (None, 31),
+    23: (None, 33),
+    24: (None, 35),
+    25: (None, 37),
+    26: (None, 32),
+    27: (None, 36),
+    28: (None, 38),
+    29: (None, 40),
+    30: (None, 27),
+    31: (None, 28),
+}
+
+
+def _function_gpio(function):
+    # Returns the GPIO number of a pin *function* like "GPIO4", or None
+    if function.startswith('GPIO') and function[4:].isdigit():
+        return int(function[4:])
+    return None
+
+
+class BoardIndex(namedtuple('BoardIndex', (
+    'functions',
+    'specs',
+    'pull_ups',
+    ))):
+    """
+    The pin lookup tables of a :class:`PiBoardInfo`, as returned by its
+    (private) :meth:`~PiBoardInfo._get_index` method. The *functions*
+    attribute maps pin functions to frozensets of ``(header, number)``
+    tuples, *specs* maps canonical pin specs (upper-cased) to GPIO numbers,
+    and *pull_ups* maps the functions of single pins to their pull-up state.
+    """
+    __slots__ = () # workaround python issue #24931
+
+
 class PiBoardInfo(namedtuple('PiBoardInfo', (
     'revision',
     'model',
@@ -983,7 +1043,9 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
 
     .. _system on a chip: https://en.wikipedia.org/wiki/System_on_a_chip
     """
-    __slots__ = () # workaround python issue #24931
+    # NOTE: Unlike the other namedtuples here, PiBoardInfo deliberately has no
+    # __slots__ declaration; its __dict__ holds the pin lookup indexes built
+    # by _get_index
 
     @classmethod
     def from_revision(cls, revision):
@@ -1231,6 +1293,58 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             board,
             )
 
+    def _get_index(self):
+        """
+        Returns a :class:`BoardIndex` of the pin lookup tables for the board,
+        building it on the first call. As the board's information is
+        immutable, the index is simply cached in the instance's
+        :attr:`__dict__`.
+        """
+        try:
+            return self.__dict__['_index']
+        except KeyError:
+            pass
+        functions = {}
+        for header, info in self.headers.items():
+            for pin in info.pins.values():
+                functions.setdefault(pin.function, set()).add(
+                    (header, pin.number))
+        functions = {
+            function: frozenset(pins)
+            for function, pins in functions.items()
+        }
+        pull_ups = {
+            function: self.headers[header].pins[number].pull_up
+            for function, pins in functions.items()
+            if len(pins) == 1
+            for ((header, number),) in (pins,)
+        }
+        specs = {}
+        for gpio in range(54):
+            specs[str(gpio)] = gpio
+            specs['GPIO{gpio}'.format(gpio=gpio)] = gpio
+            specs['BCM{gpio}'.format(gpio=gpio)] = gpio
+        for header, info in self.headers.items():
+            for pin in info.pins.values():
+                gpio = _function_gpio(pin.function)
+                if gpio is not None:
+                    specs['{header}:{number}'.format(
+                        header=header, number=pin.number)] = gpio
+        for board_head in {'P1', 'J8', 'SODIMM'} & set(self.headers):
+            for pin in self.headers[board_head].pins.values():
+                gpio = _function_gpio(pin.function)
+                if gpio is not None:
+                    specs['BOARD{number}'.format(number=pin.number)] = gpio
+        wpi_head = 'P1' if 'P1' in self.headers else 'J8'
+        for wpi, (header, number) in WPI_PINS.items():
+            pin_spec = '{header}:{number}'.format(
+                header=wpi_head if header is None else header, number=number)
+            if pin_spec in specs:
+                specs['WPI{wpi}'.format(wpi=wpi)] = specs[pin_spec]
+        index = BoardIndex(functions, specs, pull_ups)
+        self.__dict__['_index'] = index
+        return index
+
     def physical_pins(self, function):
         """
         Return the physical pins supporting the specified *function* as tuples
@@ -1244,12 +1358,7 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             like "GPIO9" for Broadcom GPIO pin 9, or "GND" for all the pins
             connecting to electrical ground.
         """
-        return {
-            (header, pin.number)
-            for (header, info) in self.headers.items()
-            for pin in info.pins.values()
-            if pin.function == function
-            }
+        return set(self._get_index().functions.get(function, ()))
 
     def physical_pin(self, function):
         """
@@ -1263,13 +1372,14 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             The pin function you wish to search for. Usually this is something
             like "GPIO9" for Broadcom GPIO pin 9.
         """
-        result = self.physical_pins(function)
+        result = self._get_index().functions.get(function, ())
         if len(result) > 1:
             raise PinMultiplePins(
                 'multiple pins can be used for {function}'.format(
                     function=function))
         elif result:
-            return result.pop()
+            for pin in result:
+                return pin
         else:
             raise PinNoPins('no pins can be used for {function}'.format(
                 function=function))
@@ -1286,11 +1396,13 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             something like "GPIO9" for Broadcom GPIO pin 9.
         """
         try:
-            header, number = self.physical_pin(function)
-        except PinNoPins:
-            return False
-        else:
-            return self.headers[header].pins[number].pull_up
+            return self._get_index().pull_ups[function]
+        except KeyError:
+            # Not a single pin; raise PinMultiplePins if appropriate
+            try:
+                self.physical_pin(function)
+            except PinNoPins:
+                return False
 
     def to_gpio(self, spec):
         """
@@ -1320,6 +1432,12 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             if isinstance(spec, bytes):
                 spec = spec.decode('ascii')
             spec = spec.upper()
+            # The index covers all valid specs in their canonical forms; only
+            # unusual forms (e.g. "GPIO017") and invalid specs are parsed
+            try:
+                return self._get_index().specs[spec]
+            except KeyError:
+                pass
             if spec.isdigit():
                 return self.to_gpio(int(spec))
             if spec.startswith('GPIO') and spec[4:].isdigit():
@@ -1327,45 +1445,7 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             elif spec.startswith('BCM') and spec[3:].isdigit():
                 return self.to_gpio(int(spec[3:]))
             elif spec.startswith('WPI') and spec[3:].isdigit():
-                main_head = 'P1' if 'P1' in self.headers else 'J8'
-                try:
-                    return self.to_gpio({
-                        0:  '{main_head}:11'.format(main_head=main_head),
-                        1:  '{main_head}:12'.format(main_head=main_head),
-                        2:  '{main_head}:13'.format(main_head=main_head),
-                        3:  '{main_head}:15'.format(main_head=main_head),
-                        4:  '{main_head}:16'.format(main_head=main_head),
-                        5:  '{main_head}:18'.format(main_head=main_head),
-                        6:  '{main_head}:22'.format(main_head=main_head),
-                        7:  '{main_head}:7' .format(main_head=main_head),
-                        8:  '{main_head}:3' .format(main_head=main_head),
-                        9:  '{main_head}:5' .format(main_head=main_head),
-                        10: '{main_head}:24'.format(main_head=main_head),
-                        11: '{main_head}:26'.format(main_head=main_head),
-                        12: '{main_head}:19'.format(main_head=main_head),
-                        13: '{main_head}:21'.format(main_head=main_head),
-                        14: '{main_head}:23'.format(main_head=main_head),
-                        15: '{main_head}:8' .format(main_head=main_head),
-                        16: '{main_head}:10'.format(main_head=main_head),
-                        17: 'P5:3',
-                        18: 'P5:4',
-                        19: 'P5:5',
-                        20: 'P5:6',
-                        21: '{main_head}:29'.format(main_head=main_head),
-                        22: '{main_head}:31'.format(main_head=main_head),
-                        23: '{main_head}:33'.format(main_head=main_head),
-                        24: '{main_head}:35'.format(main_head=main_head),
-                        25: '{main_head}:37'.format(main_head=main_head),
-                        26: '{main_head}:32'.format(main_head=main_head),
-                        27: '{main_head}:36'.format(main_head=main_head),
-                        28: '{main_head}:38'.format(main_head=main_head),
-                        29: '{main_head}:40'.format(main_head=main_head),
-                        30: '{main_head}:27'.format(main_head=main_head),
-                        31: '{main_head}:28'.format(main_head=main_head),
-                        }[int(spec[3:])])
-                except KeyError:
-                    raise PinInvalidPin(
-                        '{spec} is not a valid wiringPi pin'.format(spec=spec))
+                return self._wpi_to_gpio(int(spec[3:]))
             elif ':' in spec:
                 header, pin = spec.split(':', 1)
                 if pin.isdigit():
@@ -1381,8 +1461,9 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
                         raise PinInvalidPin(
                             'no such pin {pin} on header {header.name}'.format(
                                 pin=pin, header=header))
-                    if function.startswith('GPIO') and function[4:].isdigit():
-                        return self.to_gpio(int(function[4:]))
+                    gpio = _function_gpio(function)
+                    if gpio is not None:
+                        return self.to_gpio(gpio)
                     else:
                         raise PinInvalidPin('{spec} is not a GPIO pin'.format(
                             spec=spec))
@@ -1395,6 +1476,17 @@ class PiBoardInfo(namedtuple('PiBoardInfo', (
             raise PinInvalidPin('{spec} is not a valid pin spec'.format(
                 spec=spec))
 
+    def _wpi_to_gpio(self, wpi):
+        try:
+            header, number = WPI_PINS[wpi]
+        except KeyError:
+            raise PinInvalidPin(
+                'WPI{wpi} is not a valid wiringPi pin'.format(wpi=wpi))
+        if header is None:
+            header = 'P1' if 'P1' in self.headers else 'J8'
+        return self.to_gpio('{header}:{number}'.format(
+            header=header, number=number))
+
     def __repr__(self):
         return '{cls}({fields})'.format(
             cls=self.__class__.__name__,
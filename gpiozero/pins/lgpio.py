@@ -13,6 +13,7 @@ from __future__ import (
 str = type('')
 
 import os
+from functools import partial
 
 import lgpio
 
@@ -63,6 +64,14 @@ class LGPIOFactory(LocalPiFactory):
     If you run into issues, please check that your user has read/write access
     to the specific gpiochip device you are attempting to open (0 by default).
 
+    Composite output devices made entirely of digital outputs (e.g. an
+    :class:`~gpiozero.LEDBoard` of :class:`~gpiozero.LED` instances) claim
+    their pins as an lgpio group, so that :meth:`~gpiozero.LEDBoard.on`,
+    :meth:`~gpiozero.LEDBoard.off`, and so on update all pins with a single
+    write. Likewise, :meth:`~gpiozero.DigitalOutputDevice.blink` (and
+    :meth:`~gpiozero.Buzzer.beep`) on active-high devices are handed to lgpio's
+    pulse generator, instead of a background thread in Python.
+
     .. _lgpio: http://abyz.me.uk/lg/py_lgpio.html
     """
     def __init__(self, chip=0):
@@ -81,6 +90,20 @@ class LGPIOFactory(LocalPiFactory):
     def chip(self):
         return self._chip
 
+    def _group_writer(self, pins):
+        # Claim the pins as an lgpio group, so they can be written with a
+        # single group_write
+        numbers = {pin.number for pin in pins}
+        if not pins or len(numbers) != len(pins) or any(
+                pin._pwm or pin._group or pin.function != 'output'
+                for pin in pins):
+            return None
+        try:
+            group = _LGPIOGroup(self, pins)
+        except lgpio.error:
+            return None
+        return group.write
+
     def _get_spi_class(self, shared, hardware):
         # support via lgpio instead of spidev
         if hardware:
@@ -88,6 +111,55 @@ class LGPIOFactory(LocalPiFactory):
         return super()._get_spi_class(shared, hardware=False)
 
 
+class _LGPIOGroup:
+    # A set of output pins claimed as an lgpio group. The group is freed
+    # (returning its members to ordinary outputs) by any operation which needs
+    # to re-claim one of its pins; writes after that fall back to writing each
+    # pin in turn, and return False so the writer is discarded
+    def __init__(self, factory, pins):
+        self._factory = factory
+        self._pins = pins
+        self._numbers = [pin.number for pin in pins]
+        self._active = False
+        handle = factory._handle
+        levels = [lgpio.gpio_read(handle, number) for number in self._numbers]
+        for number in self._numbers:
+            lgpio.gpio_free(handle, number)
+        try:
+            lgpio.group_claim_output(handle, self._numbers, levels)
+        except lgpio.error:
+            for number, level in zip(self._numbers, levels):
+                lgpio.gpio_claim_output(handle, number, level)
+            raise
+        self._active = True
+        for pin in pins:
+            pin._group = self
+
+    def write(self, states):
+        handle = self._factory._handle
+        if self._active:
+            bits = 0
+            for index, state in enumerate(states):
+                if state:
+                    bits |= 1 << index
+            lgpio.group_write(handle, self._numbers[0], bits)
+        else:
+            for number, state in zip(self._numbers, states):
+                lgpio.gpio_write(handle, number, bool(state))
+            return False
+
+    def free(self):
+        if self._active:
+            self._active = False
+            handle = self._factory._handle
+            levels = [
+                lgpio.gpio_read(handle, number) for number in self._numbers]
+            lgpio.group_free(handle, self._numbers[0])
+            for pin, level in zip(self._pins, levels):
+                pin._group = None
+                lgpio.gpio_claim_output(handle, pin.number, level)
+
+
 class LGPIOPin(LocalPiPin):
     """
     Extends :class:`~gpiozero.pins.local.LocalPiPin`. Pin implementation for
@@ -123,6 +195,7 @@ class LGPIOPin(LocalPiPin):
     def __init__(self, factory, number):
         super().__init__(factory, number)
         self._pwm = None
+        self._group = None
         self._bounce = None
         self._callback = None
         self._edges = lgpio.BOTH_EDGES
@@ -133,6 +206,7 @@ class LGPIOPin(LocalPiPin):
         if self.factory._handle is not None:
             # Closing is really just "resetting" the function of the pin;
             # we let the factory close deal with actually freeing stuff
+            self._ungroup()
             lgpio.gpio_claim_input(
                 self.factory._handle, self.number, lgpio.SET_BIAS_DISABLE)
 
@@ -140,10 +214,15 @@ class LGPIOPin(LocalPiPin):
         mode = lgpio.gpio_get_mode(self.factory._handle, self.number)
         return ['input', 'output'][bool(mode & self.GPIO_IS_OUT)]
 
+    def _ungroup(self):
+        if self._group is not None:
+            self._group.free()
+
     def _set_function(self, value):
         if self._callback is not None:
             self._callback.cancel()
             self._callback = None
+        self._ungroup()
         try:
             {
                 'input': lgpio.gpio_claim_input,
@@ -154,6 +233,19 @@ class LGPIOPin(LocalPiPin):
                 'invalid function "{value}" for pin {self!r}'.format(
                     value=value, self=self))
 
+    def _state_writers(self):
+        if self._pwm:
+            return super()._state_writers()
+        return (
+            partial(lgpio.gpio_write, self.factory._handle, self.number, 0),
+            partial(lgpio.gpio_write, self.factory._handle, self.number, 1),
+        )
+
+    def _state_reader(self):
+        if self._pwm:
+            return super()._state_reader()
+        return partial(lgpio.gpio_read, self.factory._handle, self.number)
+
     def _get_state(self):
         if self._pwm:
             return self._pwm[1] / 100
@@ -220,6 +312,7 @@ class LGPIOPin(LocalPiPin):
             if self.function != 'output':
                 raise PinPWMFixedValue(
                     'cannot start PWM on pin {self!r}'.format(self=self))
+            self._ungroup()
             lgpio.tx_pwm(self.factory._handle, self.number, value, 0)
             self._pwm = (value, 0)
         elif self._pwm and value is not None and value > 0:
@@ -230,6 +323,19 @@ class LGPIOPin(LocalPiPin):
             lgpio.tx_pwm(self.factory._handle, self.number, 0, 0)
             self._pwm = None
 
+    def _blink(self, on_time, off_time, n):
+        # tx_pulse treats 0 cycles as "forever", so leave n=0 (a no-op) to
+        # the caller, along with anything the pulse generator can't express
+        on_time = round(on_time * 1000000)
+        off_time = round(off_time * 1000000)
+        if self._pwm or n == 0 or on_time <= 0 or off_time <= 0:
+            return None
+        self._ungroup()
+        lgpio.tx_pulse(
+            self.factory._handle, self.number, on_time, off_time, 0, n or 0)
+        return partial(
+            lgpio.tx_pulse, self.factory._handle, self.number, 0, 0)
+
     def _get_bounce(self):
         return None if not self._bounce else self._bounce / 1000000
 
@@ -257,6 +363,7 @@ class LGPIOPin(LocalPiPin):
         super()._call_when_changed(ticks / 1000000000, level)
 
     def _enable_event_detect(self):
+        self._ungroup()
         lgpio.gpio_claim_alert(
             self.factory._handle, self.number, self._edges,
             lgpio.gpio_get_mode(self.factory._handle, self.number) &
@@ -350,24 +457,29 @@ class LGPIOHardwareSPI(SPI):
 
     def read(self, n):
         self._check_open()
-        count, data = lgpio.spi_read(self._handle, n)
+        with self._lock:
+            count, data = lgpio.spi_read(self._handle, n)
         if count < 0:
             raise IOError('SPI transfer error {count}'.format(count=count))
-        return [int(b) for b in data]
+        return list(data)
 
     def write(self, data):
         self._check_open()
-        count = lgpio.spi_write(self._handle, data)
+        with self._lock:
+            count = lgpio.spi_write(self._handle, data)
         if count < 0:
             raise IOError('SPI transfer error {count}'.format(count=count))
         return len(data)
 
     def transfer(self, data):
         self._check_open()
-        count, data = lgpio.spi_xfer(self._handle, data)
+        with self._lock:
+            count, result = lgpio.spi_xfer(self._handle, data)
         if count < 0:
             raise IOError('SPI transfer error {count}'.format(count=count))
-        return [int(b) for b in data]
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return result
+        return list(result)
 
 
 class LGPIOHardwareSPIShared(SharedMixin, LGPIOHardwareSPI):
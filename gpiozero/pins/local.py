@@ -11,7 +11,6 @@
 import io
 import errno
 import struct
-from collections import defaultdict
 from threading import Lock
 from time import monotonic
 
@@ -20,7 +19,7 @@ try:
 except ImportError:
     SpiDev = None
 
-from . import SPI
+from . import SPI, _PinReservations
 from .pi import PiFactory, PiPin, SPI_HARDWARE_PINS, spi_port_device
 from .spi import SPISoftware
 from ..devices import Device
@@ -29,6 +28,23 @@ from ..output_devices import OutputDevice
 from ..exc import DeviceClosed, PinUnknownPi, SPIInvalidClockMode
 
 
+# py-spidev's xfer2 refuses lists longer than this (SPIDEV_MAXPATH),
+# regardless of the driver's bufsiz
+SPIDEV_XFER2_MAX = 4096
+
+
+def get_spidev_bufsiz():
+    """
+    Returns the maximum size (in bytes) of a single transfer through the
+    kernel's spidev driver, which defaults to 4096.
+    """
+    try:
+        with io.open('/sys/module/spidev/parameters/bufsiz', 'r') as f:
+            return int(f.read())
+    except (IOError, ValueError):
+        return 4096
+
+
 def get_pi_revision():
     revision = None
     try:
@@ -59,7 +75,7 @@ class LocalPiFactory(PiFactory):
     :class:`~gpiozero.pins.native.NativePin`).
     """
     pins = {}
-    _reservations = defaultdict(list)
+    _reservations = _PinReservations()
     _res_lock = Lock()
 
     def __init__(self):
@@ -127,6 +143,7 @@ class LocalPiHardwareSPI(SPI):
         if miso_pin is not None:
             to_reserve.add(miso_pin)
         self.pin_factory.reserve_pins(self, *to_reserve)
+        self._bufsiz = get_spidev_bufsiz()
         self._bus = SpiDev()
         self._bus.open(self._port, self._device)
         self._bus.max_speed_hz = 500000
@@ -153,9 +170,40 @@ class LocalPiHardwareSPI(SPI):
         """
         Writes data (a list of integer words where each word is assumed to have
         :attr:`bits_per_word` bits or less) to the SPI interface, and reads an
-        equivalent number of words, returning them as a list of integers.
+        equivalent number of words, returning them as a list of integers. If
+        *data* is a :term:`bytes-like object`, the result is a
+        :class:`bytearray` instead.
+
+        Transfers larger than a single spidev transfer permits are passed to
+        ``xfer3`` (spidev 3.4+), which splits them into transfers of the
+        driver's buffer size, or split into several ``xfer2`` calls of at most
+        4096 bytes with older versions of spidev. Note that the chip select
+        line will be de-activated between each part.
         """
-        return self._bus.xfer2(data)
+        chunk = min(self._bufsiz, SPIDEV_XFER2_MAX)
+        with self._lock:
+            if len(data) <= chunk:
+                result = self._bus.xfer2(data)
+            elif hasattr(self._bus, 'xfer3'):
+                result = self._bus.xfer3(data)
+            else:
+                result = []
+                for offset in range(0, len(data), chunk):
+                    result.extend(self._bus.xfer2(data[offset:offset + chunk]))
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytearray(result)
+        return result
+
+    def write(self, data):
+        # writebytes2 (spidev 3.4+) accepts any object supporting the buffer
+        # protocol directly, avoiding the construction of a list of ints
+        if (
+                isinstance(data, (bytes, bytearray, memoryview)) and
+                hasattr(self._bus, 'writebytes2')):
+            with self._lock:
+                self._bus.writebytes2(data)
+            return len(data)
+        return super().write(data)
 
     def _get_clock_mode(self):
         return self._bus.mode
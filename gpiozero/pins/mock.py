@@ -8,10 +8,16 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
+import weakref
+from array import array
+from heapq import heappush, heappop, heapify
+from itertools import count
 from collections import namedtuple
-from time import time, sleep, monotonic
-from threading import Thread, Event
+from collections.abc import Sequence
+from time import monotonic
+from threading import Lock, RLock, Condition, current_thread
 from math import isclose
+from random import Random
 
 import pkg_resources
 
@@ -25,6 +31,7 @@ from ..exc import (
     )
 from ..devices import Device
 from ..mixins import SharedMixin
+from ..threads import GPIOThread, GPIOEvent, _WakingEvent, _set_clock
 from . import SPI
 from .pi import PiPin, PiFactory
 from .spi import SPISoftware
@@ -33,10 +40,347 @@ from .spi import SPISoftware
 PinState = namedtuple('PinState', ('timestamp', 'state'))
 
 
+class PinStateHistory(Sequence):
+    """
+    A compact, optionally bounded, sequence of :class:`PinState` tuples used
+    to record the history of a :class:`MockPin`.
+
+    The timestamps and states are stored in a pair of :class:`~array.array`
+    instances rather than as individual tuples. If *maxlen* is not
+    :data:`None`, the history is a ring buffer holding at most *maxlen*
+    entries; once full, each new entry discards the oldest (much like a
+    :class:`~collections.deque`). The number of entries discarded is available
+    from :attr:`dropped`.
+
+    States are converted to *state_type* when read back from the history.
+    Comparisons with other sequences (for example, a :class:`list` of
+    :class:`PinState` tuples) compare the entries currently held.
+    """
+    def __init__(self, iterable=(), *, maxlen=None, state_type=bool):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError('maxlen must be at least 1, or None')
+        self._maxlen = maxlen
+        self._state_type = state_type
+        self._timestamps = array('d')
+        self._states = array('d')
+        self._start = 0
+        self._dropped = 0
+        for timestamp, state in iterable:
+            self.append(PinState(timestamp, state))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('pin state history index out of range')
+        index = (self._start + index) % size
+        return PinState(
+            self._timestamps[index], self._state_type(self._states[index]))
+
+    def __iter__(self):
+        state_type = self._state_type
+        start = self._start
+        for timestamps, states in (
+            (self._timestamps[start:], self._states[start:]),
+            (self._timestamps[:start], self._states[:start]),
+        ):
+            for timestamp, state in zip(timestamps, states):
+                yield PinState(timestamp, state_type(state))
+
+    def __eq__(self, other):
+        if isinstance(other, (PinStateHistory, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    @property
+    def maxlen(self):
+        """
+        The maximum number of entries held, or :data:`None` if unbounded.
+        """
+        return self._maxlen
+
+    @property
+    def dropped(self):
+        """
+        The number of (oldest) entries discarded because the history was full.
+        """
+        return self._dropped
+
+    def append(self, item):
+        """
+        Appends *item*, a :class:`PinState` (or equivalent tuple), to the
+        history, discarding the oldest entry if the history is full.
+        """
+        timestamp, state = item
+        if self._maxlen is None or len(self._timestamps) < self._maxlen:
+            self._timestamps.append(timestamp)
+            self._states.append(state)
+        else:
+            self._timestamps[self._start] = timestamp
+            self._states[self._start] = state
+            self._start = (self._start + 1) % self._maxlen
+            self._dropped += 1
+
+
+class MockClock:
+    """
+    A virtual clock used by :class:`MockFactory` when constructed with
+    *virtual_time* set. While installed, all timed waits in GPIO Zero
+    (background threads, :func:`~gpiozero.threads.sleep`, waits on device
+    events, and the delays of mock pins) are measured by this clock rather
+    than in real time, and :meth:`MockFactory.ticks` returns its
+    :attr:`time`.
+
+    Virtual time only passes when every participating thread is waiting on the
+    clock, at which point the clock jumps straight to the earliest deadline
+    among those waits. Participating threads are the thread that created the
+    clock (typically the one running the test), and any
+    :class:`~gpiozero.threads.GPIOThread` started while the clock is
+    installed. Hence, in a test, the following will return almost
+    immediately, with the LED's state changes recorded at precisely the
+    expected times::
+
+        led.blink(on_time=1, off_time=1, n=2, background=False)
+
+    Note that a participating thread blocked on anything other than the clock
+    (a real :func:`time.sleep`, a lock, or an I/O operation) prevents time
+    from passing until it finishes.
+    """
+    def __init__(self, start=0.0):
+        self._cond = Condition()
+        self._now = float(start)
+        self._deadlines = []
+        self._threads = {current_thread()}
+        self._waiting = set()
+        self._closed = False
+
+    def close(self):
+        """
+        Closes the clock. Any threads still waiting on the clock are woken
+        immediately, as if their timeouts had expired, and all subsequent
+        waits return immediately.
+        """
+        with self._cond:
+            self._closed = True
+            self._wake()
+
+    @property
+    def closed(self):
+        """
+        Returns :data:`True` if the clock has been closed.
+        """
+        return self._closed
+
+    @property
+    def time(self):
+        """
+        The current virtual time, in seconds.
+        """
+        return self._now
+
+    def add_thread(self, thread):
+        """
+        Adds *thread* to the set of participating threads.
+        """
+        with self._cond:
+            self._threads.add(thread)
+
+    def remove_thread(self, thread):
+        """
+        Removes *thread* from the set of participating threads (called as the
+        thread terminates).
+        """
+        with self._cond:
+            self._threads.discard(thread)
+            self._wake()
+
+    def has_thread(self, thread):
+        """
+        Returns :data:`True` if *thread* is participating in the clock.
+        """
+        return thread in self._threads
+
+    def notify(self):
+        """
+        Wakes all waiting threads to re-evaluate their conditions; called when
+        an event that may be waited upon is set.
+        """
+        with self._cond:
+            self._wake()
+
+    def sleep(self, delay):
+        """
+        Waits for *delay* seconds of virtual time to pass.
+        """
+        self.wait_for(lambda: False, delay)
+
+    def wait_for(self, predicate, timeout=None):
+        """
+        Waits until *predicate* (a callable) returns a truthy value, or until
+        *timeout* seconds of virtual time have passed. Returns the last result
+        of *predicate*.
+        """
+        me = current_thread()
+        with self._cond:
+            if timeout is None:
+                deadline = None
+            else:
+                deadline = self._now + max(0.0, timeout)
+                heappush(self._deadlines, deadline)
+            try:
+                while True:
+                    result = predicate()
+                    if result or self._closed or (
+                            deadline is not None and self._now >= deadline):
+                        return result
+                    self._waiting.add(me)
+                    if not self._advance():
+                        self._cond.wait()
+            finally:
+                self._waiting.discard(me)
+                if deadline is not None:
+                    self._deadlines.remove(deadline)
+                    heapify(self._deadlines)
+
+    def _wake(self):
+        # Must be called with the lock held. Wakes all waiting threads, and
+        # treats them as busy until they've re-evaluated their conditions and
+        # returned to waiting; this ensures time cannot pass while a thread
+        # has something to do (e.g. in response to an event being set)
+        self._waiting.clear()
+        self._cond.notify_all()
+
+    def _advance(self):
+        # Must be called with the lock held. If no participating thread is
+        # busy, jump to the earliest deadline and wake everything up so those
+        # waiting can check whether their deadlines have passed. Returns True
+        # if time moved
+        if (
+            self._deadlines and self._deadlines[0] > self._now and
+            not any(
+                thread.is_alive()
+                for thread in self._threads - self._waiting)
+        ):
+            self._now = self._deadlines[0]
+            self._wake()
+            return True
+        return False
+
+
+class MockScheduler:
+    """
+    Runs callbacks at scheduled times, on behalf of a :class:`MockFactory`,
+    from a heap of pending events. This permits mock pins to simulate delayed
+    or periodic behaviour without a thread of their own.
+
+    A single background thread runs the callbacks. It is started when the
+    first event is scheduled and runs until :meth:`close` is called (or the
+    factory is garbage collected), waiting for further events while the heap
+    is empty. Time is measured by the factory's :meth:`~MockFactory.ticks` (so
+    it follows the virtual clock, if any). Callbacks should be brief, as they
+    delay all subsequent events.
+    """
+    # How long the thread waits, while nothing is scheduled, before checking
+    # its factory still exists
+    idle_timeout = 10
+
+    def __init__(self, factory):
+        self._factory = weakref.proxy(factory)
+        self._lock = Lock()
+        self._queue = []
+        self._seq = count()
+        self._wake = GPIOEvent()
+        self._thread = None
+
+    def schedule(self, delay, callback, *args):
+        """
+        Schedules *callback* to be called with *args* after *delay* seconds.
+        Returns an object which may be passed to :meth:`cancel`.
+        """
+        event = [
+            self._factory.ticks() + max(0.0, delay), next(self._seq),
+            callback, args]
+        with self._lock:
+            heappush(self._queue, event)
+            # The thread may have been stopped without our involvement (e.g.
+            # by _threads_shutdown); start a fresh one if so
+            if self._thread is None or self._thread.stopping.is_set():
+                self._thread = GPIOThread(self._run)
+                self._thread.stopping = _WakingEvent(self._wake)
+                self._thread.start()
+            elif self._queue[0] is event:
+                # Wake the thread to re-calculate its wait
+                self._wake.set()
+        return event
+
+    def cancel(self, event):
+        """
+        Cancels *event* (as returned by :meth:`schedule`). Cancelling an event
+        which has already run (or been cancelled) does nothing.
+        """
+        # Cancelled events are simply left in the queue, but won't be called
+        event[2] = None
+
+    def close(self):
+        """
+        Cancels all pending events and stops the background thread.
+        """
+        with self._lock:
+            self._queue.clear()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            if thread is current_thread():
+                thread.stopping.set()
+            else:
+                thread.stop()
+
+    def _run(self):
+        stopping = current_thread().stopping
+        while not stopping.is_set():
+            self._wake.clear()
+            due = []
+            with self._lock:
+                try:
+                    now = self._factory.ticks()
+                except ReferenceError:
+                    # Factory is dead; time to die!
+                    if self._thread is current_thread():
+                        self._thread = None
+                    return
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heappop(self._queue))
+                if self._queue:
+                    delay = self._queue[0][0] - now
+                else:
+                    delay = self.idle_timeout
+            if due:
+                for when, seq, callback, args in due:
+                    if callback is not None and not stopping.is_set():
+                        callback(*args)
+            else:
+                self._wake.wait(delay)
+
+
 class MockPin(PiPin):
     """
     A mock pin used primarily for testing. This class does *not* support PWM.
+
+    The pin records the state changes it goes through in :attr:`states`, a
+    :class:`PinStateHistory` of :class:`PinState` tuples. Each tuple holds
+    the time since the prior change, and the new state. The length of this
+    history is limited by the :attr:`~MockFactory.max_states` attribute of
+    the factory.
     """
+    _state_type = bool
 
     def __init__(self, factory, number):
         super().__init__(factory, number)
@@ -76,7 +420,7 @@ class MockPin(PiPin):
 
     def _change_state(self, value):
         if self._state != value:
-            t = monotonic()
+            t = self.factory.ticks()
             self._state = value
             self.states.append(PinState(t - self._last_change, value))
             self._last_change = t
@@ -149,8 +493,10 @@ class MockPin(PiPin):
                 self._call_when_changed()
 
     def clear_states(self):
-        self._last_change = monotonic()
-        self.states = [PinState(0.0, self._state)]
+        self._last_change = self.factory.ticks()
+        self.states = PinStateHistory(
+            [PinState(0.0, self._state)], maxlen=self.factory.max_states,
+            state_type=self._state_type)
 
     def assert_states(self, expected_states):
         # Tests that the pin went through the expected states (a list of values)
@@ -196,35 +542,38 @@ class MockChargingPin(MockPin):
     def __init__(self, factory, number, charge_time=0.01):
         super().__init__(factory, number)
         self.charge_time = charge_time # dark charging time
-        self._charge_stop = Event()
-        self._charge_thread = None
+        self._charge_event = None
+
+    def close(self):
+        super().close()
+        self._stop_charging()
 
     def _set_function(self, value):
         super()._set_function(value)
         if value == 'input':
-            if self._charge_thread:
-                self._charge_stop.set()
-                self._charge_thread.join()
-            self._charge_stop.clear()
-            self._charge_thread = Thread(target=self._charge)
-            self._charge_thread.start()
+            self._stop_charging()
+            self._charge_event = self.factory.schedule(
+                self.charge_time, self._charge)
         elif value == 'output':
-            if self._charge_thread:
-                self._charge_stop.set()
-                self._charge_thread.join()
+            self._stop_charging()
         else:
             assert False
 
+    def _stop_charging(self):
+        if self._charge_event is not None:
+            self.factory.cancel(self._charge_event)
+            self._charge_event = None
+
     def _charge(self):
-        if not self._charge_stop.wait(self.charge_time):
-            try:
-                self.drive_high()
-            except AssertionError:  # pragma: no cover
-                # Charging pins are typically flipped between input and output
-                # repeatedly; if another thread has already flipped us to
-                # output ignore the assertion-error resulting from attempting
-                # to drive the pin high
-                pass
+        self._charge_event = None
+        try:
+            self.drive_high()
+        except AssertionError:  # pragma: no cover
+            # Charging pins are typically flipped between input and output
+            # repeatedly; if another thread has already flipped us to
+            # output ignore the assertion-error resulting from attempting
+            # to drive the pin high
+            pass
 
 
 class MockTriggerPin(MockPin):
@@ -238,27 +587,321 @@ class MockTriggerPin(MockPin):
         super().__init__(factory, number)
         self.echo_pin = echo_pin
         self.echo_time = echo_time # longest echo time
-        self._echo_thread = None
 
     def _set_state(self, value):
         super()._set_state(value)
         if value:
-            if self._echo_thread:
-                self._echo_thread.join()
-            self._echo_thread = Thread(target=self._echo)
-            self._echo_thread.start()
+            self.factory.schedule(0.001, self.echo_pin.drive_high)
+            self.factory.schedule(
+                0.001 + self.echo_time, self.echo_pin.drive_low)
+
+
+class _SignalDriver:
+    # Drives the edges of a signal, an iterator of (delay, target, state)
+    # tuples, at the times they specify using *factory*'s scheduler; each edge
+    # is applied by calling *drive* with its target and state. Used by
+    # MockSignalPin, and by ReplayFactory in gpiozero.pins.recorder
+    def __init__(self, factory, drive):
+        self._factory = factory
+        self._drive = drive
+        # Re-entrant as driving an edge may fire callbacks which stop or
+        # restart the signal
+        self._lock = RLock()
+        self._signal = None
+        self._event = None
+        self._time = None
+        self._edge = None
+        self._done = GPIOEvent()
+        self._done.set()
+
+    def start(self, signal):
+        with self._lock:
+            self.stop()
+            self._signal = signal
+            self._time = self._factory.ticks()
+            self._done.clear()
+            try:
+                self._next_edge()
+            except:
+                self.stop()
+                raise
+
+    def stop(self):
+        with self._lock:
+            if self._event is not None:
+                self._factory.cancel(self._event)
+            self._signal = None
+            self._event = None
+            self._edge = None
+            self._done.set()
+
+    @property
+    def running(self):
+        return self._signal is not None
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _next_edge(self):
+        with self._lock:
+            # Re-read the signal on each pass; driving an edge may have
+            # stopped (or restarted) it
+            while self._signal is not None:
+                signal = self._signal
+                try:
+                    delay, target, state = next(signal)
+                except StopIteration:
+                    self._signal = None
+                    self._event = None
+                    self._done.set()
+                    break
+                self._time += delay
+                delay = self._time - self._factory.ticks()
+                if delay > 0:
+                    self._edge = (target, state)
+                    self._event = self._factory.schedule(
+                        delay, self._fire_edge)
+                    break
+                self._drive(target, state)
+                if self._signal is not signal:
+                    break
+
+    def _fire_edge(self):
+        with self._lock:
+            if self._edge is not None:
+                signal = self._signal
+                target, state = self._edge
+                self._edge = None
+                self._drive(target, state)
+                if self._signal is signal:
+                    self._next_edge()
+
+
+class MockSignalPin(MockPin):
+    """
+    This derivative of :class:`MockPin` is the base class for pins which drive
+    themselves (and possibly other input pins) with a generated signal,
+    for load-testing devices without any hardware. Descendents override
+    :meth:`_generate`.
+
+    Generation begins when :meth:`start` is called and continues until the
+    signal ends, or :meth:`stop` is called. Edges are timed by the factory's
+    :meth:`~MockFactory.schedule` method; if the scheduler falls behind (at
+    very high rates), overdue edges are driven immediately in a burst, so the
+    average rate is maintained. Edges intended for pins not configured as
+    inputs are skipped.
+
+    Descendents which accept a *frequency* store it as
+    :attr:`signal_frequency` (as :attr:`~gpiozero.Pin.frequency` is the pin's
+    PWM frequency). Parameters may be changed between runs.
+    """
+    def __init__(self, factory, number):
+        super().__init__(factory, number)
+        self._signal = _SignalDriver(self.factory, self._drive)
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def start(self):
+        """
+        Starts generating the signal (restarting it if it's already running).
+        """
+        self._signal.start(self._generate())
+
+    def stop(self):
+        """
+        Stops generating the signal.
+        """
+        self._signal.stop()
+
+    @property
+    def running(self):
+        """
+        Returns :data:`True` while the signal is being generated.
+        """
+        return self._signal.running
+
+    def _generate(self):
+        """
+        Returns an iterator of ``(delay, pin, state)`` tuples. Each tuple
+        specifies that *pin* is to be driven to *state* (:data:`True` or
+        :data:`False`) *delay* seconds after the prior edge (or the start of
+        generation, for the first edge).
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _drive(pin, state):
+        if pin._function == 'input':
+            if state:
+                pin.drive_high()
+            else:
+                pin.drive_low()
+
+
+class MockSquareWavePin(MockSignalPin):
+    """
+    This derivative of :class:`MockSignalPin` generates a square wave at
+    *frequency* Hz, high for *duty_cycle* of each cycle, for *cycles* cycles
+    (or indefinitely if *cycles* is :data:`None`).
+    """
+    def __init__(self, factory, number, frequency=1.0, duty_cycle=0.5,
+                 cycles=None):
+        if frequency <= 0:
+            raise ValueError('frequency must be positive')
+        if not 0 < duty_cycle < 1:
+            raise ValueError('duty_cycle must be between 0 and 1 exclusive')
+        super().__init__(factory, number)
+        self.signal_frequency = frequency
+        self.duty_cycle = duty_cycle
+        self.cycles = cycles
+
+    def _generate(self):
+        high_time = self.duty_cycle / self.signal_frequency
+        low_time = (1 - self.duty_cycle) / self.signal_frequency
+        cycles = self.cycles
+        if cycles:
+            yield 0.0, self, True
+            yield high_time, self, False
+            for cycle in range(cycles - 1):
+                yield low_time, self, True
+                yield high_time, self, False
+        elif cycles is None:
+            yield 0.0, self, True
+            while True:
+                yield high_time, self, False
+                yield low_time, self, True
+
+
+class MockQuadraturePin(MockSignalPin):
+    """
+    This derivative of :class:`MockSignalPin` generates quadrature signals,
+    as produced by an incremental rotary encoder, on itself (the "A" pin) and
+    *b_pin* (another :class:`MockPin`). Each of *cycles* cycles (indefinitely
+    if :data:`None`) consists of four edges, spread evenly over 1 /
+    *frequency* seconds.
+
+    If *clockwise* is :data:`True` (the default), the "A" pin leads the "B"
+    pin (each cycle will rotate a :class:`~gpiozero.RotaryEncoder` one step
+    clockwise), otherwise "B" leads "A".
+    """
+    def __init__(self, factory, number, b_pin=None, frequency=1.0,
+                 clockwise=True, cycles=None):
+        if frequency <= 0:
+            raise ValueError('frequency must be positive')
+        super().__init__(factory, number)
+        self.b_pin = b_pin
+        self.signal_frequency = frequency
+        self.clockwise = clockwise
+        self.cycles = cycles
+
+    def start(self):
+        if self.b_pin is None:
+            raise ValueError('b_pin must be set to generate quadrature signals')
+        super().start()
+
+    def _generate(self):
+        delay = 1 / (4 * self.signal_frequency)
+        pins = (self, self.b_pin) if self.clockwise else (self.b_pin, self)
+        # Each edge toggles a pin (alternating between the leading and the
+        # trailing pin); from idle (both high) this is the Gray code sequence
+        # 11, 01, 00, 10, 11 (or 11, 10, 00, 01, 11 in the other direction)
+        levels = {pin: bool(pin.state) for pin in pins}
+        cycles = self.cycles
+        while cycles is None or cycles > 0:
+            for pin in pins + pins:
+                levels[pin] = not levels[pin]
+                yield delay, pin, levels[pin]
+            if cycles is not None:
+                cycles -= 1
+
+
+class MockBouncePin(MockSignalPin):
+    """
+    This derivative of :class:`MockSignalPin` simulates a bouncing switch
+    (e.g. a push-button) being toggled *frequency* times per second (for
+    *cycles* toggles, or indefinitely if :data:`None`). Each toggle is
+    accompanied by a burst of up to *max_bounces* random bounces, spread
+    within the *bounce_time* (in seconds) following the toggle.
+
+    The *seed* parameter may be used to make the random bounces repeatable
+    (each run with the same *seed* produces the same bounces).
+    """
+    def __init__(self, factory, number, frequency=1.0, bounce_time=0.005,
+                 max_bounces=5, cycles=None, seed=None):
+        if frequency <= 0:
+            raise ValueError('frequency must be positive')
+        if not 0 <= bounce_time < 1 / frequency:
+            raise ValueError(
+                'bounce_time must be 0 or more, and less than the period')
+        super().__init__(factory, number)
+        self.signal_frequency = frequency
+        self.bounce_time = bounce_time
+        self.max_bounces = max_bounces
+        self.cycles = cycles
+        self.seed = seed
+
+    def _generate(self):
+        period = 1 / self.signal_frequency
+        random = Random(self.seed)
+        level = bool(self.state)
+        cycles = self.cycles
+        delay = 0.0
+        while cycles is None or cycles > 0:
+            level = not level
+            bounces = random.randint(0, self.max_bounces)
+            times = sorted(
+                random.uniform(0, self.bounce_time)
+                for i in range(bounces * 2))
+            # Each bounce briefly reverts to the prior level, ending with the
+            # new level after the final bounce
+            yield delay, self, level
+            last = 0.0
+            for index, when in enumerate(times):
+                yield when - last, self, level if index % 2 else not level
+                last = when
+            delay = period - last
+            if cycles is not None:
+                cycles -= 1
+
+
+class MockReplayPin(MockSignalPin):
+    """
+    This derivative of :class:`MockSignalPin` replays a *trace* of state
+    changes: a sequence of ``(delay, state)`` tuples, in which each *delay* is
+    measured from the prior change (or the start of replay). The
+    :attr:`~MockPin.states` of another :class:`MockPin` is a suitable trace.
+
+    If *repeat* is :data:`True`, the trace is replayed indefinitely; in this
+    case the delays of the trace must total more than zero, otherwise
+    :meth:`~MockSignalPin.start` raises :exc:`ValueError`.
+    """
+    def __init__(self, factory, number, trace=(), repeat=False):
+        super().__init__(factory, number)
+        self.trace = trace
+        self.repeat = repeat
 
-    def _echo(self):
-        sleep(0.001)
-        self.echo_pin.drive_high()
-        sleep(self.echo_time)
-        self.echo_pin.drive_low()
+    def _generate(self):
+        trace = list(self.trace)
+        if self.repeat and sum(delay for delay, state in trace) <= 0:
+            raise ValueError(
+                'a repeating trace must have a total delay greater than 0')
+        if not trace:
+            return
+        while True:
+            for delay, state in trace:
+                yield delay, self, bool(state)
+            if not self.repeat:
+                break
 
 
 class MockPWMPin(MockPin):
     """
     This derivative of :class:`MockPin` adds PWM support.
     """
+    _state_type = float
+
     def __init__(self, factory, number):
         super().__init__(factory, number)
         self._frequency = None
@@ -449,6 +1092,13 @@ class MockFactory(PiFactory):
     by the :meth:`pin` method by default. This can be changed after
     construction by modifying the :attr:`pin_class` attribute.
 
+    If *virtual_time* is :data:`True`, the factory installs a
+    :class:`MockClock` which all timing in GPIO Zero (background threads,
+    :meth:`ticks`, mock pin state timestamps and delays) follows instead of
+    real time, until the factory is closed. This permits timing-based tests to
+    run deterministically, in a fraction of the time they would otherwise
+    take. Only one virtual clock may be installed at once.
+
     .. attribute:: pin_class
 
         This attribute stores the :class:`MockPin` class (or descendant) that
@@ -456,9 +1106,30 @@ class MockFactory(PiFactory):
         no *pin_class* parameter is used to override it). It defaults on
         construction to the value of the *pin_class* parameter in the
         constructor, or :class:`MockPin` if that is unspecified.
+
+    The *max_states* parameter limits the number of state changes recorded by
+    each mock pin in its :attr:`~MockPin.states` history (older changes are
+    discarded). This defaults to 10000; specify :data:`None` for no limit.
+
+    .. attribute:: max_states
+
+        The maximum length of the state history of pins subsequently
+        constructed or cleared (with :meth:`~MockPin.clear_states`) by this
+        factory.
+
+    .. attribute:: clock
+
+        The :class:`MockClock` installed by the factory when *virtual_time* is
+        :data:`True`, or :data:`None` when the factory operates in real time.
     """
-    def __init__(self, revision=None, pin_class=None):
+    _concurrent_close = True
+
+    def __init__(self, revision=None, pin_class=None, *, virtual_time=False,
+                 max_states=10000):
         super().__init__()
+        self.clock = None
+        self.max_states = max_states
+        self._scheduler = MockScheduler(self)
         if revision is None:
             revision = os.environ.get('GPIOZERO_MOCK_REVISION', 'a02082')
         if pin_class is None:
@@ -476,6 +1147,22 @@ class MockFactory(PiFactory):
                 'invalid mock pin_class: {pin_class!r}'.format(
                     pin_class=pin_class))
         self.pin_class = pin_class
+        if virtual_time:
+            clock = MockClock()
+            old_clock = _set_clock(clock)
+            if old_clock is not None:
+                _set_clock(old_clock)
+                raise RuntimeError('a virtual clock is already installed')
+            self.clock = clock
+
+    def close(self):
+        super().close()
+        self._scheduler.close()
+        if self.clock is not None:
+            old_clock = _set_clock(None)
+            assert old_clock is self.clock
+            self.clock.close()
+            self.clock = None
 
     def _get_revision(self):
         return self._revision
@@ -486,6 +1173,7 @@ class MockFactory(PiFactory):
         test suites to ensure the pin factory is back in a "clean" state before
         the next set of tests are run.
         """
+        self._scheduler.close()
         self.pins.clear()
         self._reservations.clear()
 
@@ -517,9 +1205,27 @@ class MockFactory(PiFactory):
     def _get_spi_class(self, shared, hardware):
         return MockSPIInterfaceShared if shared else MockSPIInterface
 
-    @staticmethod
-    def ticks():
-        return monotonic()
+    def schedule(self, delay, callback, *args):
+        """
+        Schedules *callback* to be called with *args* after *delay* seconds
+        (measured by :meth:`ticks`) from a background thread shared by all
+        pins of the factory. Returns an object which can be passed to
+        :meth:`cancel`. This is intended for mock pins which need to simulate
+        delayed or periodic behaviour, like :class:`MockChargingPin`.
+        """
+        return self._scheduler.schedule(delay, callback, *args)
+
+    def cancel(self, event):
+        """
+        Cancels *event*, the result of a prior call to :meth:`schedule`.
+        """
+        self._scheduler.cancel(event)
+
+    def ticks(self):
+        if self.clock is None:
+            return monotonic()
+        else:
+            return self.clock.time
 
     @staticmethod
     def ticks_diff(later, earlier):
@@ -14,18 +14,24 @@ import mmap
 import errno
 import struct
 import select
+import warnings
 from time import sleep
+from functools import partial
 from threading import Thread, Event, RLock
 from queue import Queue, Empty
 from pathlib import Path
 
 from .local import LocalPiPin, LocalPiFactory
+from .pwm import PWMSoftware
 from ..exc import (
     PinInvalidPull,
     PinInvalidEdges,
     PinInvalidFunction,
+    PinInvalidState,
     PinFixedPull,
     PinSetInput,
+    PinPWMUnsupported,
+    PWMSoftwareFallback,
     )
 
 
@@ -302,6 +308,199 @@ class GPIOFS:
                 pass
 
 
+class PWMChannel:
+    """
+    A channel of the PWM peripheral, exported via the kernel's sysfs
+    interface. The channel's :file:`period`, :file:`duty_cycle`, and
+    :file:`enable` files are held open, so that each update costs a single
+    write.
+    """
+    def __init__(self, path):
+        self._period = 0
+        self._duty_cycle = 0
+        self._fds = []
+        try:
+            for name in ('period', 'duty_cycle', 'enable'):
+                self._fds.append(os.open(
+                    os.path.join(path, name), os.O_RDWR))
+        except:
+            self.close()
+            raise
+        self._period_fd, self._duty_cycle_fd, self._enable_fd = self._fds
+        self._period = int(os.pread(self._period_fd, 32, 0))
+        self._duty_cycle = int(os.pread(self._duty_cycle_fd, 32, 0))
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+    def _write(self, fd, value):
+        os.pwrite(fd, str(value).encode('ascii'), 0)
+
+    @property
+    def period(self):
+        return self._period
+
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+
+    def set(self, period, duty_cycle):
+        """
+        Sets the *period* and *duty_cycle* of the channel, both in nanoseconds.
+        """
+        # The kernel rejects any duty cycle longer than the period, so the
+        # order of the writes depends on whether the period is shrinking
+        if period < self._period:
+            if duty_cycle != self._duty_cycle:
+                self._write(self._duty_cycle_fd, duty_cycle)
+                self._duty_cycle = duty_cycle
+            self._write(self._period_fd, period)
+            self._period = period
+        else:
+            if period != self._period:
+                self._write(self._period_fd, period)
+                self._period = period
+            if duty_cycle != self._duty_cycle:
+                self._write(self._duty_cycle_fd, duty_cycle)
+                self._duty_cycle = duty_cycle
+
+    def set_duty_cycle(self, duty_cycle):
+        """
+        Sets the *duty_cycle* of the channel in nanoseconds.
+        """
+        self._write(self._duty_cycle_fd, duty_cycle)
+        self._duty_cycle = duty_cycle
+
+    def enable(self):
+        self._write(self._enable_fd, 1)
+
+    def disable(self):
+        self._write(self._enable_fd, 0)
+
+
+class PWMFS:
+    """
+    Provides access to the channels of the Pi's PWM peripheral via the
+    kernel's sysfs interface (:file:`/sys/class/pwm`). The peripheral must be
+    enabled (e.g. with the ``pwm`` or ``pwm-2chan`` device-tree overlays);
+    pins are switched to the PWM function when a channel is claimed for them.
+    """
+    PWM_PATH = '/sys/class/pwm'
+    COMPATIBLE = b'brcm,bcm2835-pwm'
+
+    # Maps GPIO numbers to the PWM channel they can output, and the alternate
+    # function which does so; from the BCM2835 data-sheet, p.102
+    PWM_PINS = {
+        12: (0, 'alt0'),
+        13: (1, 'alt0'),
+        18: (0, 'alt5'),
+        19: (1, 'alt5'),
+        40: (0, 'alt0'),
+        41: (1, 'alt0'),
+        45: (1, 'alt0'),
+        52: (0, 'alt1'),
+        53: (1, 'alt1'),
+    }
+
+    def __init__(self):
+        self._lock = RLock()
+        self._chip = None
+        self._claims = {}
+
+    def close(self):
+        with self._lock:
+            for pin, channel in self._claims.values():
+                channel.close()
+            self._claims.clear()
+
+    def path(self, name):
+        return os.path.join(self.PWM_PATH, name)
+
+    @property
+    def chip(self):
+        """
+        The path of the sysfs :file:`pwmchipN` directory representing the
+        Pi's PWM peripheral, or :data:`None` if it cannot be found.
+        """
+        with self._lock:
+            if self._chip is None:
+                try:
+                    names = sorted(os.listdir(self.PWM_PATH))
+                except OSError:
+                    names = []
+                for name in names:
+                    if name.startswith('pwmchip'):
+                        try:
+                            with io.open(self.path(os.path.join(
+                                    name, 'device', 'of_node', 'compatible')),
+                                    'rb') as f:
+                                compatible = f.read().split(b'\0')
+                        except IOError:
+                            continue
+                        if self.COMPATIBLE in compatible:
+                            self._chip = self.path(name)
+                            break
+            return self._chip
+
+    def claim(self, pin):
+        """
+        Exports and returns the :class:`PWMChannel` that GPIO *pin* can
+        output, along with the function *pin* must be set to to do so. Raises
+        :exc:`PinPWMUnsupported` if *pin* has no PWM function, the peripheral
+        cannot be found, or the channel is already claimed by another pin.
+        """
+        with self._lock:
+            try:
+                number, function = self.PWM_PINS[pin]
+            except KeyError:
+                raise PinPWMUnsupported(
+                    'GPIO{pin} has no hardware PWM function'.format(pin=pin))
+            chip = self.chip
+            if chip is None:
+                raise PinPWMUnsupported(
+                    'unable to find the PWM peripheral under {path}; is the '
+                    'pwm overlay enabled?'.format(path=self.PWM_PATH))
+            try:
+                owner, channel = self._claims[number]
+            except KeyError:
+                pass
+            else:
+                raise PinPWMUnsupported(
+                    'PWM channel {number} is already in use by '
+                    'GPIO{owner}'.format(number=number, owner=owner))
+            path = os.path.join(chip, 'pwm{number}'.format(number=number))
+            # As with GPIOFS.export, wait for udev to set permissions on the
+            # newly exported channel's files
+            for i in range(10):
+                try:
+                    channel = PWMChannel(path)
+                except IOError as e:
+                    if e.errno == errno.ENOENT:
+                        with io.open(os.path.join(chip, 'export'), 'wb') as f:
+                            f.write(str(number).encode('ascii'))
+                    elif e.errno == errno.EACCES:
+                        sleep(i / 100)
+                    else:
+                        raise
+                else:
+                    self._claims[number] = (pin, channel)
+                    return channel, function
+            raise RuntimeError(
+                'failed to export PWM channel {number}'.format(number=number))
+
+    def release(self, pin):
+        """
+        Releases the channel claimed by GPIO *pin* (if any).
+        """
+        with self._lock:
+            for number, (owner, channel) in list(self._claims.items()):
+                if owner == pin:
+                    channel.close()
+                    del self._claims[number]
+
+
 class NativeWatchThread(Thread):
     def __init__(self, factory, queue):
         super().__init__(
@@ -380,8 +579,14 @@ class NativeFactory(LocalPiFactory):
 
     .. warning::
 
-        This implementation does *not* currently support PWM. Attempting to
-        use any class which requests PWM will raise an exception.
+        This implementation uses hardware PWM on the pins which can output the
+        Pi's PWM peripheral (GPIO12, GPIO13, GPIO18, and GPIO19 on the header),
+        provided the peripheral is enabled with the ``pwm`` or ``pwm-2chan``
+        device-tree overlay. Only one of the pins sharing a channel (GPIO12 and
+        GPIO18, or GPIO13 and GPIO19) may use it at once. PWM on any other pin
+        falls back to :class:`~gpiozero.pins.pwm.PWMSoftware` (with a
+        :exc:`~gpiozero.PWMSoftwareFallback` warning), which is adequate for
+        dimming LEDs but too jittery for servos.
 
     You can construct native pin instances manually like so::
 
@@ -396,6 +601,8 @@ class NativeFactory(LocalPiFactory):
         queue = Queue()
         self.mem = GPIOMemory(self.pi_info.soc)
         self.fs = GPIOFS(self, queue)
+        self.pwm = PWMFS()
+        self.soft_pwm = PWMSoftware()
         self.dispatch = NativeDispatchThread(self, queue)
         if self.pi_info.soc == 'BCM2711':
             self.pin_class = Native2711Pin
@@ -410,6 +617,12 @@ class NativeFactory(LocalPiFactory):
         if self.fs is not None:
             self.fs.close()
             self.fs = None
+        if self.pwm is not None:
+            self.pwm.close()
+            self.pwm = None
+        if self.soft_pwm is not None:
+            self.soft_pwm.close()
+            self.soft_pwm = None
         if self.mem is not None:
             self.mem.close()
             self.mem = None
@@ -440,6 +653,9 @@ class NativePin(LocalPiPin):
         self._when_changed = None
         self._change_thread = None
         self._change_event = Event()
+        self._pwm = None
+        self._frequency = None
+        self._duty_cycle = None
         self.function = 'input'
         self.pull = 'up' if self.factory.pi_info.pulled_up(repr(self)) else 'floating'
         self.bounce = None
@@ -485,9 +701,22 @@ class NativePin(LocalPiPin):
             )
 
     def _get_state(self):
+        if self._frequency is not None:
+            return self._duty_cycle
         return bool(self.factory.mem[self._level_offset] & (1 << self._level_shift))
 
     def _set_state(self, value):
+        if self._frequency is not None:
+            if not 0 <= value <= 1:
+                raise PinInvalidState(
+                    'invalid state "{value}" for pin {self!r}'.format(
+                        self=self, value=value))
+            if self._pwm is None:
+                self.factory.soft_pwm.set_duty_cycle(self, value)
+            else:
+                self._pwm.set_duty_cycle(round(self._pwm.period * value))
+            self._duty_cycle = value
+            return
         if self.function == 'input':
             raise PinSetInput(
                 'cannot set state of pin {self!r}'.format(self=self))
@@ -496,6 +725,94 @@ class NativePin(LocalPiPin):
         else:
             self.factory.mem[self._clear_offset] = 1 << self._clear_shift
 
+    def _get_frequency(self):
+        return self._frequency
+
+    def _set_frequency(self, value):
+        if value is not None and value <= 0:
+            raise PinInvalidState(
+                'invalid frequency {value} for pin {self!r}'.format(
+                    self=self, value=value))
+        if self._frequency is None and value is not None:
+            try:
+                channel, function = self.factory.pwm.claim(self.number)
+            except PinPWMUnsupported:
+                warnings.warn(PWMSoftwareFallback(
+                    'no hardware PWM available on {self!r}; falling back to '
+                    'software PWM'.format(self=self)))
+                self.function = 'output'
+                self._set_state(False)
+                self.factory.soft_pwm.add(self, value)
+            else:
+                try:
+                    period = round(1e9 / value)
+                    channel.set(period, 0)
+                    channel.enable()
+                    self.function = function
+                except:
+                    self.factory.pwm.release(self.number)
+                    raise
+                self._pwm = channel
+            self._frequency = value
+            self._duty_cycle = 0
+        elif self._frequency is not None and value is not None:
+            if self._pwm is None:
+                self.factory.soft_pwm.set_frequency(self, value)
+            else:
+                period = round(1e9 / value)
+                self._pwm.set(period, round(period * self._duty_cycle))
+            self._frequency = value
+        elif self._frequency is not None and value is None:
+            channel, self._pwm = self._pwm, None
+            self._frequency = None
+            self._duty_cycle = None
+            if channel is None:
+                self.factory.soft_pwm.remove(self)
+                self._set_state(False)
+            else:
+                try:
+                    channel.disable()
+                    self.function = 'output'
+                    self._set_state(False)
+                finally:
+                    self.factory.pwm.release(self.number)
+
+    def _state_writers(self):
+        if self._frequency is not None:
+            return super()._state_writers()
+        # Bind straight to the GPSET and GPCLR registers, skipping the
+        # function check in _set_state; callers guarantee the pin is an output
+        mem = self.factory.mem
+        return (
+            partial(struct.pack_into, mem.reg_fmt, mem.mem,
+                    self._clear_offset * 4, 1 << self._clear_shift),
+            partial(struct.pack_into, mem.reg_fmt, mem.mem,
+                    self._set_offset * 4, 1 << self._set_shift),
+        )
+
+    def _state_reader(self):
+        if self._frequency is not None:
+            return super()._state_reader()
+        reg = partial(
+            struct.unpack_from, self.factory.mem.reg_fmt, self.factory.mem.mem,
+            self._level_offset * 4)
+        mask = 1 << self._level_shift
+        def read():
+            return reg()[0] & mask
+        return read
+
+    def _bank_writers(self):
+        # All pins sharing a GPSET/GPCLR register can be driven with one write
+        mem = self.factory.mem
+        return (
+            self._set_offset,
+            1 << self._set_shift,
+            partial(struct.pack_into, mem.reg_fmt, mem.mem,
+                    self._set_offset * 4),
+            partial(struct.pack_into, mem.reg_fmt, mem.mem,
+                    self._clear_offset * 4),
+        )
+
     def _get_pull(self):
         raise NotImplementedError
 
@@ -119,13 +119,19 @@ class PiFactory(Factory):
         attributes, and can handle half and full duplex communications, but the
         hardware interface is significantly faster (though for many simpler
         devices this doesn't matter).
+
+        If *rate* is specified, the :attr:`~gpiozero.SPI.rate` of the interface
+        will be set to it (in Hz) after construction. Note that when *shared*
+        is :data:`True` this will affect all users of the interface.
         """
         spi_args, kwargs = self._extract_spi_args(**spi_args)
         shared = bool(kwargs.pop('shared', False))
+        rate = kwargs.pop('rate', None)
         if kwargs:
             raise SPIBadArgs(
                 'unrecognized keyword argument {arg}'.format(
                     arg=kwargs.popitem()[0]))
+        intf = None
         try:
             port, device = spi_port_device(**spi_args)
         except SPIBadArgs:
@@ -133,15 +139,23 @@ class PiFactory(Factory):
             pass
         else:
             try:
-                return self._get_spi_class(shared, hardware=True)(
+                intf = self._get_spi_class(shared, hardware=True)(
                     pin_factory=self, **spi_args)
             except Exception as e:
                 warnings.warn(
                     SPISoftwareFallback(
                         'failed to initialize hardware SPI, falling back to '
                         'software (error was: {e!s})'.format(e=e)))
-        return self._get_spi_class(shared, hardware=False)(
-            pin_factory=self, **spi_args)
+        if intf is None:
+            intf = self._get_spi_class(shared, hardware=False)(
+                pin_factory=self, **spi_args)
+        if rate is not None:
+            try:
+                intf.rate = rate
+            except Exception:
+                intf.close()
+                raise
+        return intf
 
     def _extract_spi_args(self, **kwargs):
         """
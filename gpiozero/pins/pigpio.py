@@ -78,6 +78,9 @@ class PiGPIOFactory(PiFactory):
 
     .. _pigpio: http://abyz.me.uk/rpi/pigpio/
     """
+    # The pigpio library serializes the commands it sends to the daemon
+    _concurrent_close = True
+
     def __init__(self, host=None, port=None):
         super().__init__()
         if host is None:
@@ -450,12 +453,18 @@ class PiGPIOHardwareSPI(SPI):
 
     def transfer(self, data):
         self._check_open()
-        count, data = self.pin_factory.connection.spi_xfer(self._handle, data)
+        with self._lock:
+            count, result = self.pin_factory.connection.spi_xfer(
+                self._handle, data)
         if count < 0:
             raise IOError('SPI transfer error {count}'.format(count=count))
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # pigpio returns an empty str rather than a bytearray when nothing
+            # is read
+            return result if count else bytearray()
         # Convert returned bytearray to list of ints. XXX Not sure how non-byte
         # sized words (aux intf only) are returned ... padded to 16/32-bits?
-        return [int(b) for b in data]
+        return list(result)
 
 
 class PiGPIOSoftwareSPI(SPI):
@@ -589,13 +598,18 @@ class PiGPIOSoftwareSPI(SPI):
 
     def transfer(self, data):
         self._check_open()
-        count, data = self.pin_factory.connection.bb_spi_xfer(
-            self._select_pin, data)
+        with self._lock:
+            count, result = self.pin_factory.connection.bb_spi_xfer(
+                self._select_pin, data)
         if count < 0:
             raise IOError('SPI transfer error {count}'.format(count=count))
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # pigpio returns an empty str rather than a bytearray when nothing
+            # is read
+            return result if count else bytearray()
         # Convert returned bytearray to list of ints. bb_spi only supports
         # byte-sized words so no issues here
-        return [int(b) for b in data]
+        return list(result)
 
 
 class PiGPIOHardwareSPIShared(SharedMixin, PiGPIOHardwareSPI):
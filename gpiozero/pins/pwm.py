@@ -0,0 +1,226 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from threading import Lock, current_thread
+
+from ..threads import GPIOThread, GPIOEvent, _WakingEvent, _now
+
+
+class _PWMChannel:
+    __slots__ = (
+        'pin', 'period', 'high', 'start', 'when', 'edge', 'state',
+        'bank', 'mask', 'on', 'off',
+    )
+
+    def __init__(self, pin, frequency, duty_cycle):
+        self.pin = pin
+        self.period = 1 / frequency
+        self.high = self.period * duty_cycle
+        self.start = None
+        self.when = None
+        self.edge = None
+        self.state = None
+        bank = pin._bank_writers()
+        if bank is None:
+            self.bank = self.mask = None
+            self.off, self.on = pin._state_writers()
+        else:
+            self.bank, self.mask, self.on, self.off = bank
+
+    def advance(self):
+        # Called after the channel's edge has been applied; schedules the
+        # following edge (if any) relative to the start of the current cycle,
+        # so lateness in applying edges doesn't accumulate
+        if self.state:
+            if self.high < self.period:
+                self.when = self.start + self.high
+                self.edge = False
+            else:
+                self.when = None
+        else:
+            if self.high > 0:
+                self.start += self.period
+                self.when = self.start
+                self.edge = True
+            else:
+                self.when = None
+
+    def retime(self, now):
+        # Called when the channel is added or changed, or has fallen more than
+        # a period behind; works out which state the channel should be in at
+        # *now*, and schedules an immediate edge if it isn't in that state
+        if self.start is None or now - self.start >= self.period:
+            self.start = now
+        state = (now - self.start) < self.high
+        if state != self.state:
+            self.when = now
+            self.edge = state
+        else:
+            self.advance()
+
+
+class PWMSoftware:
+    """
+    A software PWM implementation which drives any number of pins from a
+    single background thread.
+
+    The thread computes the next edge across all channels, sleeps until it is
+    due, then applies every edge due within :attr:`coalesce` seconds of it.
+    Pins which implement :meth:`~gpiozero.Pin._bank_writers` have their
+    simultaneous edges applied with a single write per bank (e.g. one write to
+    the GPSET register for all rising edges, and one to GPCLR for all falling
+    edges); other pins are driven individually via
+    :meth:`~gpiozero.Pin._state_writers`.
+
+    The thread is started when the first pin is added, and stopped when the
+    last is removed. The timing of a Python thread is, naturally, subject to
+    the whims of the scheduler and the GIL so expect jitter of the order of
+    tens of microseconds (or worse on a loaded system). This is fine for
+    dimming LEDs, but unsuitable for servos or anything else timing-critical.
+
+    Pins passed to :meth:`add` must already be configured as outputs. The
+    implementation is not tied to any particular factory, but a factory will
+    typically construct one instance to serve all of its pins.
+    """
+    #: Edges due within this many seconds of each other are applied together
+    coalesce = 0.0001
+
+    def __init__(self):
+        self._lock = Lock()
+        self._channels = {}
+        self._wake = GPIOEvent()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._channels)
+
+    def __contains__(self, pin):
+        return pin in self._channels
+
+    def close(self):
+        """
+        Stops PWM on all pins, and terminates the background thread. Pins are
+        left in whatever state they were in at the time.
+        """
+        with self._lock:
+            self._channels.clear()
+            thread, self._thread = self._thread, None
+        self._stop(thread)
+
+    def add(self, pin, frequency, duty_cycle=0):
+        """
+        Start PWM on *pin* at the specified *frequency* (in Hz) and
+        *duty_cycle* (between 0 and 1).
+        """
+        self._check(frequency, duty_cycle)
+        channel = _PWMChannel(pin, frequency, duty_cycle)
+        with self._lock:
+            channel.retime(_now())
+            self._channels[pin] = channel
+            # The thread may have been stopped without our involvement (e.g.
+            # by _threads_shutdown); start a fresh one if so
+            if self._thread is None or self._thread.stopping.is_set():
+                self._thread = GPIOThread(self._run)
+                self._thread.stopping = _WakingEvent(self._wake)
+                self._thread.start()
+            else:
+                self._wake.set()
+
+    def remove(self, pin):
+        """
+        Stop PWM on *pin*. The pin is left in whatever state it was in at the
+        time.
+        """
+        with self._lock:
+            if self._channels.pop(pin, None) is None or self._channels:
+                return
+            thread, self._thread = self._thread, None
+        self._stop(thread)
+
+    def set_frequency(self, pin, frequency):
+        """
+        Change the *frequency* (in Hz) of PWM on *pin*.
+        """
+        self._check(frequency, 0)
+        with self._lock:
+            channel = self._channels[pin]
+            duty_cycle = channel.high / channel.period
+            channel.period = 1 / frequency
+            channel.high = channel.period * duty_cycle
+            channel.retime(_now())
+            self._wake.set()
+
+    def set_duty_cycle(self, pin, duty_cycle):
+        """
+        Change the *duty_cycle* (between 0 and 1) of PWM on *pin*. The change
+        takes effect within the current cycle.
+        """
+        self._check(1, duty_cycle)
+        with self._lock:
+            channel = self._channels[pin]
+            channel.high = channel.period * duty_cycle
+            channel.retime(_now())
+            self._wake.set()
+
+    @staticmethod
+    def _check(frequency, duty_cycle):
+        if frequency <= 0:
+            raise ValueError('frequency must be greater than 0')
+        if not 0 <= duty_cycle <= 1:
+            raise ValueError('duty_cycle must be between 0 and 1')
+
+    @staticmethod
+    def _stop(thread):
+        if thread is not None:
+            if thread is current_thread():
+                thread.stopping.set()
+            else:
+                thread.stop()
+
+    def _run(self):
+        stopping = current_thread().stopping
+        while not stopping.is_set():
+            self._wake.clear()
+            with self._lock:
+                now = _now()
+                horizon = now + self.coalesce
+                writes = {}
+                for channel in self._channels.values():
+                    if channel.when is None or channel.when > horizon:
+                        continue
+                    if now - channel.when > channel.period:
+                        # We've fallen more than a cycle behind (the system
+                        # is overloaded, or was suspended); restart the cycle
+                        # rather than racing through the missed edges
+                        channel.retime(now)
+                        if channel.when is None or channel.when > horizon:
+                            continue
+                    # Apply at most one edge per channel per pass; any
+                    # subsequent edge that's also due will be picked up on the
+                    # next pass (which won't wait)
+                    channel.state = channel.edge
+                    write = channel.on if channel.state else channel.off
+                    if channel.bank is None:
+                        writes[write] = None
+                    else:
+                        key = (channel.bank, channel.state)
+                        try:
+                            writes[key][1] |= channel.mask
+                        except KeyError:
+                            writes[key] = [write, channel.mask]
+                    channel.advance()
+                for key, value in writes.items():
+                    if value is None:
+                        key()
+                    else:
+                        write, mask = value
+                        write(mask)
+                timeout = min((
+                    channel.when for channel in self._channels.values()
+                    if channel.when is not None), default=None)
+            if timeout is not None:
+                timeout = max(0, timeout - _now())
+            self._wake.wait(timeout)
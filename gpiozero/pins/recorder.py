@@ -0,0 +1,643 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import os
+import re
+import mmap
+import struct
+from math import isnan
+from operator import itemgetter
+from types import MethodType
+from weakref import ref, WeakMethod
+from threading import Lock, RLock
+from collections import namedtuple
+
+from . import Factory, Pin
+from .mock import MockFactory, _SignalDriver
+
+
+OP_STATE = 0
+OP_FUNCTION = 1
+OP_PULL = 2
+OP_FREQUENCY = 3
+OP_EDGE = 4
+
+# Functions and pulls are stored as indexes into these tuples (-1 for
+# anything unrecognized)
+FUNCTIONS = (
+    'input', 'output', 'alt0', 'alt1', 'alt2', 'alt3', 'alt4', 'alt5')
+PULLS = ('floating', 'up', 'down')
+
+
+class PinRecord(namedtuple('PinRecord', ('timestamp', 'pin', 'op', 'value'))):
+    """
+    Represents a single record in a :class:`PinRecorder`. The *timestamp* is
+    the number of seconds since the recording started, *pin* is the number of
+    the pin affected, *op* is one of the ``OP_*`` constants, and *value* is
+    the new state (for ``OP_STATE``, or the state reported by an ``OP_EDGE``
+    callback), the name of the new function or pull (for ``OP_FUNCTION`` or
+    ``OP_PULL``), or the new frequency (for ``OP_FREQUENCY``; :data:`None`
+    when PWM is disabled).
+    """
+    __slots__ = ()
+
+
+class PinRecorder:
+    """
+    Stores :class:`PinRecord` entries as fixed-size binary records in a
+    memory-mapped ring file called *filename*. When the ring is full, the
+    oldest records are overwritten; :attr:`dropped` reports how many have
+    been lost.
+
+    If *capacity* is specified, a new recording with space for that many
+    records is created (truncating *filename* if it exists). Otherwise, the
+    existing recording in *filename* is opened read-only; this can be used to
+    examine (or export) a recording after the recording process has finished.
+    Specify *append* to open an existing recording for further records
+    instead.
+
+    Iterating over the recorder yields the retained records, oldest first.
+    Records are written straight into the mapped file so nothing beyond the
+    most recent record is lost if the process crashes.
+    """
+    HEADER = struct.Struct('<8sHHIQ')
+    RECORD = struct.Struct('<dHBxd')
+    MAGIC = b'GPIOZREC'
+    VERSION = 1
+    COUNT_OFFSET = 16
+
+    def __init__(self, filename, capacity=None, *, append=False):
+        self._lock = Lock()
+        self._writable = capacity is not None or append
+        if capacity is None:
+            self._file = io.open(filename, 'r+b' if append else 'rb')
+            try:
+                header = self._file.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    raise ValueError('{filename} is not a pin recording'.format(
+                        filename=filename))
+                magic, version, size, capacity, count = self.HEADER.unpack(
+                    header)
+                if magic != self.MAGIC or size != self.RECORD.size:
+                    raise ValueError('{filename} is not a pin recording'.format(
+                        filename=filename))
+                if version != self.VERSION:
+                    raise ValueError(
+                        'unsupported pin recording version {version}'.format(
+                            version=version))
+            except:
+                self._file.close()
+                raise
+        else:
+            if capacity < 1:
+                raise ValueError('capacity must be 1 or more')
+            count = 0
+            self._file = io.open(filename, 'w+b')
+            self._file.truncate(
+                self.HEADER.size + capacity * self.RECORD.size)
+        self._capacity = capacity
+        self._next = count
+        if self._writable:
+            self._mem = mmap.mmap(self._file.fileno(), 0)
+            self.HEADER.pack_into(
+                self._mem, 0, self.MAGIC, self.VERSION, self.RECORD.size,
+                capacity, count)
+        else:
+            self._mem = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Cache everything record() needs; it's called for every pin change
+        self._pack_into = self.RECORD.pack_into
+        self._count_struct = struct.Struct('<Q')
+        self._pack_count = self._count_struct.pack_into
+        self._offsets = range(
+            self.HEADER.size,
+            self.HEADER.size + capacity * self.RECORD.size,
+            self.RECORD.size)
+
+    def __repr__(self):
+        if self.closed:
+            return '<gpiozero.PinRecorder object closed>'
+        return (
+            '<gpiozero.PinRecorder object with {len} records, '
+            '{self.dropped} dropped>'.format(self=self, len=len(self)))
+
+    def close(self):
+        """
+        Flushes and closes the recording.
+        """
+        with self._lock:
+            if self._mem is not None:
+                self._mem.flush()
+                self._mem.close()
+                self._mem = None
+                self._file.close()
+
+    @property
+    def closed(self):
+        """
+        Returns :data:`True` if the recording has been closed.
+        """
+        return self._mem is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def capacity(self):
+        """
+        The maximum number of records retained.
+        """
+        return self._capacity
+
+    @property
+    def dropped(self):
+        """
+        The number of records that have been overwritten by newer ones.
+        """
+        return max(0, self._count - self._capacity)
+
+    @property
+    def _count(self):
+        return self._count_struct.unpack_from(self._mem, self.COUNT_OFFSET)[0]
+
+    def __len__(self):
+        return min(self._count, self._capacity)
+
+    def record(self, timestamp, pin, op, value):
+        """
+        Appends a record to the ring. The *value* must be a :class:`float`
+        (or something convertible to one); this is the low-level method used
+        by :class:`RecordingPin` and performs no translation of its arguments.
+        """
+        if not self._writable:
+            raise io.UnsupportedOperation(
+                'recording was not opened for appending')
+        # The lock is held only while the record and the count are written;
+        # without it, concurrent writers could publish a count covering a
+        # slot that another writer hasn't yet filled, or move the count in
+        # the header backwards
+        with self._lock:
+            count = self._next
+            self._pack_into(
+                self._mem, self._offsets[count % self._capacity],
+                timestamp, pin, op, value)
+            self._next = count + 1
+            self._pack_count(self._mem, self.COUNT_OFFSET, count + 1)
+
+    def __iter__(self):
+        count = self._count
+        data = bytes(self._mem[self.HEADER.size:])
+        first = max(0, count - self._capacity)
+        unpack_from = self.RECORD.unpack_from
+        for index in range(first, count):
+            timestamp, pin, op, value = unpack_from(
+                data, (index % self._capacity) * self.RECORD.size)
+            yield PinRecord(timestamp, pin, op, _decode(op, value))
+
+
+def _encode(op, value):
+    if op == OP_FUNCTION:
+        try:
+            return FUNCTIONS.index(value)
+        except ValueError:
+            return -1
+    elif op == OP_PULL:
+        try:
+            return PULLS.index(value)
+        except ValueError:
+            return -1
+    elif op == OP_FREQUENCY:
+        return float('nan') if value is None else value
+    else:
+        return value
+
+
+def _decode(op, value):
+    if op == OP_FUNCTION:
+        return FUNCTIONS[int(value)] if value >= 0 else None
+    elif op == OP_PULL:
+        return PULLS[int(value)] if value >= 0 else None
+    elif op == OP_FREQUENCY:
+        return None if isnan(value) else value
+    else:
+        return value
+
+
+class RecordingFactory(Factory):
+    """
+    Wraps another pin *factory*, recording every change made to the state,
+    function, pull, and frequency of the pins it produces, and every edge
+    callback they fire, to a :class:`PinRecorder` on *filename* with room for
+    *capacity* records. For example::
+
+        from gpiozero import Device, LED
+        from gpiozero.pins.native import NativeFactory
+        from gpiozero.pins.recorder import RecordingFactory, export_vcd
+
+        Device.pin_factory = RecordingFactory(NativeFactory(), 'pins.rec')
+        led = LED(17)
+        led.blink(n=3, background=False)
+        Device.pin_factory.close()
+        export_vcd('pins.rec', 'pins.vcd')
+
+    Only the pins returned by :meth:`pin` are recorded; pins used internally
+    by the wrapped factory (for example, by its software SPI implementation)
+    are not. Closing the factory closes the wrapped factory and the
+    recording.
+    """
+    def __init__(self, factory, filename, capacity=65536):
+        super().__init__()
+        self.factory = factory
+        self.recorder = PinRecorder(filename, capacity)
+        self.pins = {}
+        # Share the wrapped factory's reservations so that device shutdown
+        # (which inspects these) sees the actual reservations
+        self._reservations = factory._reservations
+        self._res_lock = factory._res_lock
+        self._start = factory.ticks()
+
+    def close(self):
+        for pin in self.pins.values():
+            pin.close()
+        self.pins.clear()
+        self.factory.close()
+        self.recorder.close()
+
+    def reserve_pins(self, requester, *pins):
+        self.factory.reserve_pins(requester, *pins)
+
+    def release_pins(self, reserver, *pins):
+        self.factory.release_pins(reserver, *pins)
+
+    def release_all(self, reserver):
+        self.factory.release_all(reserver)
+
+    def pin(self, spec, **kwargs):
+        """
+        Returns a :class:`RecordingPin` wrapping the pin returned by the
+        wrapped factory. Any keyword arguments are passed along to the wrapped
+        factory's :meth:`~Factory.pin` method.
+        """
+        pin = self.factory.pin(spec, **kwargs)
+        try:
+            return self.pins[pin]
+        except KeyError:
+            result = self.pins[pin] = RecordingPin(self, pin)
+            return result
+
+    def spi(self, **spi_args):
+        return self.factory.spi(**spi_args)
+
+    def ticks(self):
+        return self.factory.ticks()
+
+    def ticks_diff(self, later, earlier):
+        return self.factory.ticks_diff(later, earlier)
+
+    def _get_pi_info(self):
+        return self.factory.pi_info
+
+    def _record(self, ticks, pin, op, value):
+        self.recorder.record(
+            self.factory.ticks_diff(ticks, self._start), pin, op, value)
+
+
+class RecordingPin(Pin):
+    """
+    A :class:`~gpiozero.Pin` which wraps *pin*, as produced by the wrapped
+    factory of the :class:`RecordingFactory` *factory*, recording all changes
+    made to it. The wrapped pin is available as :attr:`pin`.
+    """
+    def __init__(self, factory, pin):
+        super().__init__()
+        self._factory = factory
+        self._pin = pin
+        self._number = pin.number
+        self._when_changed_lock = RLock()
+        self._when_changed = None
+
+    def __repr__(self):
+        return repr(self._pin)
+
+    @property
+    def factory(self):
+        return self._factory
+
+    @property
+    def pin(self):
+        """
+        The pin being recorded.
+        """
+        return self._pin
+
+    @property
+    def number(self):
+        return self._number
+
+    def _record(self, op, value):
+        factory = self._factory
+        factory._record(factory.factory.ticks(), self._number, op, value)
+
+    def close(self):
+        self.when_changed = None
+        self._pin.close()
+
+    def output_with_state(self, state):
+        self._pin.output_with_state(state)
+        self._record(OP_FUNCTION, _encode(OP_FUNCTION, 'output'))
+        self._record(OP_STATE, state)
+
+    def input_with_pull(self, pull):
+        self._pin.input_with_pull(pull)
+        self._record(OP_FUNCTION, _encode(OP_FUNCTION, 'input'))
+        self._record(OP_PULL, _encode(OP_PULL, pull))
+
+    def _get_function(self):
+        return self._pin.function
+
+    def _set_function(self, value):
+        self._pin.function = value
+        self._record(OP_FUNCTION, _encode(OP_FUNCTION, value))
+
+    def _get_state(self):
+        return self._pin.state
+
+    def _set_state(self, value):
+        self._pin.state = value
+        self._record(OP_STATE, value)
+
+    def _get_pull(self):
+        return self._pin.pull
+
+    def _set_pull(self, value):
+        self._pin.pull = value
+        self._record(OP_PULL, _encode(OP_PULL, value))
+
+    def _get_frequency(self):
+        return self._pin.frequency
+
+    def _set_frequency(self, value):
+        self._pin.frequency = value
+        self._record(OP_FREQUENCY, _encode(OP_FREQUENCY, value))
+
+    def _get_bounce(self):
+        return self._pin.bounce
+
+    def _set_bounce(self, value):
+        self._pin.bounce = value
+
+    def _get_edges(self):
+        return self._pin.edges
+
+    def _set_edges(self, value):
+        self._pin.edges = value
+
+    def _get_when_changed(self):
+        return None if self._when_changed is None else self._when_changed()
+
+    def _set_when_changed(self, value):
+        with self._when_changed_lock:
+            if value is None:
+                if self._when_changed is not None:
+                    self._pin.when_changed = None
+                self._when_changed = None
+            else:
+                enabled = self._when_changed is not None
+                # As in PiPin, don't keep a strong reference to the object
+                # owning the callback
+                if isinstance(value, MethodType):
+                    self._when_changed = WeakMethod(value)
+                else:
+                    self._when_changed = ref(value)
+                if not enabled:
+                    self._pin.when_changed = self._call_when_changed
+
+    def _call_when_changed(self, ticks, state):
+        self._factory._record(ticks, self._number, OP_EDGE, state)
+        method = self._when_changed()
+        if method is None:
+            self.when_changed = None
+        else:
+            method(ticks, state)
+
+
+class ReplayFactory(MockFactory):
+    """
+    Extends :class:`~gpiozero.pins.mock.MockFactory` to play back the input
+    edges captured in a recording (made with :class:`RecordingFactory`) into
+    its mock pins, preserving their original timing. This permits real-world
+    input streams (for example, a rapidly spun rotary encoder, or a storm of
+    button presses) to be replayed against the device classes for regression
+    or performance testing.
+
+    The *trace* parameter is the filename of a recording, a
+    :class:`PinRecorder`, or any iterable of :class:`PinRecord` tuples. Only
+    the ``OP_EDGE`` records are replayed; each drives the recorded pin to the
+    state reported with the edge. The *speed* parameter scales the playback
+    rate (2.0 replays twice as quickly as recorded). Combine this with
+    *virtual_time* to replay traces as quickly as the device classes can
+    handle them. All other parameters are as for
+    :class:`~gpiozero.pins.mock.MockFactory`.
+
+    Playback starts when :meth:`play` is called, with the recorded edges
+    timed from the start of the recording. Edges for pins that have not been
+    constructed, or are not configured as inputs, are skipped.
+    """
+    def __init__(self, trace, revision=None, pin_class=None, *, speed=1.0,
+                 virtual_time=False, max_states=10000):
+        if speed <= 0:
+            raise ValueError('speed must be positive')
+        if isinstance(trace, (str, bytes, os.PathLike)):
+            with PinRecorder(trace) as recorder:
+                trace = list(recorder)
+        # A stable sort on the timestamp alone, so simultaneous edges are
+        # replayed in the order they were recorded
+        self.trace = sorted((
+            (record.timestamp, record.pin, bool(record.value))
+            for record in (PinRecord(*record) for record in trace)
+            if record.op == OP_EDGE
+        ), key=itemgetter(0))
+        self.speed = speed
+        self._replay = None
+        super().__init__(revision, pin_class, virtual_time=virtual_time,
+                         max_states=max_states)
+        self._replay = _SignalDriver(self, self._drive)
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def reset(self):
+        self.stop()
+        super().reset()
+
+    def play(self):
+        """
+        Starts (or restarts) playback of the trace.
+        """
+        self._replay.start(self._edges())
+
+    def stop(self):
+        """
+        Stops playback of the trace.
+        """
+        if self._replay is not None:
+            self._replay.stop()
+
+    @property
+    def playing(self):
+        """
+        Returns :data:`True` while the trace is being played back.
+        """
+        return self._replay.running
+
+    def wait(self, timeout=None):
+        """
+        Waits for playback to finish, or for *timeout* seconds to elapse.
+        Returns :data:`True` if playback finished.
+        """
+        return self._replay.wait(timeout)
+
+    def _edges(self):
+        # Converts the trace's timestamps into the delays between edges
+        # expected by _SignalDriver
+        speed = self.speed
+        last = 0.0
+        for timestamp, number, state in self.trace:
+            timestamp /= speed
+            yield timestamp - last, number, state
+            last = timestamp
+
+    def _drive(self, number, state):
+        pin = self.pins.get(number)
+        if pin is not None and pin._function == 'input':
+            if state:
+                pin.drive_high()
+            else:
+                pin.drive_low()
+
+
+_VCD_UNITS = {'s': 1, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9, 'ps': 1e-12}
+
+
+def _vcd_ident(index):
+    # VCD identifiers are composed of the printable ASCII characters from !
+    # to ~
+    chars = []
+    while True:
+        index, rem = divmod(index, 94)
+        chars.append(chr(33 + rem))
+        if not index:
+            return ''.join(chars)
+        index -= 1
+
+
+def export_vcd(recording, output, timescale='1us'):
+    """
+    Exports *recording* (a :class:`PinRecorder`, or the filename of a
+    recording) to *output* (a filename or file-like object opened for text
+    writing) as a `Value Change Dump`_, as understood by most logic analyser
+    viewers (such as GTKWave or PulseView).
+
+    Each recorded pin appears as a wire (or a real variable if fractional
+    states, e.g. PWM duty cycles, were recorded), with a companion event
+    variable which triggers whenever the pin's edge callback fired. Pins
+    which had their PWM frequency changed also gain a real variable for the
+    frequency. Function and pull changes are not exported. The *timescale*
+    specifies the resolution of the dump, e.g. "1us" (the default), "10ns",
+    or "1ms".
+
+    .. _Value Change Dump: https://en.wikipedia.org/wiki/Value_change_dump
+    """
+    match = re.match(r'^\s*(1|10|100)\s*(s|ms|us|ns|ps)\s*$', timescale)
+    if not match:
+        raise ValueError('invalid timescale {timescale!r}'.format(
+            timescale=timescale))
+    resolution = int(match.group(1)) * _VCD_UNITS[match.group(2)]
+    if isinstance(recording, PinRecorder):
+        records = list(recording)
+    else:
+        with PinRecorder(recording) as recorder:
+            records = list(recorder)
+    records.sort(key=lambda record: record.timestamp)
+
+    variables = {}
+    analog = set()
+    for record in records:
+        if record.op in (OP_STATE, OP_EDGE):
+            key = (record.pin, OP_STATE)
+            variables.setdefault(key, None)
+            if record.value not in (0, 1):
+                analog.add(key)
+            if record.op == OP_EDGE:
+                variables.setdefault((record.pin, OP_EDGE), None)
+        elif record.op == OP_FREQUENCY:
+            variables.setdefault((record.pin, OP_FREQUENCY), None)
+    for index, key in enumerate(sorted(variables)):
+        variables[key] = _vcd_ident(index)
+
+    def value_change(key, value):
+        ident = variables[key]
+        if key[1] == OP_EDGE:
+            return '1{ident}'.format(ident=ident)
+        elif key[1] == OP_FREQUENCY or key in analog:
+            return 'r{value:.16g} {ident}'.format(
+                value=0.0 if value is None else value, ident=ident)
+        else:
+            return '{value:d}{ident}'.format(value=bool(value), ident=ident)
+
+    def write(out):
+        out.write('$version gpiozero $end\n')
+        out.write('$timescale {timescale} $end\n'.format(
+            timescale=timescale.replace(' ', '')))
+        out.write('$scope module gpiozero $end\n')
+        for key, ident in variables.items():
+            pin, op = key
+            if op == OP_EDGE:
+                decl = 'event 1 {ident} GPIO{pin}_edge'
+            elif op == OP_FREQUENCY:
+                decl = 'real 64 {ident} GPIO{pin}_frequency'
+            elif key in analog:
+                decl = 'real 64 {ident} GPIO{pin}'
+            else:
+                decl = 'wire 1 {ident} GPIO{pin}'
+            out.write('$var ' + decl.format(ident=ident, pin=pin) + ' $end\n')
+        out.write('$upscope $end\n')
+        out.write('$enddefinitions $end\n')
+        out.write('$dumpvars\n')
+        for key, ident in variables.items():
+            if key[1] != OP_EDGE:
+                out.write(('r0 {ident}\n' if key[1] == OP_FREQUENCY
+                           or key in analog else 'x{ident}\n').format(
+                               ident=ident))
+        out.write('$end\n')
+        last = None
+        for record in records:
+            if record.op == OP_EDGE:
+                changes = [
+                    ((record.pin, OP_STATE), record.value),
+                    ((record.pin, OP_EDGE), None),
+                ]
+            elif record.op in (OP_STATE, OP_FREQUENCY):
+                changes = [((record.pin, record.op), record.value)]
+            else:
+                continue
+            time = int(round(record.timestamp / resolution))
+            if time != last:
+                out.write('#{time:d}\n'.format(time=time))
+                last = time
+            for key, value in changes:
+                out.write(value_change(key, value) + '\n')
+
+    if isinstance(output, (str, bytes, os.PathLike)):
+        with io.open(output, 'w', encoding='ascii') as out:
+            write(out)
+    else:
+        write(output)
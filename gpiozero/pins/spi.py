@@ -6,7 +6,7 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import operator
+from time import perf_counter
 from threading import RLock
 
 from . import SPI
@@ -42,6 +42,8 @@ class SPISoftware(SPI):
             self._clock_phase = False
             self._lsb_first = False
             self._bits_per_word = 8
+            self._rate = 0
+            self._actual_rate = None
             self._bus = SPISoftwareBus(
                 clock_pin, mosi_pin, miso_pin, pin_factory=pin_factory)
             self._select = OutputDevice(
@@ -84,12 +86,46 @@ class SPISoftware(SPI):
         with self._bus.lock:
             self._select.on()
             try:
-                return self._bus.transfer(
-                    data, self._clock_phase, self._lsb_first,
-                    self._bits_per_word)
+                return self._transfer(data)
             finally:
                 self._select.off()
 
+    def transfer_many(self, frames):
+        result = []
+        with self._bus.lock:
+            for data in frames:
+                self._select.on()
+                try:
+                    result.append(self._transfer(data))
+                finally:
+                    self._select.off()
+        return result
+
+    def _transfer(self, data):
+        start = perf_counter()
+        result = self._bus.transfer(
+            data, self._clock_phase, self._lsb_first, self._bits_per_word,
+            self._rate)
+        elapsed = perf_counter() - start
+        if result and elapsed > 0:
+            self._actual_rate = (
+                len(result) * self._bits_per_word / elapsed)
+        return result
+
+    @property
+    def actual_rate(self):
+        """
+        The effective clock rate (in Hz) achieved by the last transfer, or
+        :data:`None` if no transfer has taken place yet. This is calculated
+        from the number of bits transferred and the time taken to transfer
+        them, so it includes the overhead between clock pulses.
+
+        When :attr:`~gpiozero.SPI.rate` is 0 this is the maximum rate the
+        software implementation can achieve; otherwise it should be at, or a
+        little below, the requested :attr:`~gpiozero.SPI.rate`.
+        """
+        return self._actual_rate
+
     def _get_clock_mode(self):
         with self._bus.lock:
             return (not self._bus.clock.active_high) << 1 | self._clock_phase
@@ -116,6 +152,16 @@ class SPISoftware(SPI):
             raise ValueError('bits_per_word must be positive')
         self._bits_per_word = int(value)
 
+    def _get_rate(self):
+        return self._rate
+
+    def _set_rate(self, value):
+        if value is None:
+            value = 0
+        if value < 0:
+            raise ValueError('rate must be positive, or 0 for no limit')
+        self._rate = int(value)
+
     def _get_select_high(self):
         return self._select.active_high
 
@@ -130,18 +176,22 @@ class SPISoftwareBus(SharedMixin, Device):
     A software bit-banged SPI bus implementation, used by
     :class:`~gpiozero.pins.spi.SPISoftware` to implement shared SPI interfaces.
 
-    .. warning::
-
-        This implementation has no rate control; it simply clocks out data as
-        fast as it can as Python isn't terribly quick on a Pi anyway, and the
-        extra logic required for rate control is liable to reduce the maximum
-        achievable data rate quite substantially.
+    By default this simply clocks out data as fast as it can, as Python isn't
+    terribly quick on a Pi anyway. When a *rate* is given to :meth:`transfer`
+    each half of the clock cycle is padded with a busy-wait so that the clock
+    never exceeds that rate. Note that a busy-wait is used, rather than
+    :func:`~time.sleep`, as the latter is far too coarse for the microsecond
+    delays involved; the calling thread will therefore consume an entire
+    core for the duration of the transfer.
     """
     def __init__(self, clock_pin, mosi_pin, miso_pin, *, pin_factory):
         self.lock = None
         self.clock = None
         self.mosi = None
         self.miso = None
+        self._clock_writers = None
+        self._mosi_writers = None
+        self._miso_reader = None
         super().__init__()
         # XXX Should probably just use CompositeDevice for this; would make
         # close() a bit cleaner - any implications with the RLock?
@@ -149,10 +199,17 @@ class SPISoftwareBus(SharedMixin, Device):
         try:
             self.clock = OutputDevice(
                 clock_pin, active_high=True, pin_factory=pin_factory)
+            self._clock_writers = self.clock.pin._state_writers()
             if mosi_pin is not None:
                 self.mosi = OutputDevice(mosi_pin, pin_factory=pin_factory)
+                self._mosi_writers = self.mosi.pin._state_writers()
+            else:
+                self._mosi_writers = (_nothing, _nothing)
             if miso_pin is not None:
                 self.miso = InputDevice(miso_pin, pin_factory=pin_factory)
+                self._miso_reader = self.miso.pin._state_reader()
+            else:
+                self._miso_reader = _nothing
         except:
             self.close()
             raise
@@ -161,6 +218,9 @@ class SPISoftwareBus(SharedMixin, Device):
         super().close()
         if getattr(self, 'lock', None):
             with self.lock:
+                self._clock_writers = None
+                self._mosi_writers = None
+                self._miso_reader = None
                 if self.miso is not None:
                     self.miso.close()
                     self.miso = None
@@ -180,11 +240,17 @@ class SPISoftwareBus(SharedMixin, Device):
     def _shared_key(cls, clock_pin, mosi_pin, miso_pin, *, pin_factory=None):
         return (clock_pin, mosi_pin, miso_pin)
 
-    def transfer(self, data, clock_phase=False, lsb_first=False, bits_per_word=8):
+    def transfer(self, data, clock_phase=False, lsb_first=False,
+                 bits_per_word=8, rate=0):
         """
         Writes data (a list of integer words where each word is assumed to have
         :attr:`bits_per_word` bits or less) to the SPI interface, and reads an
-        equivalent number of words, returning them as a list of integers.
+        equivalent number of words, returning them as a list of integers. If
+        *data* is a :term:`bytes-like object`, the result is a
+        :class:`bytearray` instead.
+
+        If *rate* is non-zero, the clock will be limited to (at most) that many
+        cycles per second.
         """
         result = []
         with self.lock:
@@ -192,29 +258,89 @@ class SPISoftwareBus(SharedMixin, Device):
             # (specifically the section "Example of bit-banging the master
             # protocol") for a simpler C implementation of this which ignores
             # clock polarity, phase, variable word-size, and multiple input
-            # words
+            # words.
+            #
+            # The pins are driven through the callables returned by
+            # Pin._state_writers and Pin._state_reader which bypass the device
+            # and pin layers (and, where the pin factory supports it, bind
+            # directly to the GPIO registers). Clock polarity is therefore
+            # applied here rather than by self.clock.on() / off()
+            clock_off, clock_on = self._clock_writers
+            if not self.clock.active_high:
+                clock_off, clock_on = clock_on, clock_off
+            mosi_writers = self._mosi_writers
+            read_bit = self._miso_reader
             if lsb_first:
-                shift = operator.lshift
-                init_mask = 1
+                masks = [1 << bit for bit in range(bits_per_word)]
             else:
-                shift = operator.rshift
-                init_mask = 1 << (bits_per_word - 1)
+                masks = [1 << bit for bit in reversed(range(bits_per_word))]
+            if rate:
+                # Each clock edge waits until at least half a clock period has
+                # passed since the previous edge. The deadline is measured
+                # from the end of the previous wait, so the time spent writing
+                # and reading pins is absorbed into the wait (making the delay
+                # self-calibrating), while a late edge (e.g. when the thread
+                # is pre-empted) never causes a shortened cycle afterward
+                half_period = 1 / (2 * rate)
+                now = perf_counter()
+                deadline = now
+            # Each bit plan is a list of (mosi-writer, mask) tuples for a
+            # particular word; plans are re-used for repeated words which are
+            # common in practice (command bytes, padding, fills, etc.)
+            plans = {}
             for write_word in data:
-                mask = init_mask
+                try:
+                    plan = plans[write_word]
+                except KeyError:
+                    plan = plans[write_word] = [
+                        (mosi_writers[bool(write_word & mask)], mask)
+                        for mask in masks
+                    ]
                 read_word = 0
-                for _ in range(bits_per_word):
-                    if self.mosi is not None:
-                        self.mosi.value = bool(write_word & mask)
-                    # read bit on clock activation
-                    self.clock.on()
-                    if not clock_phase:
-                        if self.miso is not None and self.miso.value:
+                if rate:
+                    for write_bit, mask in plan:
+                        write_bit()
+                        while now < deadline:
+                            now = perf_counter()
+                        deadline = now + half_period
+                        clock_on()
+                        # read bit on clock activation
+                        if not clock_phase and read_bit():
                             read_word |= mask
+                        while now < deadline:
+                            now = perf_counter()
+                        deadline = now + half_period
+                        clock_off()
+                        # read bit on clock deactivation
+                        if clock_phase and read_bit():
+                            read_word |= mask
+                elif clock_phase:
                     # read bit on clock deactivation
-                    self.clock.off()
-                    if clock_phase:
-                        if self.miso is not None and self.miso.value:
+                    for write_bit, mask in plan:
+                        write_bit()
+                        clock_on()
+                        clock_off()
+                        if read_bit():
+                            read_word |= mask
+                else:
+                    # read bit on clock activation
+                    for write_bit, mask in plan:
+                        write_bit()
+                        clock_on()
+                        if read_bit():
                             read_word |= mask
-                    mask = shift(mask, 1)
+                        clock_off()
                 result.append(read_word)
+            if rate:
+                # Hold the final clock state for the remainder of its half
+                # cycle so back-to-back transfers can't exceed the rate
+                while now < deadline:
+                    now = perf_counter()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytearray(result)
         return result
+
+
+def _nothing():
+    # Stands in for the MOSI writers and MISO reader on buses without them
+    return False
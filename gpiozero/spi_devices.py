@@ -9,12 +9,25 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import weakref
 from math import log, ceil
 from operator import or_
 from functools import reduce
-
-from .exc import DeviceClosed, SPIBadChannel, InputDeviceError
+from array import array
+from threading import Condition, current_thread
+from collections import namedtuple
+
+from .exc import (
+    DeviceClosed,
+    SPIBadChannel,
+    InputDeviceError,
+    BadQueueLen,
+    )
 from .devices import Device
+from .threads import GPIOThread, _now
+
+
+AnalogInputBlock = namedtuple('AnalogInputBlock', ('timestamps', 'values'))
 
 
 class SPIDevice(Device):
@@ -169,18 +182,310 @@ class AnalogInputDevice(SPIDevice):
         """
         return self.value * self._max_voltage
 
+    def stream(self, rate, block_size=100, blocks=10, when_block=None):
+        """
+        Starts sampling the device at a fixed *rate* (measured in Hz) in a
+        background thread, returning an :class:`AnalogInputStream` which
+        provides the samples in blocks of *block_size*. For example, to
+        print the mean of each tenth of a second of samples taken at 1kHz::
+
+            from statistics import mean
+            from gpiozero import MCP3208
+
+            adc = MCP3208(channel=0)
+            with adc.stream(1000) as stream:
+                for block in stream:
+                    print(mean(block.values))
+
+        See :class:`AnalogInputStream` for further information on the
+        parameters.
+        """
+        self._check_open()
+        return AnalogInputStream(
+            self, rate, block_size=block_size, blocks=blocks,
+            when_block=when_block)
+
+
+class AnalogInputStream:
+    """
+    Samples an :class:`AnalogInputDevice` at a fixed rate in a background
+    thread. Instances are usually constructed with
+    :meth:`AnalogInputDevice.stream` rather than directly.
+
+    Samples are written to a ring buffer of *blocks* blocks, each of which
+    contains *block_size* samples, which is allocated up front. Completed
+    blocks can be retrieved with :meth:`read`, by iterating over the stream,
+    or by specifying a *when_block* handler. Each block is an
+    :func:`~collections.namedtuple` with *timestamps* and *values* members,
+    each of which is an :class:`~array.array` of floats. Timestamps are
+    measured in seconds with :func:`time.monotonic` (or by the virtual clock of
+    a :class:`~gpiozero.pins.mock.MockFactory`, if one is installed) and
+    values are scaled in
+    the same manner as :attr:`AnalogInputDevice.value`. If NumPy is
+    available, :func:`numpy.frombuffer` can be used to view either array
+    without copying it.
+
+    Samples are taken on a fixed schedule of one every 1/*rate* seconds from
+    the start of the stream. If reading the device overruns one or more of
+    the following deadlines, those samples are skipped (sampling resumes at
+    the next deadline that can still be met) and :attr:`dropped` is
+    incremented accordingly.
+
+    If the consumer falls behind so far that the ring buffer is full, the
+    oldest block is discarded, and :attr:`overruns` is incremented.
+
+    :param AnalogInputDevice device:
+        The device to sample.
+
+    :param float rate:
+        The rate at which to sample the device, in Hz.
+
+    :param int block_size:
+        The number of samples in each block. Defaults to 100.
+
+    :param int blocks:
+        The number of blocks in the ring buffer. Must be at least 2. Defaults
+        to 10.
+
+    :param when_block:
+        If specified, a function that will be called with each block as it
+        is completed. It is called from a separate thread to the one sampling
+        the device; blocks should not be read from the stream by other means
+        when this is specified.
+    """
+    def __init__(self, device, rate, block_size=100, blocks=10,
+                 when_block=None):
+        if rate <= 0:
+            raise InputDeviceError('rate must be positive')
+        if block_size < 1:
+            raise BadQueueLen('block_size must be at least one')
+        if blocks < 2:
+            raise BadQueueLen('blocks must be at least two')
+        self._device = weakref.proxy(device)
+        self._rate = float(rate)
+        self._block_size = int(block_size)
+        self._blocks = int(blocks)
+        size = self._block_size * self._blocks
+        self._timestamps = array('d', bytes(size * 8))
+        self._values = array('d', bytes(size * 8))
+        self._cond = Condition()
+        # _produced and _consumed are counts of blocks (not indexes into the
+        # ring buffer) which are only updated under _cond
+        self._produced = 0
+        self._consumed = 0
+        self._overruns = 0
+        self._dropped = 0
+        self._samples = 0
+        self._started = None
+        self._latest = None
+        self._when_block = when_block
+        self._dispatch_thread = None
+        self._thread = GPIOThread(self._acquire)
+        self._thread.start()
+        if when_block is not None:
+            self._dispatch_thread = GPIOThread(self._dispatch)
+            self._dispatch_thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            block = self.read()
+            if block is None:
+                break
+            yield block
+
+    def __repr__(self):
+        return (
+            '<gpiozero.AnalogInputStream object rate={self.rate}, '
+            'block_size={self.block_size}{closed}>'.format(
+                self=self, closed=', closed' if self.closed else ''))
+
+    def close(self):
+        """
+        Stops sampling the device. Any blocks already completed can still be
+        retrieved with :meth:`read`.
+        """
+        for thread in (self._thread, self._dispatch_thread):
+            if thread is not None:
+                thread.stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in (self._thread, self._dispatch_thread):
+            if thread is not None and thread is not current_thread():
+                thread.join(10)
+
+    @property
+    def closed(self):
+        """
+        Returns :data:`True` once the stream has stopped sampling, either
+        because :meth:`close` was called or because the device was closed.
+        """
+        return self._thread.stopping.is_set() or not self._thread.is_alive()
+
+    @property
+    def rate(self):
+        """
+        The sampling rate requested when the stream was constructed, in Hz.
+        """
+        return self._rate
+
+    @property
+    def actual_rate(self):
+        """
+        The sampling rate achieved so far, in Hz. This is calculated from the
+        timestamps of the first sample and the last sample of the most
+        recently completed block, and will be :data:`None` until a block
+        containing at least two samples has been completed.
+        """
+        with self._cond:
+            if self._samples < 2 or self._latest == self._started:
+                return None
+            return (self._samples - 1) / (self._latest - self._started)
+
+    @property
+    def block_size(self):
+        """
+        The number of samples in each block.
+        """
+        return self._block_size
+
+    @property
+    def overruns(self):
+        """
+        The number of blocks that were discarded because the ring buffer was
+        full before they were read.
+        """
+        return self._overruns
+
+    @property
+    def dropped(self):
+        """
+        The number of samples that were skipped because reading the device
+        overran their scheduled time.
+        """
+        return self._dropped
+
+    def read(self, timeout=None):
+        """
+        Returns the oldest completed block of samples that has not yet been
+        read, waiting up to *timeout* seconds (or forever if *timeout* is
+        :data:`None`) for one to be completed. Returns :data:`None` if no
+        block was completed within *timeout*, or if the stream is closed and
+        all completed blocks have been read.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._produced > self._consumed or self.closed,
+                timeout)
+            if self._produced == self._consumed:
+                return None
+            start = (self._consumed % self._blocks) * self._block_size
+            end = start + self._block_size
+            self._consumed += 1
+            # The writer cannot start on this block again while we hold
+            # _cond, so the slices below are consistent
+            return AnalogInputBlock(
+                self._timestamps[start:end], self._values[start:end])
+
+    def _acquire(self):
+        try:
+            read = self._device._read
+            min_value = self._device._min_value
+            value_range = self._device._range
+        except ReferenceError:
+            return
+        timestamps = self._timestamps
+        values = self._values
+        size = len(values)
+        block_size = self._block_size
+        period = 1 / self._rate
+        stopping = self._thread.stopping
+        index = 0
+        count = 0
+        tick = 0
+        first = None
+        start = _now()
+        try:
+            while True:
+                delay = start + tick * period - _now()
+                if delay > 0:
+                    if stopping.wait(delay):
+                        break
+                elif stopping.is_set():
+                    break
+                timestamp = _now()
+                try:
+                    raw = read()
+                except Exception:
+                    if self._device.closed:
+                        break
+                    raise
+                if first is None:
+                    first = timestamp
+                timestamps[index] = timestamp
+                values[index] = (2 * (raw - min_value) / value_range) - 1
+                count += 1
+                tick += 1
+                # If the read overran the next deadline (or several), skip to
+                # the first deadline not yet passed rather than firing
+                # the missed samples back-to-back
+                now = _now()
+                while start + tick * period < now:
+                    tick += 1
+                    self._dropped += 1
+                index += 1
+                if index == size:
+                    index = 0
+                if not index % block_size:
+                    with self._cond:
+                        self._samples = count
+                        self._latest = timestamp
+                        self._started = first
+                        self._produced += 1
+                        # Always leave the block the writer is about to fill
+                        # free, discarding the oldest unread block if needed
+                        if self._produced - self._consumed >= self._blocks:
+                            self._consumed += 1
+                            self._overruns += 1
+                        self._cond.notify_all()
+        except ReferenceError:
+            # Device is dead; time to die!
+            pass
+        finally:
+            stopping.set()
+            with self._cond:
+                self._cond.notify_all()
+
+    def _dispatch(self):
+        for block in self:
+            self._when_block(block)
+
 
 class MCP3xxx(AnalogInputDevice):
     """
     Extends :class:`AnalogInputDevice` to implement an interface for all ADC
     chips with a protocol similar to the Microchip MCP3xxx series of devices.
     """
+    _channels = 8
 
     def __init__(self, channel=0, bits=10, differential=False, max_voltage=3.3,
                  **spi_args):
         self._channel = channel
         self._differential = bool(differential)
+        self._tx = None
+        self._frames = ()
         super().__init__(bits, max_voltage, **spi_args)
+        # The channel and mode of the device are fixed for its lifetime so the
+        # command frame only needs calculating once, rather than on every read
+        self._tx = bytes(self._send())
+        self._frames = tuple(
+            bytes(self._send(channel)) for channel in range(self._channels))
+        self._mask = 2 ** bits - 1
 
     @property
     def channel(self):
@@ -206,12 +511,70 @@ class MCP3xxx(AnalogInputDevice):
         """
         return self._differential
 
+    def scan(self, channels=None):
+        """
+        Reads several channels of the ADC in a single session on the SPI bus,
+        returning a tuple of values scaled in the same manner as :attr:`value`.
+        The channels are read in the same mode (single-ended or differential)
+        as the device's own :attr:`channel`.
+
+        If *channels* is omitted, all channels of the chip are read. For
+        example, to read the first four channels of an :class:`MCP3008`::
+
+            from gpiozero import MCP3008
+
+            adc = MCP3008()
+            print(adc.scan((0, 1, 2, 3)))
+
+        :type channels: ~collections.abc.Iterable or None
+        :param channels:
+            The channels to read, in the order their values are to be
+            returned.
+        """
+        self._check_open()
+        if channels is None:
+            frames = self._frames
+        else:
+            frames = []
+            for channel in channels:
+                if not 0 <= channel < len(self._frames):
+                    raise SPIBadChannel(
+                        'channel must be between 0 and {max}'.format(
+                            max=len(self._frames) - 1))
+                frames.append(self._frames[channel])
+        return tuple(
+            (2 * (self._decode(data) - self._min_value) / self._range) - 1
+            for data in self._spi.transfer_many(frames)
+        )
+
+    def scan_values(self, channels=None):
+        """
+        An infinite iterator of tuples returned by :meth:`scan` for the
+        specified *channels*. This is intended for use as the
+        :attr:`~SourceMixin.source` of composite devices which accept a tuple
+        of values, e.g. :class:`RGBLED`::
+
+            from gpiozero import MCP3008, RGBLED
+
+            adc = MCP3008()
+            led = RGBLED(2, 3, 4)
+            led.source = adc.scan_values((0, 1, 2))
+        """
+        while True:
+            try:
+                yield self.scan(channels)
+            except DeviceClosed:
+                break
+
     def _read(self):
-        return self._words_to_int(
-            self._spi.transfer(self._send())[-2:], self.bits
-            )
+        return self._decode(self._spi.transfer(self._tx))
+
+    def _decode(self, data):
+        # The result always occupies the last two bytes received; this is
+        # equivalent to _words_to_int(data[-2:], self.bits) with 8-bit words
+        return (data[-2] << 8 | data[-1]) & self._mask
 
-    def _send(self):
+    def _send(self, channel=None):
         # MCP3004/08 protocol looks like the following:
         #
         #     Byte        0        1        2
@@ -239,13 +602,17 @@ class MCP3xxx(AnalogInputDevice):
         # The 3x01 variant of the chips always operates in differential mode
         # and effectively only has one channel (composed of an IN+ and IN-). As
         # such it requires no input, just output.
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b10000 | (not self.differential) << 3 | self.channel) << (self.bits + 2)
+            (0b10000 | (not self.differential) << 3 | channel) << (self.bits + 2)
             )
 
 
 class MCP3xx2(MCP3xxx):
-    def _send(self):
+    _channels = 2
+
+    def _send(self, channel=None):
         # MCP3002 protocol looks like the following:
         #
         #     Byte        0        1
@@ -271,8 +638,10 @@ class MCP3xx2(MCP3xxx):
         #
         # Read-out begins with a null bit (0) followed by the result bits (R).
         # All other bits are don't care (x).
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b1001 | (not self.differential) << 2 | self.channel << 1) << (self.bits + 1)
+            (0b1001 | (not self.differential) << 2 | channel << 1) << (self.bits + 1)
             )
 
 
@@ -307,19 +676,18 @@ class MCP33xx(MCP3xxx):
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         super().__init__(channel, 12, differential, max_voltage, **spi_args)
 
-    def _read(self):
-        if self.differential:
-            result = self._words_to_int(
-                self._spi.transfer(self._send())[-2:], self.bits + 1)
+    def _decode(self, data):
+        if self._differential:
+            result = (data[-2] << 8 | data[-1]) & 0x1fff
             # Account for the sign bit
             if result > 4095:
                 return -(8192 - result)
             else:
                 return result
         else:
-            return super()._read()
+            return (data[-2] << 8 | data[-1]) & 0xfff
 
-    def _send(self):
+    def _send(self, channel=None):
         # MCP3302/04 protocol looks like the following:
         #
         #     Byte        0        1        2
@@ -343,8 +711,10 @@ class MCP33xx(MCP3xxx):
         #
         # The MCP3301 variant operates similarly to the other MCP3x01 variants;
         # no input, just output and always differential.
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b10000 | (not self.differential) << 3 | self.channel) << (self.bits + 3)
+            (0b10000 | (not self.differential) << 3 | channel) << (self.bits + 3)
             )
 
     @property
@@ -378,16 +748,24 @@ class MCP3001(MCP30xx):
 
     .. _MCP3001: http://www.farnell.com/datasheets/630400.pdf
     """
+    _channels = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
         # MCP3001 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0RRRRR RRRRRxxx
-        return self._words_to_int(self._spi.read(2), 13) >> 3
+        #
+        # No input is required; the conversion starts when the device is
+        # selected
+        return [0, 0]
+
+    def _decode(self, data):
+        return ((data[0] << 8 | data[1]) & 0x1fff) >> 3
 
 
 class MCP3002(MCP30xx, MCP3xx2):
@@ -410,6 +788,8 @@ class MCP3004(MCP30xx):
 
     .. _MCP3004: http://www.farnell.com/datasheets/808965.pdf
     """
+    _channels = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 3')
@@ -437,16 +817,21 @@ class MCP3201(MCP32xx):
 
     .. _MCP3201: http://www.farnell.com/datasheets/1669366.pdf
     """
+    _channels = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
         # MCP3201 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0RRRRR RRRRRRRx
-        return self._words_to_int(self._spi.read(2), 13) >> 1
+        return [0, 0]
+
+    def _decode(self, data):
+        return ((data[0] << 8 | data[1]) & 0x1fff) >> 1
 
 
 class MCP3202(MCP32xx, MCP3xx2):
@@ -469,6 +854,8 @@ class MCP3204(MCP32xx):
 
     .. _MCP3204: http://www.farnell.com/datasheets/808967.pdf
     """
+    _channels = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 3')
@@ -496,21 +883,21 @@ class MCP3301(MCP33xx):
 
     .. _MCP3301: http://www.farnell.com/datasheets/1669397.pdf
     """
+    _channels = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
         # MCP3301 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0SRRRR RRRRRRRR
-        result = self._words_to_int(self._spi.read(2), 13)
-        # Account for the sign bit
-        if result > 4095:
-            return -(8192 - result)
-        else:
-            return result
+        #
+        # The result is decoded identically to the differential mode of the
+        # other MCP33xx chips
+        return [0, 0]
 
 
 class MCP3302(MCP33xx):
@@ -523,6 +910,8 @@ class MCP3302(MCP33xx):
 
     .. _MCP3302: http://www.farnell.com/datasheets/1486116.pdf
     """
+    _channels = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 4')
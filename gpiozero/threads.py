@@ -7,45 +7,154 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from threading import Thread, Event
+from time import sleep as _sleep, monotonic
+from threading import Thread, Event, current_thread
 
 from .exc import ZombieThread
 
 
 _THREADS = set()
 
+# The clock that GPIOThread, GPIOEvent, and sleep() defer to for timing. This
+# is None (meaning real time) unless a MockFactory operating in virtual time
+# has installed its clock with _set_clock
+_CLOCK = None
 
-def _threads_shutdown():
-    while _THREADS:
-        threads = _THREADS.copy()
+
+def _threads_shutdown(timeout=10):
+    """
+    Stops all running :class:`GPIOThread` instances, waiting no longer than
+    *timeout* seconds in total. Returns a list of the threads which failed to
+    terminate in that time.
+    """
+    deadline = monotonic() + timeout
+    stragglers = []
+    while True:
+        threads = _THREADS.difference(stragglers)
+        if not threads:
+            break
         # Optimization: instead of calling stop() which implicitly calls
         # join(), set all the stopping events simultaneously, *then* join
-        # threads with a reasonable timeout
+        # threads against a single deadline (so the total wait is bounded by
+        # the timeout, not the timeout multiplied by the number of threads)
         for t in threads:
             t.stopping.set()
         for t in threads:
-            t.join(10)
+            try:
+                t.join(max(0, deadline - monotonic()))
+            except ZombieThread:
+                stragglers.append(t)
+    return stragglers
+
+
+def _set_clock(clock):
+    global _CLOCK
+    old_clock, _CLOCK = _CLOCK, clock
+    return old_clock
+
+
+def _now():
+    """
+    Returns the current time, in seconds, of the installed virtual clock (if
+    any) or of :func:`time.monotonic` otherwise.
+    """
+    clock = _CLOCK
+    if clock is None:
+        return monotonic()
+    else:
+        return clock.time
+
+
+def sleep(delay):
+    """
+    Equivalent to :func:`time.sleep` unless a virtual clock is installed, in
+    which case the delay is measured by that clock instead.
+    """
+    clock = _CLOCK
+    if clock is None:
+        _sleep(delay)
+    else:
+        clock.sleep(delay)
+
+
+class GPIOEvent(Event):
+    """
+    Extends :class:`threading.Event`. Timed waits on this event are measured
+    by the installed virtual clock (if any) instead of in real time.
+    """
+    def set(self):
+        super().set()
+        clock = _CLOCK
+        if clock is not None:
+            clock.notify()
+
+    def wait(self, timeout=None):
+        clock = _CLOCK
+        if clock is None:
+            return super().wait(timeout)
+        else:
+            return clock.wait_for(self.is_set, timeout)
+
+
+class _WakingEvent(GPIOEvent):
+    # A stopping event for a GPIOThread that spends its time waiting on some
+    # other *wake* event; setting it also sets *wake*, so the thread need only
+    # ever wait on the latter
+    def __init__(self, wake):
+        super().__init__()
+        self._wake = wake
+
+    def set(self):
+        super().set()
+        self._wake.set()
 
 
 class GPIOThread(Thread):
     def __init__(self, target, args=(), kwargs=None, name=None):
         if kwargs is None:
             kwargs = {}
-        self.stopping = Event()
+        self.stopping = GPIOEvent()
+        self._clock = None
         super().__init__(None, target, name, args, kwargs)
         self.daemon = True
 
     def start(self):
         self.stopping.clear()
         _THREADS.add(self)
+        # Threads started under a virtual clock count as busy (preventing the
+        # clock from advancing) until they wait on it, or terminate
+        self._clock = _CLOCK
+        if self._clock is not None:
+            self._clock.add_thread(self)
         super().start()
 
+    def run(self):
+        try:
+            super().run()
+        finally:
+            if self._clock is not None:
+                self._clock.remove_thread(self)
+
     def stop(self, timeout=10):
         self.stopping.set()
         self.join(timeout)
 
     def join(self, timeout=None):
-        super().join(timeout)
+        real_timeout = timeout
+        clock = self._clock
+        if (
+            clock is not None and not clock.closed and
+            self is not current_thread()
+        ):
+            # Under a virtual clock the timeout is measured by the clock. Once
+            # the thread has left the clock it has (all but) finished, so the
+            # real join below is brief; if it hasn't, don't wait in real time
+            # as well
+            finished = clock.wait_for(
+                lambda: not clock.has_thread(self), timeout)
+            if not (finished or clock.closed):
+                real_timeout = 0
+        super().join(real_timeout)
         if self.is_alive():
             assert timeout is not None
             # timeout can't be None here because if it was, then join()
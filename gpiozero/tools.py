@@ -9,12 +9,12 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from random import random
-from time import sleep
 from itertools import cycle
 from math import sin, cos, pi, isclose
 from statistics import mean
 
 from .mixins import ValuesMixin
+from .threads import sleep
 
 
 def _normalize(values):
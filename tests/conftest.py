@@ -49,6 +49,17 @@ def mock_factory(request):
             Device.pin_factory.reset()
         Device.pin_factory = save_factory
 
+@pytest.fixture(scope='function')
+def virtual_factory(request):
+    save_factory = Device.pin_factory
+    Device.pin_factory = MockFactory(virtual_time=True)
+    try:
+        yield Device.pin_factory
+    finally:
+        Device.pin_factory.reset()
+        Device.pin_factory.close()
+        Device.pin_factory = save_factory
+
 @pytest.fixture()
 def pwm(request, mock_factory):
     mock_factory.pin_class = MockPWMPin
@@ -23,6 +23,7 @@ from unittest import mock
 
 from gpiozero import *
 from gpiozero.fonts import *
+from gpiozero.pins.mock import MockPin
 
 
 def test_composite_output_on_off(mock_factory):
@@ -63,6 +64,49 @@ def test_composite_output_value(mock_factory):
         assert not device[1].is_active
         assert device[2].is_active
 
+def test_composite_output_group_writes(mock_factory):
+    writes = []
+    class MockBankPin(MockPin):
+        def _bank_writers(self):
+            def write(state, mask):
+                writes.append((state, mask))
+                for pin in self.factory.pins.values():
+                    if mask & (1 << pin.number):
+                        pin._set_state(state)
+            return (
+                'bank', 1 << self.number,
+                lambda mask: write(True, mask),
+                lambda mask: write(False, mask),
+            )
+    pins = [mock_factory.pin(n, pin_class=MockBankPin) for n in (2, 3, 4)]
+    with LEDBoard(2, 3, 4) as board:
+        writes.clear()
+        board.on()
+        assert writes == [(True, 0b11100)]
+        assert all(pin.state for pin in pins)
+        writes.clear()
+        board.value = (0, 1, 0)
+        assert writes == [(True, 0b1000), (False, 0b10100)]
+        assert board.value == (0, 1, 0)
+        board[1].blink()
+        writes.clear()
+        board.off()
+        assert writes == [(False, 0b11100)]
+        assert board[1]._blink_thread is None
+        board.blink(0.1, 0.1, n=2, background=False)
+        assert writes[1:] == [(True, 0b11100), (False, 0b11100)] * 2
+    writes.clear()
+    with LEDBoard(2, 3, 4, active_high=False) as board:
+        board.value = (1, 0, 0)
+        assert writes[-2:] == [(True, 0b11000), (False, 0b100)]
+    # Mixed pins can't be written as a group
+    pins[2] = mock_factory.pin(5)
+    with LEDBoard(2, 3, 5) as board:
+        writes.clear()
+        board.on()
+        assert writes == []
+        assert all(pin.state for pin in pins)
+
 def test_button_board_bad_init(mock_factory):
     with pytest.raises(GPIOPinMissing):
         ButtonBoard()
@@ -1660,7 +1704,7 @@ def test_led_multichar_display_value(mock_factory):
                 char_checked.wait(0.1)
                 char_checked.clear()
                 return stop.wait(0)
-            with mock.patch('gpiozero.threads.Event') as event_mock:
+            with mock.patch('gpiozero.threads.GPIOEvent') as event_mock:
                 event_mock().wait.side_effect = my_wait
                 event_mock().set.side_effect = my_set
                 multichar.value = 'GPIO'
@@ -8,10 +8,15 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import gc
+import sys
 import warnings
+import subprocess
 import pytest
 import errno
 from unittest import mock
+from threading import Event, current_thread
+from time import monotonic
 
 from gpiozero import *
 from gpiozero.pins.mock import MockFactory
@@ -95,6 +100,44 @@ def test_device_init_twice_different_pin(mock_factory):
         with GPIODevice(3) as device2:
             pass
 
+def test_device_reservations(mock_factory):
+    with GPIODevice(2) as device, GPIODevice(3) as device2:
+        assert mock_factory._reservations.pins(device) == {2}
+        assert mock_factory._reservations.reservers(2) == [device]
+        assert set(mock_factory._reservations.reservers()) == {device, device2}
+    assert not mock_factory._reservations
+    assert mock_factory._reservations.reservers() == []
+
+def test_device_reservations_release_all(mock_factory):
+    class Reserver:
+        def _conflicts_with(self, other):
+            return True
+    reserver = Reserver()
+    mock_factory.reserve_pins(reserver, 2, 3, 4)
+    mock_factory.release_pins(reserver, 3, 5)
+    assert mock_factory._reservations.pins(reserver) == {2, 4}
+    with pytest.raises(GPIOPinInUse):
+        GPIODevice(2)
+    with GPIODevice(3):
+        pass
+    mock_factory.release_all(reserver)
+    assert not mock_factory._reservations
+    with GPIODevice(2):
+        pass
+
+def test_device_reservations_collected(mock_factory):
+    class Reserver:
+        def _conflicts_with(self, other):
+            return True
+    reserver = Reserver()
+    mock_factory.reserve_pins(reserver, 2, 3)
+    assert set(mock_factory._reservations) == {2, 3}
+    del reserver
+    gc.collect()
+    assert not mock_factory._reservations
+    with GPIODevice(2):
+        pass
+
 def test_device_close(mock_factory):
     device = GPIODevice(2)
     # Don't use "with" here; we're testing close explicitly
@@ -144,6 +187,18 @@ def test_device_unknown_attr(mock_factory):
         with pytest.raises(AttributeError):
             device.foo = 1
 
+def test_device_attrs_cached(mock_factory):
+    with GPIODevice(2) as dev1, GPIODevice(3) as dev2:
+        assert dev1.__attrs__ is dev2.__attrs__
+        dev1._active_state = False
+        assert dev1._active_state is False
+        with pytest.raises(AttributeError):
+            dev2.foo = 1
+    with LED(4) as led:
+        assert led.__attrs__ is not dev1.__attrs__
+        led.active_high = False
+        assert not led.active_high
+
 def test_device_broken_attr(mock_factory):
     with GPIODevice(2) as device:
         del device._active_state
@@ -218,3 +273,141 @@ def test_shutdown(mock_factory):
     assert Device.pin_factory is None
     # Shutdown must be idempotent
     _shutdown()
+
+def test_shutdown_concurrent(mock_factory):
+    from gpiozero.devices import _shutdown
+    leds = [LED(n) for n in range(2, 20)]
+    for led in leds[::2]:
+        led.blink(0.01, 0.01)
+    f = Device.pin_factory
+    _shutdown()
+    assert all(led.closed for led in leds)
+    assert not f.pins
+    assert Device.pin_factory is None
+
+def test_shutdown_groups(mock_factory):
+    from gpiozero.devices import _shutdown_groups
+    class Reserver:
+        def _conflicts_with(self, other):
+            return False
+    r1, r2, r3, r4 = Reserver(), Reserver(), Reserver(), Reserver()
+    mock_factory.reserve_pins(r1, 2, 3)
+    mock_factory.reserve_pins(r2, 4)
+    mock_factory.reserve_pins(r3, 3, 5)
+    mock_factory.reserve_pins(r4, 5)
+    groups = _shutdown_groups(mock_factory._reservations)
+    assert sorted(len(group) for group in groups) == [1, 3]
+    assert {id(r) for group in groups for r in group} == {
+        id(r1), id(r2), id(r3), id(r4)}
+
+def test_shutdown_stragglers(mock_factory):
+    from gpiozero.devices import _shutdown
+    from gpiozero.threads import GPIOThread
+    release = Event()
+    t = GPIOThread(release.wait)
+    t.start()
+    try:
+        with warnings.catch_warnings(record=True) as w:
+            warnings.resetwarnings()
+            _shutdown(timeout=0.1)
+            assert len(w) == 1
+            assert w[0].category == ShutdownTimeout
+        assert Device.pin_factory is None
+    finally:
+        release.set()
+        t.join(1)
+
+class ShutdownReserver:
+    def __init__(self, close):
+        self._close = close
+        self.closed = False
+    def _conflicts_with(self, other):
+        return False
+    def close(self):
+        self._close()
+        self.closed = True
+
+def test_shutdown_close_fails(mock_factory, capsys):
+    from gpiozero.devices import _devices_shutdown
+    def fail():
+        raise RuntimeError('close failed')
+    r1 = ShutdownReserver(fail)
+    r2 = ShutdownReserver(lambda: None)
+    mock_factory.reserve_pins(r1, 2)
+    mock_factory.reserve_pins(r2, 2)
+    assert _devices_shutdown() == [r1]
+    assert r2.closed
+    assert 'close failed' in capsys.readouterr().err
+    assert Device.pin_factory is None
+
+def test_shutdown_single_group_timeout(mock_factory):
+    from gpiozero.devices import _devices_shutdown
+    release = Event()
+    r1 = ShutdownReserver(release.wait)
+    mock_factory.reserve_pins(r1, 2)
+    try:
+        with mock.patch.object(mock_factory, 'close') as close:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.resetwarnings()
+                start = monotonic()
+                assert _devices_shutdown(timeout=0.1) == [r1]
+                assert monotonic() - start < 1
+            # The factory is left open beneath the device still closing
+            assert len(w) == 1
+            assert w[0].category == ShutdownTimeout
+            assert not close.called
+        assert Device.pin_factory is None
+    finally:
+        release.set()
+
+def test_shutdown_sequential(mock_factory):
+    from gpiozero.devices import _devices_shutdown
+    threads = set()
+    reservers = [
+        ShutdownReserver(lambda: threads.add(current_thread()))
+        for i in range(4)]
+    for pin, reserver in enumerate(reservers, start=2):
+        mock_factory.reserve_pins(reserver, pin)
+    # Factories which don't permit concurrent closes have their devices
+    # closed one after another
+    mock_factory._concurrent_close = False
+    with mock.patch.object(mock_factory, 'close') as close:
+        assert _devices_shutdown() == []
+        assert close.called
+    assert all(reserver.closed for reserver in reservers)
+    assert len(threads) == 1
+
+def test_lazy_exports():
+    import gpiozero
+    assert 'LED' in dir(gpiozero)
+    assert 'LED' in gpiozero.__all__
+    assert 'BadEventHandler' in gpiozero.__all__
+    assert gpiozero.LED is LED
+    with pytest.raises(AttributeError):
+        gpiozero.NoSuchDevice
+    # Importing the package (or a single device) mustn't import the other
+    # device modules, or the board tables
+    modules = subprocess.run([
+        sys.executable, '-c',
+        'import sys; from gpiozero import Button; '
+        'print(" ".join(sorted(sys.modules)))'
+    ], check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    modules = set(modules.stdout.split())
+    assert 'gpiozero.input_devices' in modules
+    assert not modules & {
+        'gpiozero.output_devices', 'gpiozero.boards', 'gpiozero.spi_devices',
+        'gpiozero.internal_devices', 'gpiozero.pins.data', 'inspect'}
+
+def test_lazy_submodules():
+    # The submodules the package imports on first access are still reachable
+    # as attributes after a bare import
+    subprocess.run([
+        sys.executable, '-c',
+        'import gpiozero; '
+        'assert "tones" in dir(gpiozero); '
+        'gpiozero.tones.Tone; gpiozero.boards.LEDBoard; '
+        'gpiozero.input_devices.Button; gpiozero.output_devices.LED; '
+        'gpiozero.spi_devices.MCP3008; '
+        'gpiozero.internal_devices.CPUTemperature; '
+        'gpiozero.fonts.load_font_7seg; gpiozero.pins.data.pi_info'
+    ], check=True)
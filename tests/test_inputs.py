@@ -13,6 +13,7 @@ import sys
 import pytest
 import warnings
 from time import sleep
+from math import isclose
 from threading import Event
 from functools import partial
 from unittest import mock
@@ -233,6 +234,20 @@ def test_input_button_hold(mock_factory):
         evt.clear()
         assert not evt.wait(0.1)
 
+def test_input_button_hold_virtual_time(virtual_factory):
+    pin = virtual_factory.pin(2)
+    held = []
+    with Button(2, hold_time=5, hold_repeat=True) as button:
+        button.when_held = lambda: held.append(button.pin_factory.ticks())
+        virtual_factory.clock.sleep(1)
+        pin.drive_low()
+        virtual_factory.clock.sleep(12)
+        assert held == [6, 11]
+        assert button.held_time == 7
+        pin.drive_high()
+        virtual_factory.clock.sleep(10)
+        assert held == [6, 11]
+
 def test_input_line_sensor(mock_factory):
     pin = mock_factory.pin(4)
     with LineSensor(4) as sensor:
@@ -299,6 +314,17 @@ def test_input_distance_sensor(mock_factory):
         assert sensor.max_distance == 20
         assert sensor.threshold_distance == 0.1
 
+def test_input_distance_sensor_virtual_time(virtual_factory):
+    echo_pin = virtual_factory.pin(4)
+    trig_pin = virtual_factory.pin(5, pin_class=MockTriggerPin,
+                                   echo_pin=echo_pin, echo_time=0.001)
+    with DistanceSensor(4, 5, queue_len=5, max_distance=1) as sensor:
+        # 1ms of echo (there and back) is ~17cm at the speed of sound
+        assert isclose(sensor.distance, 0.17163, abs_tol=1e-6)
+        trig_pin.echo_time = 0.002
+        virtual_factory.clock.sleep(1)
+        assert isclose(sensor.distance, 0.34326, abs_tol=1e-6)
+
 def test_input_distance_sensor_edge_cases(mock_factory):
     echo_pin = mock_factory.pin(4)
     trig_pin = mock_factory.pin(5)  # note: normal pin
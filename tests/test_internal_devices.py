@@ -9,19 +9,22 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import errno
+import os
+import socket
 import warnings
 from posix import statvfs_result
 from subprocess import CalledProcessError
-from threading import Event
+from threading import Event, Thread
+from collections import deque
+from time import sleep
 from unittest import mock
 
 import pytest
 
 from gpiozero import *
+from gpiozero.internal_devices import _POLLER, _PINGER
 from datetime import datetime, time
 
-file_not_found = IOError(errno.ENOENT, 'File not found')
 bad_ping = CalledProcessError(1, 'returned non-zero exit status 1')
 
 
@@ -150,26 +153,160 @@ def test_polled_events(mock_factory):
 
 def test_polled_event_start_stop(mock_factory):
     with TimeOfDay(time(7), time(8)) as tod:
-        assert not tod._event_thread
+        assert tod not in _POLLER
         tod.when_activated = lambda: True
-        assert tod._event_thread
+        assert tod in _POLLER
         tod.when_deactivated = lambda: True
-        assert tod._event_thread
+        assert tod in _POLLER
         tod.when_activated = None
-        assert tod._event_thread
+        assert tod in _POLLER
         tod.when_deactivated = None
-        assert not tod._event_thread
+        assert tod not in _POLLER
+
+def test_polled_shared_thread(mock_factory, sys_file):
+    with TimeOfDay(time(7), time(8), event_delay=0.01) as tod, \
+            CPUTemperature(sys_file('37000\n'), event_delay=0.02) as cpu:
+        activated = Event()
+        with mock.patch('gpiozero.internal_devices.datetime') as dt:
+            dt.utcnow.return_value = datetime(2018, 1, 1, 0, 0, 0)
+            tod.when_activated = activated.set
+            cpu.when_activated = lambda: True
+            thread = _POLLER._thread
+            assert thread is not None
+            dt.utcnow.return_value = datetime(2018, 1, 1, 7, 1, 0)
+            assert activated.wait(1)
+            assert _POLLER._thread is thread
+            tod.when_activated = None
+            assert _POLLER._thread is thread
+            cpu.when_activated = None
+            assert _POLLER._thread is None
+            assert not thread.is_alive()
+
+def test_polled_close_during_poll(mock_factory, sys_file, capsys):
+    # Another polled device keeps the poller's thread running throughout
+    with TimeOfDay(time(7), time(8), event_delay=0.01) as tod, \
+            CPUTemperature(sys_file('37000\n'), event_delay=0.01) as cpu:
+        cpu.when_activated = lambda: True
+        polling = Event()
+        release = Event()
+        activated = []
+        def utcnow():
+            if not release.is_set() and tod in _POLLER:
+                polling.set()
+                release.wait(1)
+            return datetime(2018, 1, 1, 7, 1, 0)
+        def on_activated():
+            activated.append(tod.closed)
+        with mock.patch('gpiozero.internal_devices.datetime') as dt:
+            dt.utcnow.return_value = datetime(2018, 1, 1, 0, 0, 0)
+            tod._fire_events(tod.pin_factory.ticks(), tod.is_active)
+            dt.utcnow.side_effect = utcnow
+            tod.when_activated = on_activated
+            assert polling.wait(1)
+            # Closing the device mid-poll waits for the poll to finish...
+            closer = Thread(target=tod.close)
+            closer.start()
+            closer.join(0.1)
+            assert closer.is_alive()
+            release.set()
+            closer.join(1)
+            assert not closer.is_alive()
+            # ...so its events fire before close() returns, and never after
+            assert activated == [False]
+            assert tod not in _POLLER
+            assert cpu in _POLLER
+        cpu.when_activated = None
+    assert capsys.readouterr().err == ''
+
+def test_polled_read_cache(mock_factory, sys_file):
+    filename = sys_file('37000\n')
+    with CPUTemperature(filename, min_temp=30, max_temp=40, threshold=38) as cpu:
+        cpu._read_ttl = 60
+        with mock.patch('os.preadv', side_effect=os.preadv) as preadv:
+            cpu._read_cache = None
+            assert cpu.temperature == 37.0
+            assert cpu.value == 0.7
+            assert not cpu.is_active
+            assert preadv.call_count == 1
+            cpu._read_cache = None
+            assert cpu.temperature == 37.0
+            assert preadv.call_count == 2
+            # Every read re-uses the same buffer
+            assert preadv.call_args_list[0][0][1][0] is \
+                preadv.call_args_list[1][0][1][0]
 
 def test_pingserver_bad_init(mock_factory):
     with pytest.raises(TypeError):
          PingServer()
 
-def test_pingserver_init(mock_factory):
+def resolve(self):
+    # Stands in for PingServer._resolve, so that no test performs a real
+    # lookup; hosts in the .invalid domain fail to resolve
+    if self.host.endswith('.invalid'):
+        return None
+    elif ':' in self.host:
+        return socket.AF_INET6, (self.host, 0, 0, 0)
+    else:
+        return socket.AF_INET, (self.host, 0)
+
+class EchoSocket:
+    # Stands in for an ICMP socket, replying to the echo requests sent to the
+    # local host (and ignoring all others)
+    replies = {socket.AF_INET: 0, socket.AF_INET6: 129}
+
+    def __init__(self, family, kind, proto):
+        self.family = family
+        self.sent = []
+        self.received = deque()
+
+    def setblocking(self, flag):
+        pass
+
+    def close(self):
+        pass
+
+    def sendto(self, packet, address):
+        self.sent.append(address)
+        if address[0] in ('127.0.0.1', 'localhost', '::1'):
+            self.received.append(
+                (bytes([self.replies[self.family]]) + packet[1:], address))
+
+    def recvfrom(self, size):
+        try:
+            return self.received.popleft()
+        except IndexError:
+            raise BlockingIOError()
+
+def select(rlist, wlist, xlist, timeout):
+    ready = [sock for sock in rlist if sock.received]
+    if not ready:
+        sleep(timeout)
+    return ready, [], []
+
+@pytest.fixture()
+def no_icmp():
+    with mock.patch.object(_PINGER, 'socket', return_value=None), \
+            mock.patch.object(PingServer, '_resolve', resolve):
+        yield
+
+@pytest.fixture()
+def icmp():
+    with mock.patch('socket.socket', EchoSocket), \
+            mock.patch('select.select', select), \
+            mock.patch.object(PingServer, '_resolve', resolve):
+        _PINGER.acquire()
+        try:
+            yield _PINGER
+        finally:
+            _PINGER.release()
+
+def test_pingserver_init(mock_factory, no_icmp):
     with mock.patch('gpiozero.internal_devices.subprocess') as sp:
         sp.check_call.return_value = True
         with PingServer('example.com') as server:
             assert repr(server).startswith('<gpiozero.PingServer object')
             assert server.host == 'example.com'
+            assert server.timeout == 1.0
         assert repr(server) == '<gpiozero.PingServer object closed>'
         with PingServer('192.168.1.10') as server:
             assert server.host == '192.168.1.10'
@@ -178,98 +315,217 @@ def test_pingserver_init(mock_factory):
         with PingServer('2001:4860:4860::8888') as server:
             assert server.host == '2001:4860:4860::8888'
 
-def test_pingserver_value(mock_factory):
+def test_pingserver_value(mock_factory, no_icmp):
     with mock.patch('gpiozero.internal_devices.subprocess.check_call') as check_call:
         with PingServer('example.com') as server:
             assert server.is_active
+            assert server.rtt is not None
             check_call.side_effect = bad_ping
             assert not server.is_active
+            assert server.rtt is None
             check_call.side_effect = None
             assert server.is_active
+            assert check_call.call_args[0][0] == [
+                'ping', '-c1', '-W', '1', 'example.com']
+
+def test_pingserver_localhost(mock_factory, icmp):
+    with PingServer('127.0.0.1') as server:
+        assert server.is_active
+        assert 0 < server.rtt < 1
+    with PingServer('nonexistent.invalid') as server:
+        assert not server.is_active
+        assert server.rtt is None
+
+def test_pingserver_ipv6(mock_factory, icmp):
+    with PingServer('::1') as server:
+        assert server.is_active
+        # The request is sent from the socket for the address's family alone
+        sock = icmp.socket(socket.AF_INET6)
+        assert set(sock._sock.sent) == {('::1', 0, 0, 0)}
+        assert list(icmp._sockets) == [socket.AF_INET6]
+
+def test_pingserver_no_reply(mock_factory, icmp):
+    from gpiozero.internal_devices import _PingRequest
+    sock = icmp.socket()
+    assert sock.wait(_PingRequest(0), 0.05) is None
 
-def test_cputemperature_bad_init(mock_factory):
-    with mock.patch('io.open', mock.mock_open()) as m:
-        m.side_effect = file_not_found
-        with pytest.raises(IOError):
-            with CPUTemperature('') as temp:
-                temp.value
-        with pytest.raises(IOError):
-            with CPUTemperature('badfile') as temp:
-                temp.value
-        m.return_value.__enter__.return_value.readline.return_value = '37000'
-        with pytest.raises(ValueError):
-            CPUTemperature(min_temp=100)
-        with pytest.raises(ValueError):
-            CPUTemperature(min_temp=10, max_temp=10)
-        with pytest.raises(ValueError):
-            CPUTemperature(min_temp=20, max_temp=10)
-
-def test_cputemperature(mock_factory):
-    with mock.patch('io.open', mock.mock_open(read_data='37000')) as m:
-        with CPUTemperature() as cpu:
-            assert repr(cpu).startswith('<gpiozero.CPUTemperature object')
+def test_pingserver_events(mock_factory, icmp):
+    with PingServer('127.0.0.1', event_delay=0.01) as server1, \
+            PingServer('localhost', event_delay=0.01) as server2:
+        polled = {server1: Event(), server2: Event()}
+        begin_poll = PingServer._begin_poll
+        def spy(self):
+            begin_poll(self)
+            polled[self].set()
+        with mock.patch.object(PingServer, '_begin_poll', spy):
+            server1.when_deactivated = lambda: None
+            server2.when_deactivated = lambda: None
+            assert polled[server1].wait(1)
+            assert polled[server2].wait(1)
+            server1.when_deactivated = None
+            server2.when_deactivated = None
+        assert server1.is_active and server2.is_active
+
+def test_icmp_checksum():
+    from gpiozero.internal_devices import _icmp_checksum
+    assert _icmp_checksum(b'\x08\x00\x00\x00\x12\x34\x00\x01') == 0xe5ca
+    assert _icmp_checksum(b'\x08\x00\x00\x00\x12\x34\x00') == 0xe5cb
+
+@pytest.fixture()
+def sys_file(tmp_path):
+    def create(content, name='sys_file'):
+        path = tmp_path / name
+        path.write_text(content)
+        return str(path)
+    return create
+
+def test_cputemperature_bad_init(mock_factory, sys_file):
+    with pytest.raises(IOError):
+        with CPUTemperature('') as temp:
+            temp.value
+    with pytest.raises(IOError):
+        with CPUTemperature('badfile') as temp:
+            temp.value
+    with pytest.raises(IOError):
+        with CPUTemperature([sys_file('37000\n'), 'badfile']) as temp:
+            temp.value
+    filename = sys_file('37000\n')
+    with pytest.raises(ValueError):
+        CPUTemperature(filename, min_temp=100)
+    with pytest.raises(ValueError):
+        CPUTemperature(filename, min_temp=10, max_temp=10)
+    with pytest.raises(ValueError):
+        CPUTemperature(filename, min_temp=20, max_temp=10)
+
+def test_cputemperature(mock_factory, sys_file):
+    filename = sys_file('37000\n')
+    with CPUTemperature(filename) as cpu:
+        assert repr(cpu).startswith('<gpiozero.CPUTemperature object')
+        assert cpu.sensor_file == filename
+        assert cpu.temperature == 37.0
+        assert cpu.temperatures == (37.0,)
+        assert cpu.value == 0.37
+    assert repr(cpu) == '<gpiozero.CPUTemperature object closed>'
+    with warnings.catch_warnings(record=True) as w:
+        warnings.resetwarnings()
+        with CPUTemperature(filename, min_temp=30, max_temp=40) as cpu:
+            assert cpu.value == 0.7
+            assert not cpu.is_active
+        assert len(w) == 1
+        assert w[0].category == ThresholdOutOfRange
+        assert cpu.temperature == 37.0
+    with CPUTemperature(filename, min_temp=30, max_temp=40, threshold=35) as cpu:
+        assert cpu.is_active
+
+def test_cputemperature_persistent(mock_factory, sys_file):
+    filename = sys_file('37000\n')
+    with CPUTemperature(filename) as cpu:
+        cpu._read_ttl = 0
+        with mock.patch('os.open', side_effect=os.open) as os_open:
             assert cpu.temperature == 37.0
-            assert cpu.value == 0.37
-        assert repr(cpu) == '<gpiozero.CPUTemperature object closed>'
-        with warnings.catch_warnings(record=True) as w:
-            warnings.resetwarnings()
-            with CPUTemperature(min_temp=30, max_temp=40) as cpu:
-                assert cpu.value == 0.7
-                assert not cpu.is_active
+            with open(filename, 'w') as f:
+                f.write('45500\n')
+            assert cpu.temperature == 45.5
+            assert os_open.call_count == 0
+            cpu.sensor_file = sys_file('50000\n', 'other')
+            assert cpu.temperature == 50.0
+            assert os_open.call_count == 1
+
+def test_cputemperature_zones(mock_factory, sys_file):
+    filenames = [
+        sys_file('37000\n', 'zone0'),
+        sys_file('52000\n', 'zone1'),
+        sys_file('41000\n', 'zone2'),
+    ]
+    with CPUTemperature(filenames, threshold=50) as cpu:
+        assert cpu.sensor_file == filenames
+        assert cpu.temperatures == (37.0, 52.0, 41.0)
+        assert cpu.temperature == 52.0
+        assert cpu.is_active
+
+def test_loadaverage_bad_init(mock_factory, sys_file):
+    with pytest.raises(IOError):
+        with LoadAverage('') as load:
+            load.value
+    with pytest.raises(IOError):
+        with LoadAverage('badfile') as load:
+            load.value
+    filename = sys_file('0.09 0.10 0.09 1/292 20758\n')
+    with pytest.raises(ValueError):
+        LoadAverage(filename, min_load_average=1)
+    with pytest.raises(ValueError):
+        LoadAverage(filename, min_load_average=0.5, max_load_average=0.5)
+    with pytest.raises(ValueError):
+        LoadAverage(filename, min_load_average=1, max_load_average=0.5)
+    with pytest.raises(ValueError):
+        LoadAverage(filename, minutes=0)
+    with pytest.raises(ValueError):
+        LoadAverage(filename, minutes=10)
+
+def test_loadaverage(mock_factory, sys_file):
+    filename = sys_file('0.09 0.10 0.09 1/292 20758\n')
+    with LoadAverage(filename) as la:
+        assert repr(la).startswith('<gpiozero.LoadAverage object')
+        assert la.load_average_file == filename
+        assert la.min_load_average == 0
+        assert la.max_load_average == 1
+        assert la.threshold == 0.8
+        assert la.load_average == 0.1
+        assert la.value == 0.1
+        assert not la.is_active
+    assert repr(la) == '<gpiozero.LoadAverage object closed>'
+    filename = sys_file('1.72 1.40 1.31 3/457 23102\n')
+    with LoadAverage(filename, min_load_average=0.5, max_load_average=2,
+                     threshold=1, minutes=5) as la:
+        assert la.min_load_average == 0.5
+        assert la.max_load_average == 2
+        assert la.threshold == 1
+        assert la.load_average == 1.4
+        assert la.value == 0.6
+        assert la.is_active
+    with warnings.catch_warnings(record=True) as w:
+        warnings.resetwarnings()
+        with LoadAverage(filename, min_load_average=1, max_load_average=2,
+                         threshold=0.8, minutes=5) as la:
             assert len(w) == 1
             assert w[0].category == ThresholdOutOfRange
-            assert cpu.temperature == 37.0
-        with CPUTemperature(min_temp=30, max_temp=40, threshold=35) as cpu:
-            assert cpu.is_active
-
-def test_loadaverage_bad_init(mock_factory):
-    with mock.patch('io.open', mock.mock_open()) as m:
-        m.side_effect = file_not_found
-        with pytest.raises(IOError):
-            with LoadAverage('') as load:
-                load.value
-        with pytest.raises(IOError):
-            with LoadAverage('badfile') as load:
-                load.value
-    with mock.patch('io.open', mock.mock_open(read_data='0.09 0.10 0.09 1/292 20758')):
-        with pytest.raises(ValueError):
-            LoadAverage(min_load_average=1)
-        with pytest.raises(ValueError):
-            LoadAverage(min_load_average=0.5, max_load_average=0.5)
-        with pytest.raises(ValueError):
-            LoadAverage(min_load_average=1, max_load_average=0.5)
-        with pytest.raises(ValueError):
-            LoadAverage(minutes=0)
-        with pytest.raises(ValueError):
-            LoadAverage(minutes=10)
-
-def test_loadaverage(mock_factory):
-    with mock.patch('io.open', mock.mock_open(read_data='0.09 0.10 0.09 1/292 20758')):
-        with LoadAverage() as la:
-            assert repr(la).startswith('<gpiozero.LoadAverage object')
-            assert la.min_load_average == 0
-            assert la.max_load_average == 1
-            assert la.threshold == 0.8
-            assert la.load_average == 0.1
-            assert la.value == 0.1
-            assert not la.is_active
-        assert repr(la) == '<gpiozero.LoadAverage object closed>'
-    with mock.patch('io.open', mock.mock_open(read_data='1.72 1.40 1.31 3/457 23102')):
-        with LoadAverage(min_load_average=0.5, max_load_average=2,
-                         threshold=1, minutes=5) as la:
-            assert la.min_load_average == 0.5
-            assert la.max_load_average == 2
-            assert la.threshold == 1
             assert la.load_average == 1.4
-            assert la.value == 0.6
-            assert la.is_active
-        with warnings.catch_warnings(record=True) as w:
-            warnings.resetwarnings()
-            with LoadAverage(min_load_average=1, max_load_average=2,
-                         threshold=0.8, minutes=5) as la:
-                assert len(w) == 1
-                assert w[0].category == ThresholdOutOfRange
-                assert la.load_average == 1.4
+    assert la.load_average == 1.4
+
+def test_loadaverage_persistent(mock_factory, sys_file):
+    filename = sys_file('0.09 0.10 0.09 1/292 20758\n')
+    with LoadAverage(filename, minutes=1) as la:
+        la._read_ttl = 0
+        assert la.load_average == 0.09
+        with mock.patch('os.open', side_effect=os.open) as os_open:
+            with open(filename, 'w') as f:
+                f.write('0.25 0.10 0.09 1/292 20758\n')
+            assert la.load_average == 0.25
+            assert os_open.call_count == 0
+
+def test_loadaverage_concurrent_open(mock_factory, sys_file):
+    filename = sys_file('0.09 0.10 0.09 1/292 20758\n')
+    with LoadAverage(filename) as la:
+        la._read_ttl = 0
+        # Re-assigning the file closes the one held open
+        la.load_average_file = filename
+        results = []
+        other = Thread(target=lambda: results.append(la.load_average))
+        real_open = os.open
+        def slow_open(*args, **kwargs):
+            # A second reader arriving while the file is being opened must
+            # wait for (and then use) that file, rather than opening another
+            if other.ident is None:
+                other.start()
+                other.join(0.1)
+                assert other.is_alive()
+            return real_open(*args, **kwargs)
+        with mock.patch('os.open', side_effect=slow_open) as os_open:
+            assert la.load_average == 0.1
+            other.join(1)
+            assert results == [0.1]
+            assert os_open.call_count == 1
+    assert la._file is None
 
 def test_diskusage_bad_init(mock_factory):
     with pytest.raises(OSError):
@@ -122,3 +122,21 @@ def test_shared_key(mock_factory):
             pass
         with pytest.raises(GPIOPinInUse):
             GPIODevice(4)
+
+def test_shared_extra_close(mock_factory):
+    class SharedDevice(SharedMixin, GPIODevice):
+        def __init__(self, pin, pin_factory=None):
+            super().__init__(pin, pin_factory=pin_factory)
+
+        @classmethod
+        def _shared_key(cls, pin, pin_factory=None):
+            return pin
+
+    dev = SharedDevice(4)
+    dev.close()
+    with SharedDevice(4) as another_dev:
+        assert another_dev is not dev
+        # A redundant close of the old instance must not unregister the new
+        dev.close()
+        with SharedDevice(4) as third_dev:
+            assert third_dev is another_dev
@@ -8,7 +8,8 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from threading import Event
-from time import sleep
+from math import isclose
+from time import sleep, time
 
 import pytest
 
@@ -236,3 +237,323 @@ def test_mock_charging_pin(mock_factory):
     pin.function = 'input'
     sleep(0.1)
     assert pin.state == 1
+
+
+def test_mock_clock(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4)
+    pin.function = 'output'
+    assert virtual_factory.ticks() == clock.time == 0.0
+    start = time()
+    clock.sleep(10)
+    assert virtual_factory.ticks() == 10.0
+    pin.state = 1
+    clock.sleep(0.5)
+    pin.state = 0
+    assert time() - start < 1
+    assert pin.states == [
+        PinState(0.0, False),
+        PinState(10.0, True),
+        PinState(0.5, False),
+    ]
+    with pytest.raises(RuntimeError):
+        MockFactory(virtual_time=True)
+
+
+def test_mock_clock_close(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4, pin_class=MockChargingPin, charge_time=1000)
+    pin.function = 'input'
+    virtual_factory.close()
+    assert clock.closed
+    assert virtual_factory.clock is None
+    clock.sleep(1000)
+    assert clock.time == 0.0
+    # With the clock gone, a new virtual factory can be constructed
+    MockFactory(virtual_time=True).close()
+
+
+def test_mock_charging_pin_virtual(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4, pin_class=MockChargingPin, charge_time=60)
+    pin.function = 'input'
+    clock.sleep(59)
+    assert pin.state == 0
+    clock.sleep(2)
+    assert pin.state == 1
+    pin.function = 'output'
+    pin.state = 0
+    pin.function = 'input'
+    assert pin.state == 0
+    clock.sleep(61)
+    assert pin.state == 1
+    assert clock.time == 122.0
+
+
+def test_mock_pin_state_history(mock_factory):
+    mock_factory.max_states = 3
+    pin = mock_factory.pin(4)
+    pin.function = 'output'
+    assert pin.states.maxlen == 3
+    assert len(pin.states) == 1
+    for i in range(10):
+        pin.state = not pin.state
+    assert len(pin.states) == 3
+    assert pin.states.dropped == 8
+    assert [s.state for s in pin.states] == [False, True, False]
+    assert pin.states[-1].state is False
+    assert pin.states[1:] == [pin.states[1], pin.states[2]]
+    with pytest.raises(IndexError):
+        pin.states[3]
+    pin.assert_states([False, True, False])
+    pin.clear_states()
+    assert pin.states == [PinState(0.0, False)]
+    assert pin.states.dropped == 0
+
+
+def test_mock_pin_state_history_unbounded(mock_factory):
+    history = PinStateHistory(maxlen=None, state_type=float)
+    for i in range(100):
+        history.append((i, i / 100))
+    assert len(history) == 100
+    assert history[50] == PinState(50.0, 0.5)
+    assert history.dropped == 0
+    with pytest.raises(ValueError):
+        PinStateHistory(maxlen=0)
+
+
+def test_mock_pwm_pin_state_history(mock_factory):
+    mock_factory.max_states = 4
+    pin = mock_factory.pin(4, pin_class=MockPWMPin)
+    pin.function = 'output'
+    for value in (0.25, 0.5, 0.75, 1.0, 0.5):
+        pin.state = value
+    pin.assert_states([0.5, 0.75, 1.0, 0.5])
+    assert all(isinstance(s.state, float) for s in pin.states)
+
+
+def test_mock_factory_schedule(virtual_factory):
+    clock = virtual_factory.clock
+    calls = []
+    virtual_factory.schedule(2, calls.append, 'b')
+    virtual_factory.schedule(1, calls.append, 'a')
+    cancelled = virtual_factory.schedule(1.5, calls.append, 'x')
+    virtual_factory.schedule(2, calls.append, 'c')
+    virtual_factory.cancel(cancelled)
+    clock.sleep(1)
+    assert calls == ['a']
+    clock.sleep(1)
+    assert calls == ['a', 'b', 'c']
+    # Callbacks can schedule further events
+    def tick(n):
+        calls.append(clock.time)
+        if n > 1:
+            virtual_factory.schedule(0.5, tick, n - 1)
+    virtual_factory.schedule(0.5, tick, 3)
+    clock.sleep(5)
+    assert calls == ['a', 'b', 'c', 2.5, 3.0, 3.5]
+
+
+def test_mock_factory_schedule_one_thread(virtual_factory):
+    clock = virtual_factory.clock
+    scheduler = virtual_factory._scheduler
+    calls = []
+    virtual_factory.schedule(1, calls.append, 'a')
+    thread = scheduler._thread
+    clock.sleep(2)
+    assert calls == ['a']
+    # The thread outlives an empty queue, rather than being replaced on the
+    # next call to schedule
+    assert thread.is_alive()
+    virtual_factory.schedule(1, calls.append, 'b')
+    assert scheduler._thread is thread
+    clock.sleep(2)
+    assert calls == ['a', 'b']
+    # A request to stop isn't mistaken for a wake-up, even with events pending
+    virtual_factory.schedule(10, calls.append, 'c')
+    thread.stop()
+    assert not thread.is_alive()
+    clock.sleep(20)
+    assert calls == ['a', 'b']
+    virtual_factory.schedule(1, calls.append, 'd')
+    assert scheduler._thread is not thread
+    clock.sleep(2)
+    # Events left pending by the stop are run (late) by the new thread
+    assert calls == ['a', 'b', 'c', 'd']
+
+
+def test_mock_factory_schedule_real_time(mock_factory):
+    fired = Event()
+    start = time()
+    mock_factory.schedule(0.2, fired.set)
+    mock_factory.schedule(0.05, lambda: None)
+    assert fired.wait(1)
+    assert time() - start >= 0.2
+    event = mock_factory.schedule(0.05, fired.clear)
+    mock_factory.cancel(event)
+    sleep(0.1)
+    assert fired.is_set()
+
+
+def test_mock_trigger_pin(virtual_factory):
+    clock = virtual_factory.clock
+    echo_pin = virtual_factory.pin(4)
+    trig_pin = virtual_factory.pin(
+        5, pin_class=MockTriggerPin, echo_pin=echo_pin, echo_time=0.5)
+    trig_pin.function = 'output'
+    for i in range(3):
+        trig_pin.state = 1
+        trig_pin.state = 0
+        clock.sleep(1)
+    assert len(echo_pin.states) == 7
+    for actual, expected in zip(echo_pin.states, [
+        (0.0, False),
+        (0.001, True), (0.5, False),
+        (0.5, True), (0.5, False),
+        (0.5, True), (0.5, False),
+    ]):
+        assert isclose(actual.timestamp, expected[0], abs_tol=1e-9)
+        assert actual.state == expected[1]
+
+
+def test_mock_square_wave_pin(virtual_factory):
+    clock = virtual_factory.clock
+    with pytest.raises(ValueError):
+        virtual_factory.pin(4, pin_class=MockSquareWavePin, frequency=0)
+    with pytest.raises(ValueError):
+        virtual_factory.pin(4, pin_class=MockSquareWavePin, duty_cycle=1)
+    pin = virtual_factory.pin(
+        4, pin_class=MockSquareWavePin, frequency=10, duty_cycle=0.25,
+        cycles=3)
+    assert not pin.running
+    pin.start()
+    assert pin.running
+    assert pin.state
+    clock.sleep(1)
+    assert not pin.running
+    assert len(pin.states) == 7
+    for actual, expected in zip(pin.states, [
+        (0.0, False),
+        (0.0, True), (0.025, False),
+        (0.075, True), (0.025, False),
+        (0.075, True), (0.025, False),
+    ]):
+        assert isclose(actual.timestamp, expected[0], abs_tol=1e-9)
+        assert actual.state == expected[1]
+
+
+def test_mock_square_wave_pin_stop(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4, pin_class=MockSquareWavePin, frequency=1000)
+    pin.start()
+    clock.sleep(1.0001)
+    pin.stop()
+    assert not pin.running
+    clock.sleep(1)
+    assert len(pin.states) == 2002
+    pin.start()
+    pin.close()
+    assert not pin.running
+
+
+def test_mock_square_wave_pin_skips_outputs(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4, pin_class=MockSquareWavePin, frequency=10)
+    pin.function = 'output'
+    pin.start()
+    clock.sleep(1)
+    assert len(pin.states) == 1
+    pin.stop()
+
+
+def test_mock_quadrature_pin(virtual_factory):
+    clock = virtual_factory.clock
+    a_pin = virtual_factory.pin(
+        20, pin_class=MockQuadraturePin, frequency=100, cycles=5)
+    with pytest.raises(ValueError):
+        a_pin.start()
+    b_pin = virtual_factory.pin(21)
+    a_pin.b_pin = b_pin
+    with RotaryEncoder(20, 21, max_steps=0) as encoder:
+        a_pin.start()
+        clock.sleep(1)
+        assert encoder.steps == 5
+        a_pin.clockwise = False
+        a_pin.cycles = 3
+        a_pin.start()
+        clock.sleep(1)
+        assert encoder.steps == 2
+
+
+def test_mock_bounce_pin(virtual_factory):
+    clock = virtual_factory.clock
+    with pytest.raises(ValueError):
+        virtual_factory.pin(
+            4, pin_class=MockBouncePin, frequency=10, bounce_time=0.1)
+    pin = virtual_factory.pin(
+        4, pin_class=MockBouncePin, frequency=10, bounce_time=0.01,
+        cycles=4, seed=1)
+    pin.start()
+    clock.sleep(1)
+    first = list(pin.states)
+    assert len(first) > 5
+    assert len(first) % 2 == 1
+    assert not first[-1].state
+    # Nominal transitions are 0.1s apart and bounces never exceed the
+    # bounce_time
+    for timestamp, state in first[1:]:
+        assert timestamp <= 0.1
+    pin.clear_states()
+    pin.start()
+    clock.sleep(1)
+    assert len(pin.states) == len(first)
+    for actual, expected in zip(pin.states[1:], first[1:]):
+        assert isclose(actual.timestamp, expected.timestamp, abs_tol=1e-9)
+        assert actual.state == expected.state
+
+
+def test_mock_replay_pin(virtual_factory):
+    clock = virtual_factory.clock
+    source = virtual_factory.pin(
+        4, pin_class=MockSquareWavePin, frequency=10, duty_cycle=0.2,
+        cycles=2)
+    source.start()
+    clock.sleep(1)
+    pin = virtual_factory.pin(5, pin_class=MockReplayPin, trace=source.states)
+    pin.start()
+    clock.sleep(1)
+    assert not pin.running
+    assert len(pin.states) == len(source.states)
+    for actual, expected in zip(pin.states, source.states):
+        assert isclose(actual.timestamp, expected.timestamp, abs_tol=1e-9)
+        assert actual.state == expected.state
+    pin.trace = [(0.1, True), (0.1, False)]
+    pin.repeat = True
+    pin.clear_states()
+    pin.start()
+    clock.sleep(1.05)
+    pin.stop()
+    assert len(pin.states) == 11
+    # A repeating trace with no delay would never yield to the scheduler
+    for trace in ([(0, True), (0, False)], []):
+        pin.trace = trace
+        with pytest.raises(ValueError):
+            pin.start()
+        assert not pin.running
+    pin.repeat = False
+    pin.start()
+    assert not pin.running
+
+
+def test_mock_signal_pin_stop_from_edge(virtual_factory):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(
+        4, pin_class=MockSquareWavePin, frequency=10, duty_cycle=0.5)
+    def changed(ticks, state):
+        if not state:
+            pin.stop()
+    pin.when_changed = changed
+    pin.start()
+    clock.sleep(1)
+    assert not pin.running
+    assert [s.state for s in pin.states] == [False, True, False]
@@ -11,12 +11,14 @@
 import sys
 from time import sleep, time
 from math import isclose
+from unittest import mock
 
 import pytest
 from colorzero import Color, Red, Green, Blue
 
 from gpiozero import *
 from gpiozero.tones import Tone
+from gpiozero.pins.mock import MockPin
 
 
 def test_output_initial_values(mock_factory, pwm):
@@ -107,6 +109,60 @@ def test_output_blink_background(mock_factory):
             (0.1, False)
             ])
 
+def test_output_blink_virtual_time(virtual_factory):
+    pin = virtual_factory.pin(4)
+    with DigitalOutputDevice(4) as device:
+        start = time()
+        device.blink(10, 20, n=3, background=False)
+        assert virtual_factory.clock.time == 90
+        assert time() - start < 1
+        assert pin.states == [
+            (0, False),
+            (0, True),
+            (10, False),
+            (20, True),
+            (10, False),
+            (20, True),
+            (10, False),
+            ]
+        device.blink(1, 1)
+        virtual_factory.clock.sleep(100.5)
+        assert device.value
+        device.off()
+        assert virtual_factory.clock.time == 190.5
+
+def test_output_blink_offloaded(virtual_factory):
+    pin = virtual_factory.pin(4)
+    cancel = mock.Mock()
+    with mock.patch.object(MockPin, '_blink', return_value=cancel) as blink:
+        with DigitalOutputDevice(4) as device:
+            device.blink(0.1, 0.2, n=3)
+            blink.assert_called_once_with(0.1, 0.2, 3)
+            assert device._blink_thread is None
+            device.on()
+            cancel.assert_called_once_with()
+            assert pin.state
+            blink.reset_mock()
+            cancel.reset_mock()
+            # Foreground blinks are still driven by a thread, so they can't
+            # return before the blink has finished
+            device.blink(10, 20, n=3, background=False)
+            blink.assert_not_called()
+            assert virtual_factory.clock.time == 90
+            device.blink(0.1, 0.2)
+        cancel.assert_called_once_with()
+        with Buzzer(4) as device:
+            blink.reset_mock()
+            device.beep(n=2)
+            blink.assert_called_once_with(1, 1, 2)
+        # A finished blink leaves the pin low, which would be "on" for an
+        # active-low device, so these are still driven by a thread
+        with DigitalOutputDevice(4, active_high=False) as device:
+            blink.reset_mock()
+            device.blink(0.1, 0.2, n=3)
+            blink.assert_not_called()
+            assert device._blink_thread is not None
+
 @pytest.mark.skipif(hasattr(sys, 'pypy_version_info'),
                     reason='timing is too random on pypy')
 def test_output_blink_foreground(mock_factory):
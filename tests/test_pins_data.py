@@ -145,6 +145,47 @@ def test_pulled_up():
     assert not pi_info('a21041').pulled_up('GPIO4')
     assert not pi_info('a21041').pulled_up('GPIO47')
 
+def test_pulled_up_multiple():
+    with pytest.raises(PinMultiplePins):
+        pi_info('a21041').pulled_up('GND')
+
+def test_to_gpio():
+    info = pi_info('a21041')
+    assert info.to_gpio(17) == 17
+    assert info.to_gpio('17') == 17
+    assert info.to_gpio('GPIO17') == 17
+    assert info.to_gpio('gpio017') == 17
+    assert info.to_gpio(b'BCM17') == 17
+    assert info.to_gpio('BOARD11') == 17
+    assert info.to_gpio('J8:11') == 17
+    assert info.to_gpio('WPI0') == 17
+    assert pi_info('0002').to_gpio('WPI0') == 17
+    assert pi_info('0002').to_gpio('P1:11') == 17
+    for spec in (54, 'GPIO54', 'BOARD1', 'J8:1', 'J8:41', 'P1:11', 'WPI17',
+                 'WPI32', 'FOO'):
+        with pytest.raises(PinInvalidPin):
+            info.to_gpio(spec)
+
+def test_to_gpio_index():
+    # The spec index must agree with parsing every possible spec
+    info = pi_info('a21041')
+    specs = info._get_index().specs
+    assert info._get_index() is info._get_index()
+    assert len(specs) > 54 * 3
+    for header, header_info in info.headers.items():
+        for number, pin in header_info.pins.items():
+            spec = '{header}:{number}'.format(header=header, number=number)
+            if pin.function.startswith('GPIO'):
+                assert specs[spec] == int(pin.function[4:])
+            else:
+                assert spec not in specs
+    # Replaced boards mustn't share the original's index
+    replaced = info._replace(headers={})
+    assert replaced._get_index().specs == {
+        key: value for key, value in specs.items()
+        if key[:1].isdigit() or key.startswith(('GPIO', 'BCM'))
+    }
+
 def test_pprint_content():
     with mock.patch('sys.stdout') as stdout:
         stdout.output = []
@@ -0,0 +1,221 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import importlib
+from unittest import mock
+
+import pytest
+
+from gpiozero import *
+
+
+class FakeLGPIO:
+    # Just enough of the lgpio module to drive LGPIOFactory, recording the
+    # calls which claim, free, and write pins
+    SET_BIAS_DISABLE = 0x80
+    SET_BIAS_PULL_DOWN = 0x40
+    SET_BIAS_PULL_UP = 0x20
+    RISING_EDGE = 1
+    FALLING_EDGE = 2
+    BOTH_EDGES = 3
+
+    class error(Exception):
+        pass
+
+    def __init__(self):
+        self.calls = []
+        self.modes = {}
+        self.levels = {}
+        self.groups = {}
+
+    def gpiochip_open(self, chip):
+        return 0
+
+    def gpiochip_close(self, handle):
+        pass
+
+    def gpio_get_mode(self, handle, gpio):
+        return self.modes.get(gpio, 0)
+
+    def gpio_claim_input(self, handle, gpio, flags=0):
+        self.calls.append(('claim_input', gpio))
+        self.modes[gpio] = 0
+
+    def gpio_claim_output(self, handle, gpio, level=0, flags=0):
+        self.calls.append(('claim_output', gpio, level))
+        self.modes[gpio] = 2
+        self.levels[gpio] = level
+
+    def gpio_claim_alert(self, handle, gpio, edges, flags=0):
+        self.calls.append(('claim_alert', gpio, edges))
+        self.modes[gpio] = 0
+
+    def gpio_free(self, handle, gpio):
+        self.calls.append(('free', gpio))
+
+    def gpio_read(self, handle, gpio):
+        return self.levels.get(gpio, 0)
+
+    def gpio_write(self, handle, gpio, level):
+        self.calls.append(('write', gpio, int(level)))
+        self.levels[gpio] = int(level)
+
+    def group_claim_output(self, handle, gpios, levels):
+        self.calls.append(('group_claim', list(gpios), list(levels)))
+        self.groups[gpios[0]] = list(gpios)
+
+    def group_free(self, handle, gpio):
+        self.calls.append(('group_free', gpio))
+        del self.groups[gpio]
+
+    def group_write(self, handle, gpio, bits):
+        self.calls.append(('group_write', gpio, bits))
+        for index, member in enumerate(self.groups[gpio]):
+            self.levels[member] = (bits >> index) & 1
+
+    def tx_pwm(self, handle, gpio, frequency, duty_cycle):
+        self.calls.append(('tx_pwm', gpio, frequency, duty_cycle))
+
+    def tx_pulse(self, handle, gpio, on, off, offset=0, cycles=0):
+        self.calls.append(('tx_pulse', gpio, on, off, offset, cycles))
+
+    def gpio_set_debounce_micros(self, handle, gpio, micros):
+        pass
+
+    def callback(self, handle, gpio, edges, func):
+        return mock.Mock()
+
+
+@pytest.fixture()
+def lgpio():
+    fake = FakeLGPIO()
+    with mock.patch.dict('sys.modules', {'lgpio': fake}):
+        module = importlib.import_module('gpiozero.pins.lgpio')
+        with mock.patch.object(
+                module.LGPIOFactory, '_get_revision', return_value=0xa020d3):
+            factory = module.LGPIOFactory()
+            try:
+                yield fake, factory
+            finally:
+                factory.close()
+
+
+def test_lgpio_group_claim_free(lgpio):
+    fake, factory = lgpio
+    with LEDBoard(2, 3, 4, pin_factory=factory) as board:
+        board[1].on()
+        fake.calls.clear()
+        board.on()
+        # The pins are claimed as a group, preserving their levels, and
+        # written with a single call
+        assert fake.calls == [
+            ('free', 2), ('free', 3), ('free', 4),
+            ('group_claim', [2, 3, 4], [0, 1, 0]),
+            ('group_write', 2, 0b111),
+        ]
+        fake.calls.clear()
+        board.value = (1, 0, 1)
+        board.off()
+        assert fake.calls == [('group_write', 2, 0b101), ('group_write', 2, 0)]
+        fake.calls.clear()
+        board[0].close()
+        # Closing a member frees the group, returning the others to
+        # ordinary outputs
+        assert fake.calls[:4] == [
+            ('group_free', 2),
+            ('claim_output', 2, 0), ('claim_output', 3, 0),
+            ('claim_output', 4, 0),
+        ]
+        assert board[1].pin._group is None
+        assert board[2].pin._group is None
+
+@pytest.mark.parametrize('change', ['function', 'frequency', 'edges'])
+def test_lgpio_group_reclaim(lgpio, change):
+    fake, factory = lgpio
+    with LEDBoard(2, 3, 4, pin_factory=factory) as board:
+        board.on()
+        pin = board[1].pin
+        fake.calls.clear()
+        if change == 'function':
+            pin.function = 'output'
+        elif change == 'frequency':
+            pin.frequency = 100
+            pin.frequency = None
+        else:
+            callback = lambda ticks, state: None
+            pin.when_changed = callback
+            pin.when_changed = None
+            pin.function = 'output'
+        # Re-configuring a member dissolves the group
+        assert fake.calls[:4] == [
+            ('group_free', 2),
+            ('claim_output', 2, 1), ('claim_output', 3, 1),
+            ('claim_output', 4, 1),
+        ]
+        fake.calls.clear()
+        board.off()
+        # The next write goes pin by pin, and discards the dissolved group...
+        assert fake.calls == [('write', 2, 0), ('write', 3, 0), ('write', 4, 0)]
+        fake.calls.clear()
+        board.on()
+        # ...so that the following one claims a fresh group
+        assert fake.calls == [
+            ('free', 2), ('free', 3), ('free', 4),
+            ('group_claim', [2, 3, 4], [0, 0, 0]),
+            ('group_write', 2, 0b111),
+        ]
+
+def test_lgpio_group_claim_fails(lgpio):
+    fake, factory = lgpio
+    def fail(handle, gpios, levels):
+        raise fake.error('busy')
+    fake.group_claim_output = fail
+    with LEDBoard(2, 3, pin_factory=factory) as board:
+        fake.calls.clear()
+        board.on()
+        # The pins are re-claimed individually, and written one at a time
+        assert fake.calls == [
+            ('free', 2), ('free', 3),
+            ('claim_output', 2, 0), ('claim_output', 3, 0),
+            ('write', 2, 1), ('write', 3, 1),
+        ]
+
+def test_lgpio_blink(lgpio):
+    fake, factory = lgpio
+    with LED(4, pin_factory=factory) as led:
+        fake.calls.clear()
+        led.blink(0.1, 0.2, n=3)
+        assert fake.calls == [('tx_pulse', 4, 100000, 200000, 0, 3)]
+        fake.calls.clear()
+        led.off()
+        # Stopping the blink cancels the pulses before writing the new state
+        assert fake.calls == [('tx_pulse', 4, 0, 0, 0, 0), ('write', 4, 0)]
+        fake.calls.clear()
+        led.blink(0.1, 0.2)
+        assert fake.calls == [('tx_pulse', 4, 100000, 200000, 0, 0)]
+        fake.calls.clear()
+    assert fake.calls[0] == ('tx_pulse', 4, 0, 0, 0, 0)
+
+def test_lgpio_blink_fallback(lgpio):
+    fake, factory = lgpio
+    with LED(4, active_high=False, pin_factory=factory) as led:
+        fake.calls.clear()
+        led.blink(0.1, 0.2, n=1, background=False)
+        # Active-low devices blink in a thread, as a finished pulse train
+        # would leave them on
+        assert not any(call[0] == 'tx_pulse' for call in fake.calls)
+        assert fake.calls == [('write', 4, 0), ('write', 4, 1)]
+
+def test_lgpio_blink_foreground(lgpio):
+    fake, factory = lgpio
+    with LED(4, pin_factory=factory) as led:
+        fake.calls.clear()
+        led.blink(0.01, 0.01, n=2, background=False)
+        # Foreground blinks are driven by a thread, which only returns once
+        # the blink has finished
+        assert not any(call[0] == 'tx_pulse' for call in fake.calls)
+        assert fake.calls == [
+            ('write', 4, 1), ('write', 4, 0), ('write', 4, 1), ('write', 4, 0)]
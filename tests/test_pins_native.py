@@ -0,0 +1,173 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import warnings
+from unittest import mock
+
+import pytest
+
+from gpiozero.pins.native import (
+    PWMFS,
+    PWMChannel,
+    GPIOMemory,
+    NativeFactory,
+    )
+from gpiozero import *
+
+
+@pytest.fixture()
+def pwm_fs(tmp_path):
+    chip = tmp_path / 'pwmchip0'
+    (chip / 'device' / 'of_node').mkdir(parents=True)
+    (chip / 'device' / 'of_node' / 'compatible').write_bytes(
+        b'brcm,bcm2711-pwm\0brcm,bcm2835-pwm\0')
+    (chip / 'export').write_bytes(b'')
+    for channel in ('pwm0', 'pwm1'):
+        (chip / channel).mkdir()
+        for name in ('period', 'duty_cycle', 'enable'):
+            (chip / channel / name).write_bytes(b'0\n')
+    fs = PWMFS()
+    fs.PWM_PATH = str(tmp_path)
+    yield fs
+    fs.close()
+
+def test_pwm_chip(pwm_fs, tmp_path):
+    assert pwm_fs.chip == str(tmp_path / 'pwmchip0')
+
+def test_pwm_no_chip(tmp_path):
+    fs = PWMFS()
+    fs.PWM_PATH = str(tmp_path / 'missing')
+    assert fs.chip is None
+    with pytest.raises(PinPWMUnsupported):
+        fs.claim(12)
+
+def test_pwm_claim(pwm_fs):
+    channel, function = pwm_fs.claim(12)
+    assert isinstance(channel, PWMChannel)
+    assert function == 'alt0'
+    with pytest.raises(PinPWMUnsupported):
+        pwm_fs.claim(18)
+    channel, function = pwm_fs.claim(19)
+    assert function == 'alt5'
+    with pytest.raises(PinPWMUnsupported):
+        pwm_fs.claim(4)
+    pwm_fs.release(12)
+    channel, function = pwm_fs.claim(18)
+    assert function == 'alt5'
+
+def test_pwm_channel_writes(pwm_fs):
+    channel, function = pwm_fs.claim(13)
+    names = {
+        channel._period_fd: 'period',
+        channel._duty_cycle_fd: 'duty_cycle',
+        channel._enable_fd: 'enable',
+    }
+    with mock.patch.object(PWMChannel, '_write', autospec=True) as write:
+        channel.set(10000000, 0)
+        channel.enable()
+        channel.set_duty_cycle(2500000)
+        assert [(names[fd], value) for self, fd, value in (
+            c[0] for c in write.call_args_list)] == [
+            ('period', 10000000),
+            ('enable', 1),
+            ('duty_cycle', 2500000),
+        ]
+        write.reset_mock()
+        # Shrinking the period must shrink the duty cycle first
+        channel.set(1000000, 250000)
+        assert [(names[fd], value) for self, fd, value in (
+            c[0] for c in write.call_args_list)] == [
+            ('duty_cycle', 250000),
+            ('period', 1000000),
+        ]
+        write.reset_mock()
+        channel.set(2000000, 500000)
+        assert [(names[fd], value) for self, fd, value in (
+            c[0] for c in write.call_args_list)] == [
+            ('period', 2000000),
+            ('duty_cycle', 500000),
+        ]
+    assert channel.period == 2000000
+    assert channel.duty_cycle == 500000
+
+@pytest.fixture()
+def native_factory(pwm_fs):
+    # Back the GPIO registers with plain memory, so the factory can be used
+    # without /dev/gpiomem
+    def mem_init(self, soc):
+        self.fd = None
+        self.mem = bytearray(4096)
+        self.reg_fmt = '@I'
+    with mock.patch.object(GPIOMemory, '__init__', mem_init), \
+            mock.patch.object(GPIOMemory, 'close', lambda self: None), \
+            mock.patch.object(
+                NativeFactory, '_get_revision', return_value=0xc03111):
+        factory = NativeFactory()
+        factory.pwm.close()
+        factory.pwm = pwm_fs
+        try:
+            yield factory
+        finally:
+            factory.close()
+
+def test_native_pin_hardware_pwm(native_factory, pwm_fs):
+    pin = native_factory.pin(12)
+    pin.function = 'output'
+    writes = []
+    def write(channel, fd, value):
+        names = {
+            channel._period_fd: 'period',
+            channel._duty_cycle_fd: 'duty_cycle',
+            channel._enable_fd: 'enable',
+        }
+        writes.append((names[fd], value))
+    with mock.patch.object(
+            PWMChannel, '_write', autospec=True, side_effect=write):
+        pin.frequency = 100
+        assert pin.frequency == 100
+        assert pin.function == 'alt0'
+        assert pin.state == 0
+        assert writes == [('period', 10000000), ('enable', 1)]
+        del writes[:]
+        pin.state = 0.25
+        assert pin.state == 0.25
+        assert writes == [('duty_cycle', 2500000)]
+        del writes[:]
+        # Changing the frequency preserves the duty cycle, and shrinking the
+        # period shrinks the duty cycle first
+        pin.frequency = 200
+        assert pin.frequency == 200
+        assert pin.state == 0.25
+        assert writes == [('duty_cycle', 1250000), ('period', 5000000)]
+        del writes[:]
+        with pytest.raises(PinInvalidState):
+            pin.state = 2
+        with pytest.raises(PinInvalidState):
+            pin.frequency = 0
+        assert writes == []
+        # The channel can't be shared with the other pin that outputs it
+        other = native_factory.pin(18)
+        other.function = 'output'
+        with warnings.catch_warnings(record=True) as w:
+            warnings.resetwarnings()
+            other.frequency = 100
+            assert len(w) == 1
+            assert w[0].category == PWMSoftwareFallback
+        assert other in native_factory.soft_pwm
+        other.frequency = None
+        assert other not in native_factory.soft_pwm
+        pin.frequency = None
+        assert pin.frequency is None
+        assert pin.function == 'output'
+        assert pin.state is False
+        assert writes == [('enable', 0)]
+        del writes[:]
+        # Releasing the channel makes it available to the other pin
+        other.frequency = 50
+        assert other.function == 'alt5'
+        assert other not in native_factory.soft_pwm
+        assert writes == [('period', 20000000), ('enable', 1)]
+        other.frequency = None
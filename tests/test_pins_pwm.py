@@ -0,0 +1,149 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from math import isclose
+from threading import active_count
+
+import pytest
+
+from gpiozero.pins.pwm import PWMSoftware
+from gpiozero.pins.mock import MockPin
+
+
+class MockBankPin(MockPin):
+    # A mock pin which reports itself as part of a bank, recording the bank
+    # writes made to it
+    writes = []
+
+    def _bank_writers(self):
+        def write(state, mask):
+            self.writes.append((state, mask))
+            for pin in self.factory.pins.values():
+                if mask & (1 << pin.number):
+                    pin._set_state(state)
+        return (
+            'bank', 1 << self.number,
+            lambda mask: write(True, mask),
+            lambda mask: write(False, mask),
+        )
+
+
+@pytest.fixture()
+def soft_pwm():
+    engine = PWMSoftware()
+    yield engine
+    engine.close()
+
+
+def assert_states(pin, expected):
+    assert len(pin.states) == len(expected)
+    for actual, (timestamp, state) in zip(pin.states, expected):
+        assert isclose(actual.timestamp, timestamp, abs_tol=1e-9)
+        assert actual.state == state
+
+
+def test_pwm_software_bad_init(virtual_factory, soft_pwm):
+    pin = virtual_factory.pin(4)
+    pin.function = 'output'
+    with pytest.raises(ValueError):
+        soft_pwm.add(pin, 0)
+    with pytest.raises(ValueError):
+        soft_pwm.add(pin, 100, 2)
+    assert pin not in soft_pwm
+    assert len(soft_pwm) == 0
+
+def test_pwm_software_edges(virtual_factory, soft_pwm):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4)
+    pin.function = 'output'
+    soft_pwm.add(pin, 100, 0.25)
+    assert pin in soft_pwm
+    clock.sleep(0.025)
+    assert_states(pin, [
+        (0.0, False),
+        (0.0, True), (0.0025, False),
+        (0.0075, True), (0.0025, False),
+        (0.0075, True), (0.0025, False),
+    ])
+
+def test_pwm_software_change(virtual_factory, soft_pwm):
+    clock = virtual_factory.clock
+    pin = virtual_factory.pin(4)
+    pin.function = 'output'
+    soft_pwm.add(pin, 100)
+    clock.sleep(0.1)
+    # A duty cycle of 0 never rises
+    assert_states(pin, [(0.0, False)])
+    soft_pwm.set_duty_cycle(pin, 0.5)
+    clock.sleep(0.012)
+    assert_states(pin, [
+        (0.0, False),
+        (0.1, True), (0.005, False), (0.005, True),
+    ])
+    # Shrinking the duty cycle takes effect within the current cycle
+    soft_pwm.set_duty_cycle(pin, 0.25)
+    clock.sleep(0.01)
+    assert_states(pin, [
+        (0.0, False),
+        (0.1, True), (0.005, False), (0.005, True),
+        (0.0025, False), (0.0075, True),
+    ])
+    pin.clear_states()
+    soft_pwm.set_frequency(pin, 50)
+    clock.sleep(0.04)
+    # The frequency changes within the current cycle too
+    assert_states(pin, [
+        (0.0, True),
+        (0.003, False), (0.015, True),
+        (0.005, False), (0.015, True),
+    ])
+    pin.clear_states()
+    soft_pwm.set_duty_cycle(pin, 1)
+    clock.sleep(0.1)
+    assert_states(pin, [(0.0, True)])
+    with pytest.raises(ValueError):
+        soft_pwm.set_duty_cycle(pin, -1)
+    with pytest.raises(ValueError):
+        soft_pwm.set_frequency(pin, -1)
+
+def test_pwm_software_one_thread(virtual_factory, soft_pwm):
+    clock = virtual_factory.clock
+    threads = active_count()
+    pins = [virtual_factory.pin(n) for n in range(4, 14)]
+    for pin in pins:
+        pin.function = 'output'
+        soft_pwm.add(pin, 100, 0.5)
+    assert active_count() == threads + 1
+    clock.sleep(0.015)
+    for pin in pins:
+        assert [s.state for s in pin.states] == [False, True, False, True, False]
+    for pin in pins[1:]:
+        soft_pwm.remove(pin)
+    assert active_count() == threads + 1
+    soft_pwm.remove(pins[0])
+    assert active_count() == threads
+    # Removal leaves the pins where they were
+    pins[0].clear_states()
+    clock.sleep(0.02)
+    assert_states(pins[0], [(0.0, False)])
+
+def test_pwm_software_bank_writes(virtual_factory, soft_pwm):
+    clock = virtual_factory.clock
+    MockBankPin.writes = []
+    pins = [virtual_factory.pin(n, pin_class=MockBankPin) for n in (4, 5, 6)]
+    for pin in pins:
+        pin.function = 'output'
+    soft_pwm.add(pins[0], 100, 0.5)
+    soft_pwm.add(pins[1], 100, 0.5)
+    soft_pwm.add(pins[2], 100, 0.25)
+    clock.sleep(0.001)
+    MockBankPin.writes = []
+    clock.sleep(0.0091)
+    # The coincident edges of all three pins are applied in a single write
+    assert MockBankPin.writes == [
+        (False, 0b1000000), (False, 0b110000), (True, 0b1110000),
+    ]
+    assert [s.state for s in pins[2].states] == [False, True, False, True]
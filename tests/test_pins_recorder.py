@@ -0,0 +1,299 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: a library for controlling the Raspberry Pi's GPIO pins
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+from math import isclose
+from threading import Thread
+from unittest import mock
+
+import pytest
+
+from gpiozero import *
+from gpiozero.pins.mock import MockFactory, MockPWMPin, MockQuadraturePin
+from gpiozero.pins.recorder import *
+
+
+@pytest.fixture()
+def recording_factory(request, tmp_path):
+    save_factory = Device.pin_factory
+    Device.pin_factory = RecordingFactory(
+        MockFactory(virtual_time=True), str(tmp_path / 'pins.rec'))
+    try:
+        yield Device.pin_factory
+    finally:
+        Device.pin_factory.factory.reset()
+        Device.pin_factory.close()
+        Device.pin_factory = save_factory
+
+
+def test_recorder_ring(tmp_path):
+    filename = str(tmp_path / 'ring.rec')
+    with pytest.raises(ValueError):
+        PinRecorder(filename, capacity=0)
+    with PinRecorder(filename, capacity=4) as recorder:
+        assert recorder.capacity == 4
+        assert len(recorder) == 0
+        assert recorder.dropped == 0
+        for i in range(6):
+            recorder.record(i / 10, 4, OP_STATE, i % 2)
+        assert len(recorder) == 4
+        assert recorder.dropped == 2
+        assert repr(recorder) == (
+            '<gpiozero.PinRecorder object with 4 records, 2 dropped>')
+        assert list(recorder) == [
+            PinRecord(0.2, 4, OP_STATE, 0),
+            PinRecord(0.3, 4, OP_STATE, 1),
+            PinRecord(0.4, 4, OP_STATE, 0),
+            PinRecord(0.5, 4, OP_STATE, 1),
+        ]
+    assert recorder.closed
+    assert repr(recorder) == '<gpiozero.PinRecorder object closed>'
+    with PinRecorder(filename) as recorder:
+        assert recorder.capacity == 4
+        assert recorder.dropped == 2
+        assert [r.timestamp for r in recorder] == [0.2, 0.3, 0.4, 0.5]
+        with pytest.raises(io.UnsupportedOperation):
+            recorder.record(0.6, 4, OP_STATE, 0)
+    with PinRecorder(filename, append=True) as recorder:
+        recorder.record(0.6, 4, OP_STATE, 0)
+        assert [r.timestamp for r in recorder] == [0.3, 0.4, 0.5, 0.6]
+
+
+def test_recorder_read_only(tmp_path):
+    filename = tmp_path / 'read-only.rec'
+    with PinRecorder(str(filename), capacity=4) as recorder:
+        recorder.record(0.1, 4, OP_EDGE, 1)
+    filename.chmod(0o444)
+    try:
+        # Root can open the file for writing regardless, so check the mode
+        # it's opened with too
+        with mock.patch('io.open', wraps=io.open) as open_:
+            with PinRecorder(str(filename)) as recorder:
+                assert list(recorder) == [PinRecord(0.1, 4, OP_EDGE, 1)]
+        open_.assert_called_once_with(str(filename), 'rb')
+    finally:
+        filename.chmod(0o644)
+
+
+def test_recorder_concurrent(tmp_path):
+    filename = str(tmp_path / 'threads.rec')
+    with PinRecorder(filename, capacity=4000) as recorder:
+        def writer(pin):
+            for i in range(1000):
+                recorder.record(i, pin, OP_STATE, 1)
+        threads = [Thread(target=writer, args=(pin,)) for pin in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(recorder) == 4000
+        assert recorder.dropped == 0
+        records = list(recorder)
+        for pin in range(4):
+            assert [r.timestamp for r in records if r.pin == pin] == list(
+                range(1000))
+
+
+def test_recorder_bad_file(tmp_path):
+    filename = tmp_path / 'bad.rec'
+    filename.write_bytes(b'foo')
+    with pytest.raises(ValueError):
+        PinRecorder(str(filename))
+    filename.write_bytes(b'\0' * 100)
+    with pytest.raises(ValueError):
+        PinRecorder(str(filename))
+
+
+def test_recording_factory_pins(recording_factory):
+    pin = recording_factory.pin(4)
+    assert isinstance(pin, RecordingPin)
+    assert recording_factory.pin(4) is pin
+    assert pin.number == 4
+    assert repr(pin) == 'GPIO4'
+    assert pin.pin is recording_factory.factory.pin(4)
+    assert pin.factory is recording_factory
+    assert recording_factory.pi_info is recording_factory.factory.pi_info
+
+
+def test_recording_factory_output(recording_factory):
+    clock = recording_factory.factory.clock
+    with LED(4) as led:
+        clock.sleep(0.5)
+        led.on()
+        clock.sleep(0.5)
+        led.off()
+    records = [
+        (round(r.timestamp, 6), r.pin, r.op, r.value)
+        for r in recording_factory.recorder
+        if r.op in (OP_STATE, OP_FUNCTION)
+    ]
+    assert records[0] == (0.0, 4, OP_FUNCTION, 'output')
+    assert records[-2:] == [(0.5, 4, OP_STATE, 1), (1.0, 4, OP_STATE, 0)]
+
+
+def test_recording_factory_pwm(recording_factory):
+    recording_factory.factory.pin_class = MockPWMPin
+    with PWMLED(4) as led:
+        led.value = 0.5
+    assert [
+        r.value for r in recording_factory.recorder if r.op == OP_FREQUENCY
+    ][:1] == [100]
+    assert 0.5 in [
+        r.value for r in recording_factory.recorder if r.op == OP_STATE]
+
+
+def test_recording_factory_edges(recording_factory):
+    clock = recording_factory.factory.clock
+    with Button(4) as button:
+        assert button.pin.pull == 'up'
+        mock_pin = button.pin.pin
+        clock.sleep(0.1)
+        mock_pin.drive_low()
+        clock.sleep(0.1)
+        mock_pin.drive_high()
+        assert button.pin.when_changed is not None
+    edges = [
+        r for r in recording_factory.recorder if r.op == OP_EDGE]
+    assert len(edges) == 2
+    assert isclose(edges[0].timestamp, 0.1, abs_tol=1e-9)
+    assert isclose(edges[1].timestamp, 0.2, abs_tol=1e-9)
+    assert [r.value for r in edges] == [0, 1]
+    assert [
+        r.value for r in recording_factory.recorder if r.op == OP_PULL
+    ] == ['up']
+
+
+def test_export_vcd(recording_factory, tmp_path):
+    clock = recording_factory.factory.clock
+    led = LED(4)
+    button = Button(5)
+    clock.sleep(0.001)
+    led.on()
+    button.pin.pin.drive_low()
+    clock.sleep(0.0015)
+    led.off()
+    with pytest.raises(ValueError):
+        export_vcd(recording_factory.recorder, io.StringIO(), timescale='2us')
+    output = io.StringIO()
+    export_vcd(recording_factory.recorder, output)
+    lines = output.getvalue().splitlines()
+    assert '$timescale 1us $end' in lines
+    assert '$var wire 1 ! GPIO4 $end' in lines
+    assert '$var wire 1 " GPIO5 $end' in lines
+    assert '$var event 1 # GPIO5_edge $end' in lines
+    assert lines[lines.index('#1000'):] == ['#1000', '1!', '0"', '1#', '#2500', '0!']
+    led.close()
+    button.close()
+    recording_factory.close()
+    filename = str(tmp_path / 'pins.vcd')
+    export_vcd(str(tmp_path / 'pins.rec'), filename, timescale='1 ms')
+    with io.open(filename) as f:
+        assert '$timescale 1ms $end\n' in f.read()
+
+
+def record_encoder(filename, cycles):
+    factory = RecordingFactory(MockFactory(virtual_time=True), filename)
+    try:
+        a_pin = factory.factory.pin(
+            20, pin_class=MockQuadraturePin, frequency=50, cycles=cycles)
+        a_pin.b_pin = factory.factory.pin(21)
+        with RotaryEncoder(20, 21, max_steps=0, pin_factory=factory) as enc:
+            factory.factory.clock.sleep(0.5)
+            a_pin.start()
+            factory.factory.clock.sleep(cycles / 50 + 0.5)
+            assert enc.steps == cycles
+    finally:
+        factory.factory.reset()
+        factory.close()
+
+
+def test_replay_factory(tmp_path):
+    filename = str(tmp_path / 'encoder.rec')
+    record_encoder(filename, 20)
+    with pytest.raises(ValueError):
+        ReplayFactory(filename, speed=0)
+    factory = ReplayFactory(filename, virtual_time=True)
+    try:
+        assert len(factory.trace) == 80
+        assert not factory.playing
+        assert factory.wait(0)
+        with RotaryEncoder(20, 21, max_steps=0, pin_factory=factory) as enc:
+            start = factory.ticks()
+            factory.play()
+            assert factory.playing
+            assert factory.wait(10)
+            assert not factory.playing
+            assert enc.steps == 20
+            assert isclose(
+                factory.ticks() - start, factory.trace[-1][0], abs_tol=1e-6)
+            # Faster playback, interrupted half-way through
+            factory.speed = 2
+            factory.play()
+            assert not factory.wait(factory.trace[40][0] / 2 - 0.001)
+            factory.stop()
+            assert factory.wait(0)
+            assert enc.steps == 30
+    finally:
+        factory.reset()
+        factory.close()
+
+
+def test_replay_factory_records():
+    trace = [
+        (0.0, 4, OP_STATE, 0),
+        (0.1, 4, OP_EDGE, 0),
+        (0.2, 4, OP_EDGE, 1),
+        (0.3, 5, OP_EDGE, 0),
+    ]
+    replay = ReplayFactory(trace)
+    try:
+        assert replay.trace == [(0.1, 4, False), (0.2, 4, True), (0.3, 5, False)]
+        pin = replay.pin(4)
+        pin.function = 'output'
+        replay.speed = 10
+        replay.play()
+        assert replay.wait(1)
+        assert [state for timestamp, state in pin.states] == [False]
+    finally:
+        replay.close()
+
+
+def test_replay_factory_simultaneous():
+    trace = [(0.0, 4, OP_EDGE, state) for state in (0, 1, 0, 1)]
+    replay = ReplayFactory(trace)
+    try:
+        # Edges sharing a timestamp are replayed in their recorded order
+        assert replay.trace == [
+            (0.0, 4, False), (0.0, 4, True), (0.0, 4, False), (0.0, 4, True)]
+        pin = replay.pin(4)
+        pin.function = 'input'
+        pin.pull = 'up'
+        pin.clear_states()
+        replay.play()
+        assert replay.wait(1)
+        assert [state for timestamp, state in pin.states] == [
+            True, False, True, False, True]
+    finally:
+        replay.close()
+
+
+def test_replay_factory_stop_from_handler():
+    trace = [(i * 1e-9, 4, OP_EDGE, i % 2) for i in range(10)]
+    replay = ReplayFactory(trace)
+    try:
+        with Button(4, pin_factory=replay) as btn:
+            pressed = []
+            def stop():
+                pressed.append(True)
+                replay.stop()
+            btn.when_pressed = stop
+            replay.play()
+            assert replay.wait(1)
+            assert not replay.playing
+            assert len(pressed) == 1
+    finally:
+        replay.reset()
+        replay.close()
@@ -11,6 +11,8 @@
 import pytest
 from collections import namedtuple
 from math import isclose
+from time import sleep, monotonic
+from threading import Thread
 
 from gpiozero.pins.mock import MockSPIDevice, MockPin
 from gpiozero import *
@@ -303,6 +305,35 @@ def test_spi_software_write_lsb_first(mock_factory):
         assert test_device.rx_word() == 8421376
 
 
+def test_spi_software_clock_polarity(mock_factory):
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+    for mode in range(4):
+        with SPISlave(11, 10, 9, 8, clock_polarity=bool(mode & 2),
+                      clock_phase=bool(mode & 1)) as slave, \
+                mock_factory.spi() as master:
+            master.clock_mode = mode
+            assert master.read(3) == [0, 1, 2]
+            # The clock must idle at the level implied by its polarity
+            assert slave.clock_pin.state == bool(mode & 2)
+            master.write([2, 0])
+            assert slave.rx_word() == 512
+
+
+def test_pin_state_writers(mock_factory):
+    pin = mock_factory.pin(4)
+    pin.function = 'output'
+    write_low, write_high = pin._state_writers()
+    read = pin._state_reader()
+    write_high()
+    assert pin.state and read()
+    write_low()
+    assert not pin.state and not read()
+
+
 def test_spi_software_clock_mode(mock_factory):
     with mock_factory.spi() as master:
         assert master.clock_mode == 0
@@ -481,3 +512,309 @@ def test_MCP3304(mock_factory):
         single_mcp_test(mock, pot, 5, 12)
     with MCP3304(channel=5, differential=True) as pot:
         differential_mcp_test(mock, pot, 5, 4, 12, full=True)
+
+
+def test_MCP3xxx_command_frames(mock_factory):
+    MockMCP3008(11, 10, 9, 8)
+    with MCP3008(channel=5) as pot:
+        # 00000001 1101xxxx xxxxxxxx
+        assert pot._tx == bytes([0b00000001, 0b11010000, 0])
+    with MCP3008(channel=5, differential=True) as pot:
+        assert pot._tx == bytes([0b00000001, 0b01010000, 0])
+    with MCP3208(channel=5) as pot:
+        # 00000111 01xxxxxx xxxxxxxx
+        assert pot._tx == bytes([0b00000111, 0b01000000, 0])
+    with MCP3002(channel=1) as pot:
+        # 01111xxx xxxxxxxx
+        assert pot._tx == bytes([0b01111000, 0])
+    with MCP3304(channel=5) as pot:
+        # 00001110 1xxxxxxx xxxxxxxx
+        assert pot._tx == bytes([0b00001110, 0b10000000, 0])
+
+
+def test_spi_software_transfer_many(mock_factory):
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+    with SPISlave(11, 10, 9, 8) as slave, mock_factory.spi() as master:
+        # Each frame re-selects the slave so its output restarts at 0
+        assert master.transfer_many([[0, 0], [0, 0, 0], [0]]) == [
+            [0, 1], [0, 1, 2], [0]]
+        assert master.transfer_many([]) == []
+
+
+def test_MCP3008_scan(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    mock.channels[:] = [0.0, mock.vref / 2, mock.vref, 0.0, 0.0, 0.0, 0.0, mock.vref]
+    tolerance = 1 / 2**10
+    with MCP3008() as adc:
+        values = adc.scan((2, 1, 0))
+        assert len(values) == 3
+        assert isclose(values[0], 1.0, abs_tol=tolerance)
+        assert isclose(values[1], 0.5, abs_tol=tolerance)
+        assert isclose(values[2], 0.0, abs_tol=tolerance)
+        values = adc.scan()
+        assert len(values) == 8
+        assert isclose(values[1], 0.5, abs_tol=tolerance)
+        assert isclose(values[7], 1.0, abs_tol=tolerance)
+        assert next(adc.scan_values((7,))) == (adc.scan((7,)))
+        with pytest.raises(SPIBadChannel):
+            adc.scan((8,))
+        with pytest.raises(SPIBadChannel):
+            adc.scan((-1,))
+    with pytest.raises(DeviceClosed):
+        adc.scan()
+    assert list(adc.scan_values()) == []
+
+
+def test_MCP3304_scan(mock_factory):
+    mock = MockMCP3304(11, 10, 9, 8)
+    mock.channels[4] = mock.vref / 2
+    tolerance = 1 / 2**12
+    with MCP3304(differential=True) as adc:
+        values = adc.scan((4, 5))
+        assert isclose(values[0], 0.5, abs_tol=tolerance)
+        assert isclose(values[1], -0.5, abs_tol=tolerance)
+
+
+def test_MCP3201_scan(mock_factory):
+    mock = MockMCP3201(11, 10, 9, 8)
+    mock.channels[0] = mock.vref
+    with MCP3201() as adc:
+        assert adc.scan() == (adc.value,)
+        with pytest.raises(SPIBadChannel):
+            adc.scan((1,))
+
+
+def test_analog_input_stream(mock_factory):
+    mock = MockMCP3208(11, 10, 9, 8)
+    mock.channels[0] = mock.vref / 2
+    with MCP3208(channel=0) as adc:
+        with pytest.raises(InputDeviceError):
+            adc.stream(0)
+        with pytest.raises(BadQueueLen):
+            adc.stream(100, block_size=0)
+        with pytest.raises(BadQueueLen):
+            adc.stream(100, blocks=1)
+        with adc.stream(200, block_size=5) as stream:
+            assert repr(stream).startswith('<gpiozero.AnalogInputStream object')
+            assert stream.rate == 200
+            assert stream.block_size == 5
+            block = stream.read(timeout=1)
+            assert len(block.timestamps) == len(block.values) == 5
+            assert all(isclose(v, 0.5, abs_tol=1 / 2**12) for v in block.values)
+            assert list(block.timestamps) == sorted(block.timestamps)
+            assert 0 < stream.actual_rate <= 250
+            assert not stream.closed
+        assert stream.closed
+        assert 'closed' in repr(stream)
+        # Remaining blocks can be drained after the stream has been closed
+        assert all(len(block.values) == 5 for block in stream)
+        assert stream.read() is None
+
+
+def test_analog_input_stream_overruns(mock_factory):
+    MockMCP3208(11, 10, 9, 8)
+    with MCP3208(channel=0) as adc:
+        with adc.stream(1000, block_size=1, blocks=2) as stream:
+            while not stream.overruns:
+                sleep(0.01)
+        assert stream.overruns > 0
+        # Only blocks-1 blocks can be buffered without overrun
+        assert len(list(stream)) == 1
+
+
+def test_analog_input_stream_virtual_time(virtual_factory):
+    clock = virtual_factory.clock
+    MockMCP3208(11, 10, 9, 8)
+    with MCP3208(channel=0) as adc:
+        read = adc._read
+        slow = False
+        def slow_read():
+            if slow:
+                clock.sleep(0.025)
+            return read()
+        adc._read = slow_read
+        with adc.stream(100, block_size=4) as stream:
+            clock.sleep(0.035)
+            block = stream.read(timeout=0)
+            assert [round(t, 6) for t in block.timestamps] == [
+                0.0, 0.01, 0.02, 0.03]
+            assert stream.dropped == 0
+            slow = True
+            clock.sleep(0.13)
+            block = stream.read(timeout=0)
+            # Each read now takes 2.5 periods; the samples that would have
+            # been taken during it are skipped, not fired late
+            assert [round(t, 6) for t in block.timestamps] == [
+                0.04, 0.07, 0.1, 0.13]
+            assert stream.dropped == 8
+
+
+def test_analog_input_stream_when_block(mock_factory):
+    MockMCP3208(11, 10, 9, 8)
+    received = []
+    with MCP3208(channel=0) as adc:
+        with adc.stream(200, block_size=2, when_block=received.append) as stream:
+            while len(received) < 2:
+                sleep(0.01)
+        assert all(len(block.values) == 2 for block in received)
+
+
+def test_analog_input_stream_device_closed(mock_factory):
+    MockMCP3208(11, 10, 9, 8)
+    adc = MCP3208(channel=0)
+    stream = adc.stream(200, block_size=2)
+    adc.close()
+    stream.read(timeout=1)
+    assert stream.closed
+    stream.close()
+    with pytest.raises(DeviceClosed):
+        adc.stream(200)
+
+
+def test_spi_software_bytes(mock_factory):
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+    with SPISlave(11, 10, 9, 8) as slave, mock_factory.spi() as master:
+        result = master.transfer(b'\x00\x00\x00')
+        assert isinstance(result, bytearray)
+        assert result == b'\x00\x01\x02'
+        assert master.transfer(memoryview(bytearray(2))) == b'\x00\x01'
+        assert master.transfer([0, 0]) == [0, 1]
+        buf = bytearray(5)
+        assert master.transfer_into(bytes(3), buf) == 3
+        assert buf == b'\x00\x01\x02\x00\x00'
+        view = memoryview(buf)[2:]
+        assert master.transfer_into([0, 0, 0], view) == 3
+        assert buf == b'\x00\x01\x00\x01\x02'
+        assert master.write(b'\x02\x00') == 2
+        assert slave.rx_word() == 512
+
+
+def test_spi_rate_arg(mock_factory):
+    with mock_factory.spi(rate=1000000) as intf:
+        assert intf.rate == 1000000
+    with mock_factory.spi() as intf:
+        assert intf.rate == 0
+    with pytest.raises(ValueError):
+        mock_factory.spi(rate=-1)
+    # The failed interface must not leave its pins reserved
+    with mock_factory.spi() as intf:
+        pass
+
+
+def test_spi_software_rate(mock_factory):
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+    with SPISlave(11, 10, 9, 8) as slave, mock_factory.spi() as master:
+        assert master.actual_rate is None
+        assert master.read(3) == [0, 1, 2]
+        assert master.actual_rate > 0
+        master.rate = 1000
+        assert master.rate == 1000
+        start = monotonic()
+        assert master.read(3) == [0, 1, 2]
+        # 24 bits at 1kHz can't take less than 24ms
+        assert monotonic() - start >= 0.024
+        assert master.actual_rate <= 1000
+        master.rate = None
+        assert master.rate == 0
+        for mode in range(4):
+            slave.clock_polarity = bool(mode & 2)
+            slave.clock_phase = bool(mode & 1)
+            master.clock_mode = mode
+            master.rate = 10000
+            master.write([2, 0])
+            assert slave.rx_word() == 512
+
+
+def test_spi_hardware_chunking(mock_factory, monkeypatch):
+    from gpiozero.pins import local
+
+    class FakeSpiDev:
+        def __init__(self):
+            self.max_speed_hz = 0
+            self.calls = []
+        def open(self, port, device):
+            pass
+        def close(self):
+            pass
+        def xfer2(self, data):
+            # py-spidev's xfer2 has a fixed limit, whatever the bufsiz
+            if len(data) > 4096:
+                raise OverflowError('Argument list size exceeds 4096 bytes.')
+            self.calls.append(('xfer2', len(data)))
+            return [b ^ 0xff for b in data]
+
+    class FakeSpiDev3(FakeSpiDev):
+        def xfer3(self, data):
+            self.calls.append(('xfer3', len(data)))
+            return [b ^ 0xff for b in data]
+
+    monkeypatch.setattr(local, 'SpiDev', FakeSpiDev)
+    monkeypatch.setattr(local, 'get_spidev_bufsiz', lambda: 16)
+    with local.LocalPiHardwareSPI(11, 10, 9, 8, pin_factory=mock_factory) as intf:
+        intf.rate = 8000000
+        assert intf.rate == 8000000
+        assert intf.transfer([0] * 16) == [0xff] * 16
+        assert intf._bus.calls == [('xfer2', 16)]
+        result = intf.transfer(bytes(range(40)))
+        assert isinstance(result, bytearray)
+        assert result == bytes(b ^ 0xff for b in range(40))
+        assert intf._bus.calls == [('xfer2', 16)] * 3 + [('xfer2', 8)]
+    # A bufsiz above xfer2's limit must still respect that limit
+    monkeypatch.setattr(local, 'get_spidev_bufsiz', lambda: 65536)
+    data = bytes(10000)
+    with local.LocalPiHardwareSPI(11, 10, 9, 8, pin_factory=mock_factory) as intf:
+        assert intf.transfer(data) == b'\xff' * 10000
+        assert intf._bus.calls == [
+            ('xfer2', 4096), ('xfer2', 4096), ('xfer2', 1808)]
+    monkeypatch.setattr(local, 'SpiDev', FakeSpiDev3)
+    with local.LocalPiHardwareSPI(11, 10, 9, 8, pin_factory=mock_factory) as intf:
+        assert intf.transfer(data) == b'\xff' * 10000
+        assert intf.transfer([0] * 16) == [0xff] * 16
+        assert intf._bus.calls == [('xfer3', 10000), ('xfer2', 16)]
+
+def test_spi_hardware_transfer_many_exclusive(mock_factory, monkeypatch):
+    from gpiozero.pins import local
+
+    class FakeSpiDev:
+        def __init__(self):
+            self.max_speed_hz = 0
+            self.calls = []
+            self.hook = None
+        def open(self, port, device):
+            pass
+        def close(self):
+            pass
+        def xfer2(self, data):
+            self.calls.append(list(data))
+            if self.hook:
+                hook, self.hook = self.hook, None
+                hook()
+            return list(data)
+
+    monkeypatch.setattr(local, 'SpiDev', FakeSpiDev)
+    monkeypatch.setattr(local, 'get_spidev_bufsiz', lambda: 4096)
+    with local.LocalPiHardwareSPI(11, 10, 9, 8, pin_factory=mock_factory) as intf:
+        other = Thread(target=intf.transfer, args=([9],), daemon=True)
+        def interrupt():
+            # Another thread attempts a transfer part way through the batch;
+            # it must wait until the whole batch is complete
+            other.start()
+            other.join(0.1)
+            assert other.is_alive()
+        intf._bus.hook = interrupt
+        assert intf.transfer_many([[1], [2], [3]]) == [[1], [2], [3]]
+        other.join(1)
+        assert not other.is_alive()
+        assert intf._bus.calls == [[1], [2], [3], [9]]